@@ -0,0 +1,70 @@
+"""
+Memory per animation and time per tick with 500 explosions playing at
+once, for Animation and for the list-rotating animation it replaced.
+
+    python benchmarks/animation.py
+"""
+import gc
+import time
+import tracemalloc
+
+import common
+from livewires import games
+
+import screen
+
+screen.init(headless=True, render=False)
+
+COUNT = 500
+TICKS = 200
+
+
+class RotatingAnimation(games.Animation):
+    """ The old Animation: its own frame list, rotated every tick """
+    __slots__ = ("_frames",)
+
+    def _restart(self, images, n_repeats):
+        self._frames = list(games._frame_sequence(images))
+        self.n_repeats = n_repeats or -1
+        return self.next_image()
+
+    def next_image(self):
+        if self.n_repeats == 0: return None
+        if self.n_repeats > 0: self.n_repeats -= 1
+        new_image = self._frames[0]
+        self._frames = self._frames[1:] + [self._frames[0]]
+        return new_image
+
+
+def make(cls, i):
+    # explosions that never end, so the count stays the same
+    return cls(images=screen.Explosion.images,
+               x=20 + i % 25 * 24, y=20 + i // 25 * 22, n_repeats=0,
+               is_collideable=False)
+
+
+def run(cls):
+    games.screen.clear()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sprites = [make(cls, i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for sprite in sprites:
+        games.screen.add(sprite)
+    start = time.perf_counter()
+    games.screen.mainloop(max_ticks=TICKS)
+    elapsed = time.perf_counter() - start
+    return (after - before) / float(COUNT), elapsed / TICKS * 1000
+
+
+def main():
+    print("%-18s %14s %10s" % ("animation", "bytes/sprite", "ms/tick"))
+    for cls in (RotatingAnimation, games.Animation):
+        size, ms = run(cls)
+        print("%-18s %14.0f %10.3f" % (cls.__name__, size, ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Load time, memory and blit speed of the sprite images loaded one by one
+and served from a texture atlas, packed by tools/pack_atlas.py into a
+temporary directory.
+
+    python benchmarks/atlas.py
+"""
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common
+from livewires import games
+
+REPEAT = 20
+BLITS = 20000
+
+
+def load_all(index, use_atlas):
+    """ Load every packed image into a fresh registry """
+    registry = games.AssetRegistry()
+    if use_atlas:
+        registry.use_atlas(index)
+    with open(index) as f:
+        names = sorted(json.load(f)["frames"])
+    start = time.perf_counter()
+    images = [registry.image(name) for name in names]
+    return time.perf_counter() - start, registry.bytes, images
+
+
+def blit_rate(images):
+    """ Blits per second of the images at random places on the display """
+    rng = random.Random(1)
+    display = games.screen._display
+    width, height = display.get_size()
+    jobs = [(rng.choice(images),
+             (rng.randrange(width - 75), rng.randrange(height - 75)))
+            for i in range(BLITS)]
+    blit = display.blit
+    best = None
+    for i in range(5):
+        start = time.perf_counter()
+        for image, position in jobs:
+            blit(image, position)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return BLITS / best
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    index = os.path.join(directory, "atlas.json")
+    try:
+        subprocess.check_call(
+            [sys.executable, os.path.join("tools", "pack_atlas.py"),
+             os.path.join(directory, "atlas.bmp"), index])
+        games.init(screen_width=640, screen_height=480, headless=True)
+        print("%-10s %10s %10s %14s" % ("images", "load ms", "bytes",
+                                        "blits/s"))
+        for use_atlas in (False, True):
+            times = []
+            for i in range(REPEAT):
+                seconds, size, images = load_all(index, use_atlas)
+                times.append(seconds)
+            print("%-10s %10.2f %10d %14.0f"
+                  % ("atlas" if use_atlas else "separate",
+                     min(times) * 1000, size, blit_rate(images)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
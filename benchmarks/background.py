@@ -0,0 +1,81 @@
+"""
+Erase throughput (Screen.blit_background calls per second) with the
+background in different pixel formats, and with decorations baked into
+the static layer.
+
+    python benchmarks/background.py
+
+"24-bit" is the nebula as loaded from its file, which is what erasing
+blits from if the background is not converted: each erase converts its
+pixels. "Surface()" is the background as set_background used to build it,
+a new Surface in pygame's default format, and "display" is the
+background set_background builds now, in the display's own format. On
+displays whose format is not pygame's default the last two differ too.
+
+Same-format blits are plain copies, but SDL 2.28 does them with
+non-temporal stores when the rows are 16-byte aligned, which is slow for
+small scattered rectangles; with that SDL the converting blit can come
+out ahead. Compare the numbers on the machine the game is played on.
+"""
+import random
+import time
+
+import pygame
+
+import common
+from livewires import games
+
+ERASES = 20000
+SIZE = 40
+
+
+def erase_rate(static):
+    """ Erases per second restoring from the given surface """
+    screen = games.screen
+    screen._static = static
+    rng = random.Random(1)
+    rects = [pygame.Rect(rng.randrange(screen.width - SIZE),
+                         rng.randrange(screen.height - SIZE), SIZE, SIZE)
+             for i in range(ERASES)]
+    erase = screen.blit_background
+    best = None
+    for i in range(5):
+        start = time.perf_counter()
+        for rect in rects:
+            erase(rect)
+        elapsed = time.perf_counter() - start
+        screen._dirtyrects = []
+        best = elapsed if best is None else min(best, elapsed)
+    return ERASES / best
+
+
+def tiled(image, surface):
+    for x in range(0, surface.get_width(), image.get_width()):
+        for y in range(0, surface.get_height(), image.get_height()):
+            surface.blit(image, (x, y))
+    return surface
+
+
+def run():
+    games.init(screen_width=640, screen_height=480, headless=True)
+    screen = games.screen
+    nebula = pygame.image.load("images/nebula.png")
+    size = (screen.width, screen.height)
+
+    cases = [("24-bit", tiled(nebula, pygame.Surface(size, 0, 24))),
+             ("Surface()", tiled(nebula, pygame.Surface(size)))]
+    screen.background = nebula
+    cases.append(("display", screen._static))
+    ship = games.load_image("images/ship.bmp")
+    for x in range(0, screen.width, 80):
+        screen.bake(ship, (x, 0))
+    cases.append(("baked", screen._static))
+
+    print("%-10s %6s %14s" % ("background", "bits", "erases/s"))
+    for name, static in cases:
+        print("%-10s %6d %14.0f" % (name, static.get_bitsize(),
+                                    erase_rate(static)))
+
+
+if __name__ == "__main__":
+    run()
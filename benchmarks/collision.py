@@ -0,0 +1,62 @@
+"""
+Frame time against object count, with and without the spatial hash.
+
+Every object behaves like a Collider: it moves, wraps around the screen
+and asks for its overlapping sprites once per frame.
+
+    python benchmarks/collision.py
+"""
+import random
+
+import common
+from livewires import games
+
+COUNTS = (25, 50, 100, 200, 400, 800)
+FRAMES = 100
+
+
+class Body(games.Sprite):
+    """ A moving sprite that queries for overlaps every frame """
+
+    def update(self):
+        if self.left > games.screen.width:
+            self.right = 0
+        if self.right < 0:
+            self.left = games.screen.width
+        if self.top > games.screen.height:
+            self.bottom = 0
+        if self.bottom < 0:
+            self.top = games.screen.height
+        self.overlapping_sprites
+
+
+def populate(n):
+    games.screen.clear()
+    rng = random.Random(n)
+    image = games.load_image("images/asteroid_small.bmp")
+    for i in range(n):
+        games.screen.add(Body(image=image,
+                              x=rng.randrange(games.screen.width),
+                              y=rng.randrange(games.screen.height),
+                              dx=rng.uniform(-2, 2),
+                              dy=rng.uniform(-2, 2)))
+
+
+def main():
+    games.init(screen_width=640, screen_height=480, headless=True)
+    print("%8s %14s %14s %8s" % ("objects", "linear (ms)", "grid (ms)",
+                                 "speedup"))
+    for n in COUNTS:
+        results = []
+        for cell_size in (0, 64):
+            games.screen.cell_size = cell_size
+            populate(n)
+            results.append(common.mean(common.run_frames(games.screen,
+                                                         FRAMES)))
+        print("%8d %14.3f %14.3f %7.1fx" % (n, results[0] * 1000,
+                                            results[1] * 1000,
+                                            results[0] / results[1]))
+
+
+if __name__ == "__main__":
+    main()
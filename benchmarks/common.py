@@ -0,0 +1,47 @@
+"""
+Shared set-up for the benchmark scripts.
+
+The scripts are run from the repository root (``python benchmarks/x.py``)
+and need neither a display nor a sound card.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+for path in (ROOT, os.path.join(ROOT, "requirements", "livewires")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.chdir(ROOT)
+
+
+def run_frames(screen, n_frames):
+    """
+    Run the screen's mainloop for n_frames frames and return the list of
+    frame times in seconds, measured between consecutive Screen.tick calls.
+    """
+    import time
+
+    times = []
+    last = [None]
+
+    def tick():
+        now = time.perf_counter()
+        if last[0] is not None:
+            times.append(now - last[0])
+        last[0] = now
+        if len(times) >= n_frames:
+            screen.quit()
+
+    screen.tick = tick
+    screen.mainloop()
+    del screen.tick
+    return times
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
@@ -0,0 +1,61 @@
+"""
+Frame time and collision counts with the mask narrowphase off and on, in
+the busiest game scenarios, against the time a tick has at the game's
+tick rate (headless, every frame is one tick).
+
+    python benchmarks/masks.py
+
+Each run is a separate process (livewires allows one Screen per process);
+the exit status is 1 if a run with masks on misses the budget at p99.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import common
+
+SCENARIOS = ("level30", "missile_storm")
+
+
+def child(name, masks):
+    import random
+    from livewires import games
+    import screen
+    import scenarios
+    random.seed(1)
+    screen.init(headless=True, mask_collisions=masks)
+    result = getattr(scenarios, "scenario_" + name)()
+    result.update(games.screen.collision_stats)
+    result["budget_ms"] = 1000. / (games.screen.sim_rate or games.screen.fps)
+    result["masks"] = games.rotation_cache.stats()["masks"]
+    return result
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        print(json.dumps(child(sys.argv[2], sys.argv[3] == "1")))
+        return 0
+
+    print("%-14s %-5s %9s %9s %11s %10s %6s"
+          % ("scenario", "masks", "mean ms", "p99 ms", "candidates",
+             "confirmed", "cached"))
+    ok = True
+    for name in SCENARIOS:
+        for masks in (False, True):
+            output = subprocess.check_output(
+                [sys.executable, os.path.abspath(__file__),
+                 "--child", name, "1" if masks else "0"])
+            result = json.loads(output.decode().splitlines()[-1])
+            print("%-14s %-5s %9.3f %9.3f %11d %10d %6d"
+                  % (name, "on" if masks else "off", result["mean_ms"],
+                     result["p99_ms"], result["candidates"],
+                     result["confirmed"], result["masks"]))
+            if masks and result["p99_ms"] > result["budget_ms"]:
+                print("  over the %.0f ms budget" % result["budget_ms"])
+                ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
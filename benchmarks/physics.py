@@ -0,0 +1,55 @@
+"""
+Tick time for large numbers of asteroids, moved and wrapped either one
+sprite at a time or by the numpy entity store (Screen.vectorize).
+
+    python benchmarks/physics.py [count ...]
+"""
+import random
+import sys
+
+import common
+from livewires import games
+
+import screen
+
+screen.init(headless=True, render=False)
+
+TICKS = 100
+
+
+def populate(n):
+    games.screen.clear()
+    rng = random.Random(n)
+    image = games.load_image("images/asteroid_small.bmp")
+    for i in range(n):
+        games.screen.add(screen.Wrapper(image=image,
+                                        x=rng.uniform(0, games.screen.width),
+                                        y=rng.uniform(0, games.screen.height),
+                                        dx=rng.uniform(-3, 3),
+                                        dy=rng.uniform(-3, 3)))
+
+
+def tick_ms(n, vectorize, cell_size):
+    games.screen.cell_size = cell_size
+    games.screen.vectorize = vectorize
+    populate(n)
+    return common.mean(common.run_frames(games.screen, TICKS)) * 1000
+
+
+def main():
+    if games.numpy is None:
+        sys.exit("numpy is not installed")
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    print("%8s %6s %14s %14s %8s" % ("sprites", "grid", "per-sprite ms",
+                                     "vectorized ms", "speedup"))
+    for n in counts:
+        for cell_size in (64, 0):
+            plain = tick_ms(n, False, cell_size)
+            vectorized = tick_ms(n, True, cell_size)
+            print("%8d %6s %14.3f %14.3f %7.1fx" % (
+                n, "on" if cell_size else "off", plain, vectorized,
+                plain / vectorized))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Allocation rate and garbage collector pauses in the missile storm, with
+the sprite pools on and off.
+
+    python benchmarks/pools.py
+
+Each run is a separate process (livewires allows one Screen per process).
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+import common
+
+
+def child(pooled):
+    from livewires import games
+    import screen
+    import scenarios
+    screen.init(headless=True)
+    from interface import Asteroid, Missile
+
+    pools = (Asteroid.pool, Missile.pool, screen.Explosion.pool)
+    if not pooled:
+        for pool in pools:
+            pool.max_size = 0
+
+    constructed = [0]
+    sprite_init = games.Sprite.__init__
+
+    def counting_init(self, *args, **kwargs):
+        constructed[0] += 1
+        sprite_init(self, *args, **kwargs)
+    games.Sprite.__init__ = counting_init
+
+    pauses = []
+    started = [0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - started[0])
+    gc.callbacks.append(on_gc)
+
+    start = time.perf_counter()
+    result = scenarios.scenario_missile_storm()
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(on_gc)
+
+    result.update({"pooled": pooled,
+                   "sprites_per_sec": constructed[0] / elapsed,
+                   "gc_collections": len(pauses),
+                   "gc_total_ms": sum(pauses) * 1000,
+                   "gc_max_ms": max(pauses) * 1000 if pauses else 0.0,
+                   "pools": [pool.stats() for pool in pools]})
+    return result
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(child(sys.argv[2] == "1")))
+        return
+
+    for pooled in (False, True):
+        output = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__),
+             "--child", "1" if pooled else "0"])
+        result = json.loads(output.decode().splitlines()[-1])
+        print("%-8s %8.0f sprites/s  %4d collections  "
+              "gc %7.2f ms total %6.2f ms max  frame %.3f ms p99 %.3f ms"
+              % ("pooled" if pooled else "unpooled",
+                 result["sprites_per_sec"], result["gc_collections"],
+                 result["gc_total_ms"], result["gc_max_ms"],
+                 result["mean_ms"], result["p99_ms"]))
+
+
+if __name__ == "__main__":
+    main()
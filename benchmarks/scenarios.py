@@ -0,0 +1,277 @@
+"""
+Scripted game scenarios run through the real Screen.mainloop.
+
+Each scenario runs in its own process (livewires allows one Screen per
+process) with a fixed random seed and scripted keyboard input, and
+reports frame time statistics as JSON.
+
+    python benchmarks/scenarios.py                   # run everything
+    python benchmarks/scenarios.py level1 scores     # run some
+    python benchmarks/scenarios.py --save-baseline   # store as baseline
+
+Results are compared against benchmarks/baseline.json when it exists;
+the exit status is 1 if any scenario got slower than the threshold.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common
+from livewires import games
+
+BASELINE = os.path.join(common.ROOT, "benchmarks", "baseline.json")
+SCENARIOS = ("level1", "level30", "missile_storm", "explosion_chain",
+             "scores")
+# Compared between runs; anything else is informational
+COMPARED = ("mean_ms", "p95_ms", "p99_ms")
+
+
+class ScriptedKeyboard(games.Keyboard):
+    """ Keyboard whose pressed keys are a function of the tick number """
+
+    def __init__(self, script):
+        games.Keyboard.__init__(self)
+        self.script = script
+        self.tick = 0
+        self.keys = games.KeySet()
+
+    def _poll(self):
+        keys = games.KeySet(self.script(self.tick))
+        self.tick += 1
+        for key in keys - self.keys:
+            self._key_down(key, chr(key) if 32 <= key < 127 else "")
+        for key in self.keys - keys:
+            self._key_up(key)
+        self.keys = keys
+        return keys
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_memory_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(n_frames, start, script=lambda tick: (), per_frame=None):
+    """
+    Install the scripted keyboard and frame timer, then call start(),
+    which is expected to enter the mainloop. Returns the statistics.
+    """
+    keyboard = ScriptedKeyboard(script)
+    games.keyboard = keyboard
+    times = []
+    state = {"last": None}
+
+    def tick():
+        now = time.perf_counter()
+        if state["last"] is not None:
+            times.append(now - state["last"])
+        state["last"] = now
+        if per_frame:
+            per_frame(keyboard.tick)
+        if len(times) >= n_frames:
+            games.screen.quit()
+
+    games.screen.tick = tick
+    start()
+    times_ms = [t * 1000 for t in times]
+    return {"frames": len(times_ms),
+            "mean_ms": common.mean(times_ms),
+            "p95_ms": percentile(times_ms, .95),
+            "p99_ms": percentile(times_ms, .99),
+            "max_ms": max(times_ms),
+            "ticks_per_sec": games.screen.ticks_per_second,
+            "objects": len(games.screen.all_objects),
+            "peak_rss_kb": peak_memory_kb()}
+
+
+def god_mode():
+    """ Keep the ship alive so the load does not drop when it is hit """
+    from interface import Ship
+    Ship.die = lambda self: None
+
+
+def fly_and_fire(tick):
+    keys = {games.K_SPACE}
+    if tick % 120 < 40:
+        keys.add(games.K_LEFT)
+    if tick % 200 < 30:
+        keys.add(games.K_UP)
+    return keys
+
+
+def play_level(level, frames):
+    from game import Game
+    # a fixed number of spawns a tick, not a time budget, so that a seed
+    # always plays the same; no score store, so runs leave database/ alone
+    game = Game(scores=None, spawn_budget=None)
+    game.level = level - 1
+    return measure(frames, game.play, fly_and_fire)
+
+
+def scenario_level1():
+    god_mode()
+    return play_level(1, 1000)
+
+
+def scenario_level30():
+    god_mode()
+    return play_level(30, 1000)
+
+
+def scenario_missile_storm():
+    from interface import Ship
+    god_mode()
+    Ship.MISSILE_DELAY = 1
+    return play_level(10, 1000)
+
+
+def scenario_explosion_chain():
+    from game import Game
+    from screen import Explosion
+    god_mode()
+    game = Game(scores=None, spawn_budget=None)
+    rng = random.Random(1)
+
+    def burst(tick):
+        if tick % 10 == 0:
+            for i in range(40):
+                games.screen.add(Explosion.pool.acquire(
+                    x=rng.randrange(games.screen.width),
+                    y=rng.randrange(games.screen.height)))
+
+    return measure(1000, game.play, per_frame=burst)
+
+
+def scenario_scores(rows=200000):
+    from interface import Scores
+    from storage import ScoreStore
+    directory = tempfile.mkdtemp()
+    legacy = os.path.join(directory, "scores.txt")
+    rng = random.Random(2)
+    with open(legacy, "w") as database:
+        for i in range(rows):
+            database.write("PLAYER%d %d\n" % (i, rng.randrange(100000)))
+    # a kiosk's first run imports the old file; the game over screen
+    # afterwards is what we time
+    store = ScoreStore(os.path.join(directory, "scores"), legacy=legacy)
+    name = [ord(ch) for ch in "bench"]
+
+    def type_name(tick):
+        # one key every 6 ticks, then return
+        if tick % 6 or tick // 6 > len(name):
+            return ()
+        if tick // 6 == len(name):
+            return (games.K_RETURN,)
+        return (name[tick // 6],)
+
+    try:
+        games.screen.add(Scores(score="1234", store=store,
+                                value="Enter your name: "))
+        return measure(300, games.screen.mainloop, type_name)
+    finally:
+        shutil.rmtree(directory)
+
+
+def run_one(name, seed):
+    """ Run a single scenario in this process """
+    random.seed(seed)
+    import screen
+    screen.init(headless=True)
+    result = globals()["scenario_" + name]()
+    result["scenario"] = name
+    result["seed"] = seed
+    return result
+
+
+def run_isolated(name, seed):
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--child", name,
+         "--seed", str(seed)],
+        stderr=subprocess.DEVNULL)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """ Print the comparison and return the names of regressed scenarios """
+    regressed = []
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if base is None:
+            continue
+        for key in COMPARED:
+            change = (result[key] - base[key]) / base[key] if base[key] else 0
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                if result["scenario"] not in regressed:
+                    regressed.append(result["scenario"])
+            print("%-16s %-8s %8.3f -> %8.3f  %+6.1f%%%s" % (
+                result["scenario"], key, base[key], result[key],
+                change * 100, flag))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help="any of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per scenario, the median is kept")
+    parser.add_argument("--threshold", type=float, default=.15,
+                        help="allowed slowdown against the baseline "
+                             "(default 0.15, i.e. 15%%)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", help="also write the results here")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child, args.seed)))
+        return 0
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario %r" % name)
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        # frame times this short are noisy: keep the median run
+        runs = sorted((run_isolated(name, args.seed)
+                       for i in range(args.repeat)),
+                      key=lambda result: result["mean_ms"])
+        results.append(runs[len(runs) // 2])
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(dict((r["scenario"], r) for r in results), f, indent=2)
+        return 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Memory per sprite and time per tick for the sprite classes.
+
+    python benchmarks/sprites.py
+"""
+import gc
+import time
+import tracemalloc
+
+import common
+from livewires import games
+
+import screen
+from interface import Asteroid, Missile
+
+screen.init(headless=True, render=False)
+
+COUNT = 10000
+# short enough for missiles to outlive it
+TICKS = 20
+
+
+class Game(object):
+    """ Just enough of game.Game for Asteroid """
+    score = None
+
+
+def make(kind, i):
+    # on a grid, so that missiles do not hit each other
+    x = 20 + i % 40 * 15
+    y = 20 + i // 40 % 30 * 15
+    if kind == "Sprite":
+        return games.Sprite(image=Asteroid.images[Asteroid.LARGE],
+                            x=x, y=y, dx=1, dy=1)
+    if kind == "Asteroid":
+        return Asteroid(game=Game(), x=x, y=y, size=Asteroid.LARGE, lifes=1)
+    if kind == "Missile":
+        return Missile(x, y, 0)
+    if kind == "Text":
+        return games.Text(value=i, size=30, color=(255, 255, 255), x=x, y=y)
+    if kind == "Explosion":
+        return screen.Explosion(x=x, y=y)
+
+
+def bytes_per_sprite(kind):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sprites = [make(kind, i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list itself holds one pointer per sprite
+    result = (after - before) / float(COUNT) - 8
+    for sprite in sprites:
+        sprite._gone = 1
+    return result
+
+
+def ns_per_tick(kind):
+    games.screen.clear()
+    sprites = [make(kind, i) for i in range(COUNT // 10)]
+    for sprite in sprites:
+        games.screen.add(sprite)
+    # best of a few rounds, the machine is rarely quiet
+    best = None
+    for round in range(5):
+        start = time.perf_counter()
+        for i in range(TICKS // 5):
+            for sprite in sprites:
+                sprite._tick()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    games.screen.clear()
+    return best / (TICKS // 5 * len(sprites)) * 1e9
+
+
+def main():
+    games.screen.set_vectorize(False)
+    print("%-10s %16s %12s" % ("class", "bytes/sprite", "ns/tick"))
+    for kind in ("Sprite", "Asteroid", "Missile", "Text", "Explosion"):
+        print("%-10s %16.0f %12.0f" % (kind, bytes_per_sprite(kind),
+                                       ns_per_tick(kind)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Time from starting the game to its first frame, against the target in
+main.FIRST_FRAME_TARGET.
+
+    python benchmarks/startup.py
+
+Each run is a fresh `main.py --headless --ticks 1 --startup-report`
+process; the exit status is 1 if the median run misses the target.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import common
+import main
+
+RUNS = 5
+
+
+def first_frame_ms():
+    # main.py expects livewires to be installed
+    env = dict(os.environ)
+    paths = [os.path.join(common.ROOT, "requirements", "livewires")]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    output = subprocess.check_output(
+        [sys.executable, "main.py", "--headless", "--ticks", "1",
+         "--startup-report"], stderr=subprocess.DEVNULL, env=env)
+    match = re.search(r"first frame\s+([\d.]+) ms", output.decode())
+    return float(match.group(1))
+
+
+def run():
+    times = sorted(first_frame_ms() for i in range(RUNS))
+    median = times[len(times) // 2]
+    target = main.FIRST_FRAME_TARGET * 1000
+    print("first frame: median %.1f ms, best %.1f ms, worst %.1f ms "
+          "(target %.0f ms)" % (median, times[0], times[-1], target))
+    return median <= target
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -1,21 +1,142 @@
+import math
 import random
+import time
+from collections import deque
 from livewires import games, color
-from interface import Asteroid, Ship, Scores
+from interface import Asteroid, Ship, Missile, Scores
+from screen import Explosion
+from storage import ScoreStore
+
+
+class LevelSpawner(object):
+    """
+    Creates a level's asteroids over the next ticks rather than all in
+    one frame, each in a free spot away from the ship
+    """
+    # reserved space around the ship
+    BUFFER = 150
+    # spots tried for an asteroid before it goes where other asteroids are
+    TRIES = 20
+
+    def __init__(self, game, budget=0.001, per_tick=4):
+        """
+        Spawn for up to budget seconds a tick (at least one asteroid),
+        or, if budget is None, per_tick asteroids a tick, which plays
+        the same on every machine
+        """
+        self.game = game
+        self.budget = budget
+        self.per_tick = per_tick
+        # (size, lifes) of the asteroids still to come
+        self.queue = deque()
+        self.spawned = 0
+        self.rejected = 0
+
+    def start(self, count):
+        """ Queue count asteroids, spawned from the next tick on """
+        for i in range(count):
+            if i % 2 == 0:
+                self.queue.append((Asteroid.LARGE, 1))
+            else:
+                self.queue.append((Asteroid.POWERFUL, 3))
+        games.screen.add_tick_handler(self.tick)
+
+    def pending(self):
+        """ Whether asteroids are still to come """
+        return bool(self.queue)
+
+    def cancel(self):
+        """ Forget the asteroids still to come """
+        self.queue.clear()
+        games.screen.remove_tick_handler(self.tick)
+
+    def tick(self):
+        """ Spawn the next asteroids """
+        if self.budget is None:
+            for i in range(min(self.per_tick, len(self.queue))):
+                self.spawn()
+        else:
+            deadline = time.perf_counter() + self.budget
+            self.spawn()
+            while self.queue and time.perf_counter() < deadline:
+                self.spawn()
+        if not self.queue:
+            games.screen.remove_tick_handler(self.tick)
+
+    def spawn(self):
+        """ Create the next asteroid """
+        size, lifes = self.queue.popleft()
+        x, y = self.place(Asteroid.images[size])
+        new_asteroid = Asteroid.pool.acquire(game=self.game,
+                                             x=x, y=y,
+                                             size=size,
+                                             lifes=lifes)
+        games.screen.add(new_asteroid)
+        self.spawned += 1
+
+    def place(self, image):
+        """
+        Pick a spot at least BUFFER from the ship, with no asteroid under
+        the image if one is found in TRIES random spots
+        """
+        for i in range(self.TRIES):
+            x, y = self.away_from_ship()
+            rect = image.get_rect(center=(x, y))
+            for sprite in games.screen.overlapping_objects(rect):
+                if isinstance(sprite, Asteroid):
+                    self.rejected += 1
+                    break
+            else:
+                return x, y
+        return x, y
+
+    def away_from_ship(self):
+        """ A random spot at least BUFFER from the ship """
+        width = games.screen.width
+        height = games.screen.height
+        ship = self.game.ship
+        while True:
+            x = random.randrange(width)
+            y = random.randrange(height)
+            # distance the short way, around the edges of the screen
+            dx = abs(x - ship.x)
+            dy = abs(y - ship.y)
+            if math.hypot(min(dx, width - dx),
+                          min(dy, height - dy)) >= self.BUFFER:
+                return x, y
 
 
 class Game():
     """ The game """
-    def __init__(self):
-        """ Initialize game object """
+    def __init__(self, scores="database/scores", spawn_budget=0.001):
+        """
+        Initialize game object (scores=None keeps no top scores, game over
+        just shows the final score; see LevelSpawner for spawn_budget, None
+        for a game that must play the same every time)
+        """
         # set level
         self.level = 0
 
-        # cheate list of asteroids
-        self.asteroids = []
+        # creates each level's asteroids
+        self.spawner = LevelSpawner(self, budget=spawn_budget)
 
         # load sound for level advance
         self.sound = games.load_sound("sounds/level.wav")
 
+        # limit the voices of each sound (see games.AudioManager): the
+        # thrust loops while a key is held, and a chain of explosions
+        # sounds no louder after a few of them
+        games.audio.configure(self.sound, "interface", max_voices=1)
+        games.audio.configure(Ship.sound, "ship", max_voices=1)
+        games.audio.configure(Missile.sound, "ship", max_voices=2)
+        games.audio.configure(Explosion.sound, "explosions",
+                              max_voices=3, min_interval=3)
+
+        # open top scores (imports database/scores.txt on the first run)
+        self.store = None
+        if scores:
+            self.store = ScoreStore(scores, legacy="database/scores.txt")
+
         # create score
         self.score = games.Text(value=0,
                                 size=30,
@@ -31,8 +152,8 @@ class Game():
                          y=games.screen.height/2)
         games.screen.add(self.ship)
 
-    def play(self):
-        """ Starts game """
+    def play(self, max_ticks=None):
+        """ Starts game (stops after max_ticks ticks, if given) """
         # begin music theme
         games.music.load("sounds/theme.mid")
         games.music.play(-1)
@@ -45,71 +166,37 @@ class Game():
         self.advance()
 
         # start game
-        games.screen.mainloop()
+        games.screen.mainloop(max_ticks)
 
     def advance(self):
         """ Advance to the next level """
         self.level += 1
 
-        # reserved space around the ship
-        BUFFER = 150
-
-        # create new asteroids
-        for i in range(self.level):
-            # calculate an x and y at least BUFFER distance from the ship
-
-            # choose minimum distance along x-axis and y-axis
-            x_min = random.randrange(BUFFER)
-            y_min = BUFFER - x_min
+        # create new asteroids over the next few ticks
+        self.spawner.start(self.level)
 
-            # choose distance along x-axis and y-axis based on minimum distance
-            x_distance = random.randrange(x_min, games.screen.width - x_min)
-            y_distance = random.randrange(y_min, games.screen.height - y_min)
+        # display level number
+        level_message = games.Message(value="Level "+str(self.level),
+                                      size=40,
+                                      color=color.yellow,
+                                      x=games.screen.width/2,
+                                      y=games.screen.height/10,
+                                      lifetime=3*games.screen.fps,
+                                      is_collideable=False)
+        games.screen.add(level_message)
 
-            # calculate location based on distance
-            x = self.ship.x + x_distance
-            y = self.ship.y + y_distance
-
-            # wrap around screen, if necessary
-            x %= games.screen.width
-            y %= games.screen.height
-
-            # create the asteroid
-            if i % 2 == 0:
-                size = Asteroid.LARGE
-                lifes = 1
-            else:
-                size = Asteroid.POWERFUL
-                lifes = 3
-            new_asteroid = Asteroid(game=self,
-                                    x=x, y=y,
-                                    size=size,
-                                    lifes=lifes)
-            games.screen.add(new_asteroid)
-            self.asteroids.append(new_asteroid)
-
-            # display level number
-            level_message = games.Message(value="Level "+str(self.level),
-                                          size=40,
-                                          color=color.yellow,
-                                          x=games.screen.width/2,
-                                          y=games.screen.height/10,
-                                          lifetime=3*games.screen.fps,
-                                          is_collideable=False)
-            games.screen.add(level_message)
-
-            # play new level sound (except at first level)
-            if self.level > 1:
-                self.sound.play()
+        # play new level sound (except at first level)
+        if self.level > 1:
+            games.audio.play(self.sound)
 
     def end(self):
         """ Ends game """
+        self.spawner.cancel()
+
         # Destroy all asteroids on the screen
-        for asteroid in self.asteroids:
-            children = asteroid.get_asteroids()
-            for child in children:
-                child.totally_die()
-            asteroid.totally_die()
+        for sprite in games.screen.all_objects:
+            if isinstance(sprite, Asteroid):
+                sprite.totally_die()
 
         # show 'Game over' for 1 second
         end_message = games.Message(value="Game over",
@@ -124,7 +211,27 @@ class Game():
 
     def records(self):
         """ Enter player's name and display top 3 players """
+        if self.store is None:
+            self.final_score()
+            return
         scores = Scores(score=str(self.score.value),
-                        filename="database/scores.txt",
+                        store=self.store,
                         value="Enter your name: ")
         games.screen.add(scores)
+
+    def final_score(self):
+        """ Display the player's score, for games without top scores """
+        score = games.Text(value="Your score: " + str(self.score.value),
+                           size=60,
+                           color=color.black,
+                           x=games.screen.width/2,
+                           y=games.screen.height/2,
+                           is_collideable=False)
+        games.screen.add(score)
+        label = games.Text(value="<press Esc to exit>",
+                           size=40,
+                           color=color.black,
+                           x=games.screen.width/2,
+                           y=410,
+                           is_collideable=False)
+        games.screen.add(label)
@@ -1,12 +1,20 @@
 from livewires import games, color
 import random
 import math
-import operator
+import string
 from screen import Wrapper, Collider
 
 
+def load_images(filenames):
+    """ Load a dict of images, keeping the keys """
+    return dict((key, games.load_image(filename))
+                for key, filename in filenames.items())
+
+
 class Asteroid(Wrapper):
     """ Moving asteroid on the screen """
+    __slots__ = ("game", "size")
+    layer = "asteroids"
     SMALL = 1
     MEDIUM = 2
     LARGE = 3
@@ -14,19 +22,20 @@ class Asteroid(Wrapper):
     SPAWN = 2
     POINTS = 30
     total = 0
-    images = {SMALL: games.load_image("images/asteroid_small.bmp"),
-              MEDIUM: games.load_image("images/asteroid_med.bmp"),
-              LARGE: games.load_image("images/asteroid_big.bmp"),
-              POWERFUL: games.load_image("images/asteroid_powerful.bmp")}
+    # images and sounds are loaded when first used (see games.LazyAsset)
+    images = games.LazyAsset(load_images,
+                             {SMALL: "images/asteroid_small.bmp",
+                              MEDIUM: "images/asteroid_med.bmp",
+                              LARGE: "images/asteroid_big.bmp",
+                              POWERFUL: "images/asteroid_powerful.bmp"})
     SPEED = 2
 
     def __init__(self, game, x, y, size, lifes):
         """ Initialize sprite with asteroid image """
-        self.lifes = lifes
         Asteroid.total += 1
-        self.asteroids = []
 
         super(Asteroid, self).__init__(
+            lifes=lifes,
             image=Asteroid.images[size],
             x=x, y=y,
             dx=random.choice([-1, 1]) * Asteroid.SPEED *
@@ -37,6 +46,24 @@ class Asteroid(Wrapper):
         self.game = game
         self.size = size
 
+    def on_acquire(self, game, x, y, size, lifes):
+        """ Reuse a destroyed asteroid taken from the pool """
+        Asteroid.total += 1
+        self.lifes = lifes
+        if size != self.size:
+            self.image = Asteroid.images[size]
+        self._revive(x=x, y=y,
+                     dx=random.choice([-1, 1]) * Asteroid.SPEED *
+                     random.random() / size * 2.5,
+                     dy=random.choice([-1, 1]) * Asteroid.SPEED *
+                     random.random() / size * 2.5)
+        self.game = game
+        self.size = size
+
+    def on_release(self):
+        """ Forget the game before going to the pool """
+        self.game = None
+
     def die(self):
         """ Destroys asteroid """
         Asteroid.total -= 1
@@ -47,16 +74,16 @@ class Asteroid(Wrapper):
         # if size of asteroid isn't small, replace with two smaller asteroids
         if self.size != Asteroid.SMALL and self.size != Asteroid.POWERFUL:
             for i in range(Asteroid.SPAWN):
-                new_asteroid = Asteroid(game=self.game,
-                                        x=self.x,
-                                        y=self.y,
-                                        size=self.size - 1,
-                                        lifes=1)
+                new_asteroid = Asteroid.pool.acquire(game=self.game,
+                                                     x=self.x,
+                                                     y=self.y,
+                                                     size=self.size - 1,
+                                                     lifes=1)
                 games.screen.add(new_asteroid)
-                self.asteroids.append(new_asteroid)
 
-        # if all asteroids are gone, advance to next level
-        if Asteroid.total == 0:
+        # if all asteroids are gone (and no more are coming), advance to
+        # next level
+        if Asteroid.total == 0 and not self.game.spawner.pending():
             self.game.advance()
 
         super(Asteroid, self).die()
@@ -67,16 +94,19 @@ class Asteroid(Wrapper):
         """
         super(Asteroid, self).die()
 
-    def get_asteroids(self):
-        """ Returns list of asteroids on the screen """
-        return self.asteroids
+
+# asteroids split all the time; every split takes two from the pool
+Asteroid.pool = games.Pool(Asteroid, max_size=64)
 
 
 class Ship(Collider):
     """ Player's ship """
-    image = games.load_image("images/ship.bmp")
-    sound = games.load_sound("sounds/thrust.wav")
+    __slots__ = ("game", "missile_wait")
+    layer = "ship"
     ROTATION_STEP = 5
+    image = games.LazyAsset(games.load_image, "images/ship.bmp",
+                            prebake=ROTATION_STEP)
+    sound = games.LazyAsset(games.load_sound, "sounds/thrust.wav")
     VELOCITY_STEP = .07
     MISSILE_DELAY = 20
     VELOCITY_MAX = 4
@@ -99,7 +129,7 @@ class Ship(Collider):
 
         # move ship
         if games.keyboard.is_pressed(games.K_UP):
-            Ship. sound.play()
+            games.audio.sustain(Ship.sound)
 
             # change velocity components based on ship's angle
             angle = self.angle * math.pi / 180  # convert to radians
@@ -111,7 +141,7 @@ class Ship(Collider):
             self.dy = min(max(self.dy, -Ship.VELOCITY_MAX), Ship.VELOCITY_MAX)
 
         if games.keyboard.is_pressed(games.K_DOWN):
-            Ship. sound.play()
+            games.audio.sustain(Ship.sound)
 
             # change velocity components based on ship's angle
             angle = self.angle * math.pi / 180  # convert to radians
@@ -128,7 +158,7 @@ class Ship(Collider):
 
         # if pressed space and missile wait is over, then launch missile
         if games.keyboard.is_pressed(games.K_SPACE) and self.missile_wait == 0:
-            new_missile = Missile(self.x, self.y, self.angle)
+            new_missile = Missile.pool.acquire(self.x, self.y, self.angle)
             games.screen.add(new_missile)
             self.missile_wait = Ship.MISSILE_DELAY
 
@@ -140,16 +170,37 @@ class Ship(Collider):
 
 class Missile(Collider):
     """ A missile launched by the player's ship """
-    image = games.load_image("images/missile.bmp")
-    sound = games.load_sound("sounds/missile.wav")
+    __slots__ = ("lifetime",)
+    layer = "projectiles"
+    image = games.LazyAsset(games.load_image, "images/missile.bmp")
+    sound = games.LazyAsset(games.load_sound, "sounds/missile.wav")
     BUFFER = 40
     VELOCITY_FACTOR = 12
     LIFETIME = 30
 
     def __init__(self, ship_x, ship_y, ship_angle):
         """ Initialize sprite with missile image """
-        Missile.sound.play()
+        games.audio.play(Missile.sound)
+
+        # create the missile
+        x, y, dx, dy = Missile.launch(ship_x, ship_y, ship_angle)
+        super(Missile, self).__init__(image=Missile.image,
+                                      x=x, y=y,
+                                      dx=dx, dy=dy)
+        self.lifetime = Missile.LIFETIME
 
+    def on_acquire(self, ship_x, ship_y, ship_angle):
+        """ Reuse a destroyed missile taken from the pool """
+        games.audio.play(Missile.sound)
+
+        x, y, dx, dy = Missile.launch(ship_x, ship_y, ship_angle)
+        self._revive(x=x, y=y, dx=dx, dy=dy)
+        self.lifes = 1
+        self.lifetime = Missile.LIFETIME
+
+    @staticmethod
+    def launch(ship_x, ship_y, ship_angle):
+        """ Return missile's starting position and velocity """
         # convert to radians
         angle = ship_angle * math.pi / 180
 
@@ -163,11 +214,7 @@ class Missile(Collider):
         dx = Missile.VELOCITY_FACTOR * math.sin(angle)
         dy = Missile.VELOCITY_FACTOR * -math.cos(angle)
 
-        # create the missile
-        super(Missile, self).__init__(image=Missile.image,
-                                      x=x, y=y,
-                                      dx=dx, dy=dy)
-        self.lifetime = Missile.LIFETIME
+        return x, y, dx, dy
 
     def update(self):
         """ Move the missile """
@@ -179,55 +226,50 @@ class Missile(Collider):
             self.destroy()
 
 
+# at most a few missiles fly at once (see Ship.MISSILE_DELAY)
+Missile.pool = games.Pool(Missile, max_size=16)
+
+
 class Scores(games.Text):
     """ Save/display top scores after end of the game. """
+    __slots__ = ("default_length", "score", "store", "top_players")
+    # characters allowed in a name
+    CHARACTERS = string.ascii_letters + string.digits
+    MAX_LENGTH = 25
+
     def __init__(self, score,
-                 filename,
+                 store,
                  value, size=60,
                  color=color.black,
-                 x=games.screen.width/2,
-                 y=games.screen.height/2,
-                 delay=5):
-
+                 x=None, y=None):
+        """ Initialize text (centered on the screen by default) """
+        if x is None:
+            x = games.screen.width/2
+        if y is None:
+            y = games.screen.height/2
         super(Scores, self).__init__(value=value,
                                      size=size,
                                      color=color,
                                      x=x, y=y)
 
         self.default_length = len(self.value)
-        self.filename = filename
+        self.store = store
         self.score = str(score)
-        self.delay = delay
-        self.time_remain = delay
         self.top_players = []
 
     def update(self):
-        """ Ley user enter his nickname. """
-        if (self.time_remain != 0):
-            self.time_remain -= 1
-
-        alphabet = [ch_code for ch_code in range(97, 122)]
-        numbers = [ch_code for ch_code in range(48, 58)]
-
-        # Enter letters
-        for char_code in alphabet:
-            if games.keyboard.is_pressed(char_code) and \
-               self.time_remain == 0 and len(self.value) < 25:
-                self.value += chr(char_code).upper()
-                self.time_remain = self.delay
-        # Enter digits
-        for char_code in numbers:
-            if games.keyboard.is_pressed(char_code) and \
-               self.time_remain == 0 and len(self.value) < 25:
-                self.value += chr(char_code).upper()
-                self.time_remain = self.delay
+        """ Let user enter his nickname from the keys typed this tick. """
+        # Enter letters and digits
+        for char in games.keyboard.text:
+            if char in Scores.CHARACTERS and \
+               len(self.value) < Scores.MAX_LENGTH:
+                self.value += char.upper()
         # Enter backspace
-        if games.keyboard.is_pressed(games.K_BACKSPACE) and \
-           self.time_remain == 0 and len(self.value) > 17:
+        if games.keyboard.was_pressed(games.K_BACKSPACE) and \
+           len(self.value) > self.default_length:
             self.value = self.value[:-1]
-            self.time_remain = self.delay
         # Enter return
-        if games.keyboard.is_pressed(games.K_RETURN):
+        if games.keyboard.was_pressed(games.K_RETURN):
             # Save score to database and display top scores
             # If username is empty set is to PLAYER
             if (len(self.value) == self.default_length):
@@ -235,22 +277,8 @@ class Scores(games.Text):
             self.you_lose()
 
     def get_top(self):
-            """ Get top 3 players from file """
-            scores_arr = []
-            with open(self.filename) as scores:
-                for player in scores:
-                    player = player[:-1]
-                    temp = [player.split()[0], int(player.split()[1])]
-                    scores_arr.append(temp)
-            top3players_int = sorted(scores_arr,
-                                     key=operator.itemgetter(1),
-                                     reverse=True)[:3]
-            top3players = []
-            for i in range(len(top3players_int)):
-                top3players.append([top3players_int[i][0],
-                                   str(top3players_int[i][1])])
-
-            return top3players
+        """ Get top 3 players from the score store """
+        return [[name, str(points)] for name, points in self.store.top(3)]
 
     def show_top(self):
         """ Display top scores """
@@ -302,8 +330,6 @@ class Scores(games.Text):
 
     def you_lose(self):
         """ Save score to database and display top scores """
-        with open(self.filename, 'a') as f:
-            # Save score to the file
-            f.write(self.value[17:] + ' ' + self.score + '\n')
+        self.store.add(self.value[self.default_length:], self.score)
         self.destroy()
         self.show_top()
\ No newline at end of file
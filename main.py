@@ -1,14 +1,123 @@
-# # # # # # # # # #
-# Astrocrash game #
-# # # # # # # # # #
-
-from game import Game
-
-
-def main():
-    astrocrash = Game()
-    astrocrash.play()
-
-
-if __name__ == "__main__":
-    main()
+# # # # # # # # # #
+# Astrocrash game #
+# # # # # # # # # #
+
+import time
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import random
+
+# time from starting main.py to the first frame on the screen
+FIRST_FRAME_TARGET = 0.5
+
+
+class StartupTimer(object):
+    """ Times the steps of the game's startup """
+    def __init__(self):
+        self.steps = []
+        self.last = STARTED
+
+    def mark(self, label):
+        """ Record the time since the previous mark under a label """
+        now = time.perf_counter()
+        self.steps.append((label, now - self.last))
+        self.last = now
+
+    def report(self, games):
+        """ Print the steps, the assets loaded and the first frame time """
+        print("startup (since main.py started):")
+        for label, seconds in self.steps:
+            print("  %-32s %8.1f ms" % (label, seconds * 1000))
+        load_times = games.assets.load_times
+        print("  %-32s %8.1f ms" % ("%d asset files" % len(load_times),
+                                    sum(t for name, t in load_times) * 1000))
+        for name, seconds in sorted(load_times, key=lambda load: load[1],
+                                    reverse=True)[:5]:
+            print("    %-30s %8.1f ms" % (name, seconds * 1000))
+        first_frame = games.screen.first_frame_time
+        if first_frame is not None:
+            first_frame -= STARTED
+            print("  %-32s %8.1f ms (target %.0f ms: %s)"
+                  % ("first frame", first_frame * 1000,
+                     FIRST_FRAME_TARGET * 1000,
+                     "ok" if first_frame <= FIRST_FRAME_TARGET else "over"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Astrocrash game")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window or sound, unthrottled")
+    parser.add_argument("--no-render", action="store_true",
+                        help="with --headless, skip drawing altogether")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="stop after this many ticks")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the seed and all input to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a recording headless, unthrottled")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each step of startup took")
+    parser.add_argument("--checksum-interval", type=int, default=50,
+                        metavar="N",
+                        help="with --record, checksum the sprites every "
+                             "N ticks (default 50)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    timer = StartupTimer()
+    if args.replay:
+        args.headless = True
+    if args.headless:
+        os.environ["LIVEWIRES_HEADLESS"] = "1"
+        if args.no_render:
+            os.environ["LIVEWIRES_RENDER"] = "0"
+
+    from livewires import games
+    timer.mark("import livewires.games")
+    import screen
+    timer.mark("import screen")
+    from game import Game
+    timer.mark("import game")
+    screen.init()
+    timer.mark("open the screen")
+
+    if args.record:
+        games.keyboard = games.InputRecorder(
+            args.record, checksum_interval=args.checksum_interval)
+        random.seed(games.keyboard.seed)
+    elif args.replay:
+        games.keyboard = games.InputReplay(args.replay)
+        random.seed(games.keyboard.seed)
+
+    if args.record or args.replay:
+        # a recording has to play the same again: spawn a fixed number
+        # of asteroids a tick, not as many as fit in the time budget
+        astrocrash = Game(spawn_budget=None)
+    else:
+        astrocrash = Game()
+    timer.mark("create the game")
+    astrocrash.play(max_ticks=args.ticks)
+    if args.startup_report:
+        timer.report(games)
+
+    if args.record:
+        games.keyboard.close()
+    elif args.replay:
+        replay = games.keyboard
+        print("replayed %d ticks, %d checksums, %d divergent"
+              % (games.screen.ticks, replay.checked,
+                 len(replay.divergences)))
+        if replay.divergences:
+            print("first divergence at tick %d" % replay.divergences[0][0])
+
+    if games.screen.headless:
+        print("%d ticks, %.0f ticks/sec" % (games.screen.ticks,
+                                            games.screen.ticks_per_second))
+
+
+if __name__ == "__main__":
+    main()
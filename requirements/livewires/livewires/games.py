@@ -1,894 +1,3318 @@
-###############################################################################
-### Games support module for LiveWires using pygame. 
-### 
-### $Revision: 1.7 $ -- $Date: 2001/10/27 17:43:51 $ 
-############################################################################### 
-# Copyright Richard Crook, Gareth McCaughan, Rhodri James, Neil Turton
-# and Paul Wright.  All rights reserved. 
-#  
-# Redistribution and use in source and binary forms, with or without
-# modification, are permitted provided that the following conditions are
-# met: 
-#  
-# Redistributions of source code must retain the above copyright notice,
-# this list of conditions and the following disclaimer. 
-#  
-# Redistributions in binary form must reproduce the above copyright
-# notice, this list of conditions and the following disclaimer in the
-# documentation and/or other materials provided with the distribution. 
-#  
-# Neither name of Scripture Union nor LiveWires nor the names of its
-# contributors may be used to endorse or promote products derived from
-# this software without specific prior written permission. 
-#  
-# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
-# ``AS IS'' AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
-# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
-# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SCRIPTURE UNION
-# OR THE CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
-# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
-# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
-# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
-# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
-# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
-# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE. 
-############################################################################### 
-###############################################################################
-# Modified by Michael Dawson
-# 5/24/05
-#
-#  Restructured Classes
-#       - created a single Sprite class (no multiple inheritance)
-#       - added properties to classes (getter and setter methods still available)
-#       - added Question class to get user keyboard input
-#       - added Mouse class for mouse input
-#       - added Keyboard class for keyboard input
-#       - added Music class to access music channel
-#
-#  Revised Animation Class
-#       - now receives only one list of images to animate
-#       - images now displayed in order, from first frame to last (not the reverse)
-#       - n_repeats represents number of cycles to display (not number of frames)
-#
-#  "Americanized" Spelling
-#	- 'colour' is now 'color'
-###############################################################################
-
-import pygame, pygame.image, pygame.mixer, pygame.font, pygame.transform 
-import pygame.draw 
-from pygame.locals import * 
-
-pygame.init() 
- 
- 
-############################################################################### 
-## Error classes ############################################################## 
-############################################################################### 
- 
-class GamesError(Exception): pass
-
-
-############################################################################### 
-## Mouse class ################################################################ 
-###############################################################################
-
-class Mouse(object):
-    #------Properties--------#
-
-    ## position
-    def get_position(self):
-        return pygame.mouse.get_pos()
-    
-    def set_position(self, new_position):
-        pygame.mouse.set_pos(new_position)
-    
-    position = property(get_position, set_position)
-
-    ## x
-    def get_x(self):
-        return pygame.mouse.get_pos()[0]
-    
-    def set_x(self, new_x):
-        current_y = pygame.mouse.get_pos()[1]
-        pygame.mouse.set_pos( (new_x, current_y) )
-        
-    x = property(get_x, set_x)
-
-    ## y
-    def get_y(self):
-        return pygame.mouse.get_pos()[1]
-    
-    def set_y(self, new_y):
-        current_mouse_x = pygame.mouse.get_pos()[0]
-        pygame.mouse.set_pos( (current_x, new_y) )
-
-    y = property(get_y, set_y)
-
-    ## is visible
-    def set_is_visible(self, new_visibility):
-        pygame.mouse.set_visible(new_visibility)
-    is_visible = property(fset = set_is_visible)
-
-    def is_pressed(self, button_number):
-        return pygame.mouse.get_pressed()[button_number] == 1
-
-
-############################################################################### 
-## Keyboard class ############################################################# 
-###############################################################################
-
-class Keyboard(object):
-    def is_pressed(self, key):
-        return pygame.key.get_pressed()[key] == 1
-
-
-############################################################################### 
-## Music class ################################################################ 
-###############################################################################
-
-class Music(object):
-    def load(self, filename):
-        pygame.mixer.music.load(filename)
-
-    def play(self, loop=0):
-        pygame.mixer.music.play(loop)
-
-    def fadeout(self, millisec):
-        pygame.mixer.music.fadeout(millisec)
-
-    def stop(self):
-        pygame.mixer.music.stop()
-
-
-############################################################################### 
-## Screen class ############################################################### 
-############################################################################### 
-##                                           
-## The Screen object represents the playing area. Since we can have  
-## only one screen under pygame, it's just a handy container for stuff 
-## 
-############################################################################### 
- 
-class Screen(object): 
- 
-    initialized = 0 
- 
-    def __init__ (self, width=640, height=480, fps=50): 
-        # Bomb if you try this more than once
-        if Screen.initialized: 
-            raise GamesError("Cannot have more than on Screen object")
-         
-        Screen.initialized = 1
-
-        # Create the pygame display
-        #self._display = pygame.display.set_mode ((width, height), HWSURFACE)
-        self._display = pygame.display.set_mode ((width, height))
-        self._width = width  
-        self._height = height
-        self._background = self._display.convert()
- 
-        # Initialize a list of objects in play 
-        self._objects = [] 
-        # Initialize list dirty rectangles to be repainted 
-        self._dirtyrects = [] 
- 
-        # Time when we should draw the next frame 
-        self._next_tick = 0
-
-        # Frames per second screen will be updated
-        self._fps = fps
- 
-    #------Properties--------#
-
-    ## width
-    def get_width(self):
-        return self._width
-    
-    width = property(get_width)
-
-    ## height
-    def get_height(self):
-        return self._height
-    
-    height = property(get_height)
-
-    ## fps
-    def get_fps(self):
-        return self._fps
-    
-    fps = property(get_fps)
-
-    ## background
-    def get_background(self):
-        return self._background
-    
-    def set_background(self, new_background): 
-        """ 
-        Set the background to the surface provided. Note that the  
-        surface should not have transparency set, or weird things 
-        will happen. 
-        """
-        self._background = pygame.Surface((self._width, self._height)) 
-        for x in range(0, self._width, new_background.get_width()): 
-            for y in range(0, self._height, new_background.get_height()): 
-                self._background.blit(new_background, (x, y)) 
-                 
-        self._display.blit(self._background, (0,0)) 
-        pygame.display.update()
-
-    background = property(get_background, set_background)
-
-    ## all objects
-    def get_all_objects(self): 
-        """ 
-        Returns a list of all the Sprites on the Screen. 
-        """ 
-        return self._objects[:]
-    all_objects = property(get_all_objects)
-
-    ## event_grab
-    def get_event_grab(self):
-        return pygame.event.get_grab()
-    
-    def set_event_grab(self, new_status):
-        pygame.event.set_grab(new_status)
-        
-    event_grab = property(get_event_grab, set_event_grab)
-        
-    def tick(self): 
-        """ 
-        If you override the tick method in a subclass of the Screen 
-        class, you can specify actions which are carried out every 
-        tick. 
-        """ 
-        pass
-
-    def keypress(self, key):
-        """
-        If you override the keypress method, you will be able to
-        handle individual keypresses instead of dealing with the
-        keys held down as in the standard library
-        """
-        pass
-
-    def handle_events(self):
-        """
-        If you override this method in a subclass of the Screen
-        class, you can specify how to handle different kinds of
-        events.  However you must handle the quit condition!
-        """
-        events = pygame.event.get()
-        for event in events:
-            if event.type == QUIT:
-                self.quit()
-            elif event.type == KEYDOWN:
-                if event.key == K_ESCAPE:
-                    self.quit()
-                else:
-                    self.keypress(event.key)
- 
-    def quit(self): 
-        """ 
-        Calling this method will stop the main loop from running and 
-        make the graphics window disappear. 
-        """ 
-        self._exit = 1 
- 
-    def clear(self):
-        """
-        Destroy all objects on this Screen.
-        """
-        for object in self._objects[:]:
-            object.destroy()
-        self._objects = []
- 
-    def _update_display(self):
-        """
-        Get the actual display in sync with reality.
-        """
-        pygame.display.update(self._dirtyrects)
-        self._dirtyrects = []
-
-    def mainloop(self): 
-        """ 
-        Run the pygame main loop. This will animate the objects on the 
-        screen and call their tick methods every tick. 
-        """ 
-        self._exit = 0 
- 
-        while not self._exit: 
-            self._wait_frame()
-
-            for object in self._objects: 
-                object._erase()
-
-            # Take a copy of the _objects list as it may get changed in place. 
-            for object in self._objects[:]: 
-                if object._tickable:
-                    object._tick() 
- 
-            self.tick() 
- 
-            for object in self._objects: 
-                object._draw()
-
-            self._update_display()
-            pygame.display.flip()
-
-            self.handle_events() 
- 
-        # Throw away any pending events.
-        pygame.event.get()
- 
-    def _wait_frame (self): 
-        "Wait for the correct fps time to expire" 
-        this_tick = pygame.time.get_ticks() 
-        if this_tick < self._next_tick: 
-            pygame.time.delay(int(self._next_tick+0.5) - this_tick) 
-        self._next_tick = this_tick + (1000./self._fps) 
-
-    def overlapping_objects(self, rectangle): 
-        """ 
-        Return list of all sprites which overlap given rectangle.
-        """ 
-        rect = pygame.Rect (rectangle)
-
-        rect_list = []
-        for obj in self._objects:
-            rect_list.append (obj._rect)
-
-        indices = rect.collidelistall (rect_list)
-
-        over_objects = [] 
-        for index in indices:
-            if (self._objects[index]).is_collideable:
-                over_objects.append (self._objects [index]) 
-
-        return over_objects
-
-    def _elevate(self, it, above=None):
-        """
-        Elevates an object to the top of the stack, or above the specified
-        object.
-        """
-        # This makes sure we're always in a consistent state.
-        objects = self._objects[:]
-        # Remove the object from the list.
-        objects.remove(it)
-        if above == None:
-            # Put it on top (the end).
-            objects.append(it)
-        else:
-            # Put the object after <above>.
-            idx = 1+objects.index(above)
-            objects[idx:idx]=[it]
-        # Install the new list.
-        self._objects = objects
-
-    def _lower(self, object, below=None):
-        """
-        Lower an object to the bottom of the stack, or below the specified
-        object.
-        """
-        # This makes sure we're always in a consistent state.
-        objects = self._objects[:]
-        objects.remove(it)
-        if below == None:
-            # Put the object on the beginning (bottom) of the list.
-            self._objects = [it]+objects
-        else:
-            # Put the object before (below) the aboject.
-            idx = objects.index(below)
-            objects[idx:idx]=[it]
-            self._objects = objects
-
-    def add(self, sprite):
-        self._objects.append(sprite)
-      
-    def remove(self, sprite):
-        try:
-            self._objects.remove(sprite)
-        except ValueError:
-            # Already done it: happens in some games, not an error.
-            pass
-
-    def blit_and_dirty (self, source_surf, dest_pos):
-        """
-        You probably won't need to use this method in your own programs,
-        as |Sprite| and its sub-classes know how to draw themselves on
-        the screen. You'd need to use method if you wanted to draw an
-        image on the screen which wasn't an |Sprite|.
-
-        This method blits (draws, taking account of transparency) the
-        given source surface |source_surf| to the screen at the position
-        given by |dest_pos|. 
-
-        It then remembers the place where the surface was drawn as
-        ``dirty''.  This means that when the display is updated on the
-        next tick, this part of it will be redrawn. 
-        """
-        rect = self._display.blit(source_surf, dest_pos) 
-        self._dirtyrects.append(rect)
-
-
-    def blit_background(self, rect):
-        """
-        This method draws the background over the given rectangle, and
-        marks that rectangle as ``dirty'' (see the |blit_and_dirty|
-        method for what that means). It's used to erase an object before
-        moving it. You shouldn't need to call it yourself.
-        """
-        rect = self._display.blit(self._background, rect, rect)
-        self._dirtyrects.append(rect)
-         
-
-############################################################################### 
-## Sprite class ###############################################################
-############################################################################### 
-##                                                                           ## 
-## Sprite represents a graphical object on the screen. Sprites               ## 
-## can be moved, rotated, deleted, and maybe have other things done to them. ## 
-##                                                                           ## 
-############################################################################### 
-
-class Sprite(object): 
-    def __init__(self, image, angle=0,
-                 x=0, y=0,
-                 top=None, bottom=None, left=None, right=None,
-                 dx=0, dy=0,
-                 interval=1, is_collideable=True):
-        
-        if not Screen.initialized: 
-            raise GamesError("Screen object must be intialized before any Sprite object") 
- 
-        self._surface = image 
-        self._orig_surface = image    # Surface before any rotation 
-        self._rect = self._surface.get_rect() 
-
-        self.position = (x, y)
-
-        if top != None:
-            self.top = top
-        if bottom != None:
-            self.bottom = bottom
-        if left != None:
-            self.left = left
-        if right != None:
-            self.right = right
-
-        self.velocity = (dx, dy) 
-
-        self._angle = angle % 360
-        if self._angle != 0:
-            self._rotate() 
-
-        self.is_collideable = is_collideable
-
-        self._interval = interval 
-        self._tickable = 1 
-        self._next = 0
-
-        self._gone = 0
-
-    def __del__(self):
-        if screen and not self._gone:
-            self.destroy()
-
-    def _draw(self): 
-        """ 
-        Draw object on screen by blitting the image onto the screen. 
-        """ 
-        screen.blit_and_dirty(self._surface, self._rect)
-
-    def _erase(self): 
-        """ 
-        Erase object from screen by blitting the background over where  
-        it was. 
-        """
-        screen.blit_background(self._rect)
- 
-    def _replace(self, new_surface): 
-        x, y = self.position 
-        self._surface = new_surface 
-        self._rect = self._surface.get_rect() 
-        self.position = (x, y)
-
-    def _rotate(self): 
-        self._replace(pygame.transform.rotate(self._orig_surface, -self._angle))
-
-    def _tick(self):
-        self._next = self._next + 1 
-        if self._next >= self._interval: 
-            self._next = 0  
-            self.tick()
-        if self._dx or self._dy:
-            self.position = ( (self._x + self._dx), (self._y + self._dy) )
-        self.update()
-
-    def start (self): 
-        self._tickable = 1 
-        self._next = 0 
-
-    def stop (self): 
-        self._tickable = 0 
-
-    def update(self):
-        pass
-
-    def tick(self):
-        pass
- 
-    def overlaps(self, other):
-        if not self.is_collideable or not other.is_collideable:
-            return False
-        else:
-            return self._rect.colliderect(other._rect) 
-     
-    def elevate(self, above=None):
-        """
-        Elevate an object to the top of the stack, or above the specified
-        object.
-        """
-        screen._elevate(self, above)
-     
-    def lower(self, below=None):
-        """
-        Lower an object to the bottom of the stack, or below the specified
-        object.
-        """
-        screen._lower(self, below)
-
-    def destroy(self): 
-        """ 
-        Erase object from screen and remove it from the list of objects 
-        maintained by games module. 
-        """
-        self._erase()
-        screen.remove(self) 
-        self._gone = 1
-
-    #------Properties--------#
-
-    ## x
-    def get_x(self):
-        return self._x
-    def set_x(self, new_x):
-        self._x = new_x
-        self._rect.centerx = int(self._x)
-    x = property(get_x, set_x)
-
-    ## y
-    def get_y(self):
-        return self._y
-    def set_y(self, new_y):
-        self._y = new_y
-        self._rect.centery = int(self._y)
-    y = property(get_y, set_y)
-
-    ## position
-    def get_position(self):
-        return ( (self.x, self.y) )
-    def set_position(self, new_position):
-        self.x, self.y = new_position
-    position = property(get_position, set_position)
-
-    ## dx
-    def get_dx(self):
-        return self._dx
-    def set_dx(self, new_dx):
-        self._dx = new_dx
-    dx = property(get_dx, set_dx)
-
-    ## dy
-    def get_dy(self):
-        return self._dy
-    def set_dy(self, new_dy):
-        self._dy = new_dy
-    dy = property(get_dy, set_dy)
-
-    ## velocity
-    def get_velocity(self):
-        return ( (self.dx, self.dy) )
-    def set_velocity (self, new_velocity): 
-        self.dx, self.dy = new_velocity
-    velocity = property(get_velocity, set_velocity)
-
-    ## left
-    def get_left(self):
-        return self._rect.left
-    def set_left(self, new_left):
-        self._rect.left = new_left
-        self._x = self._rect.centerx
-    left = property(get_left, set_left)
-
-    ## right
-    def get_right(self):
-        return self._rect.right
-    def set_right(self, new_right):
-        self._rect.right = new_right
-        self._x = self._rect.centerx
-    right = property(get_right, set_right)
-
-    ## top
-    def get_top(self):
-        return self._rect.top
-    def set_top(self, new_top):
-        self._rect.top = new_top
-        self._y = self._rect.centery
-    top = property(get_top, set_top)
-
-    ## bottom
-    def get_bottom(self):
-        return self._rect.bottom
-    def set_bottom(self, new_bottom):
-        self._rect.bottom = new_bottom
-        self._y = self._rect.centery
-    bottom = property(get_bottom, set_bottom)
-
-    ## angle
-    def get_angle(self):
-        return self._angle
-    def set_angle(self, new_angle):
-        self._angle = new_angle % 360 
-        self._rotate() 
-    angle = property(get_angle, set_angle)
-
-    ## image
-    def get_image(self):
-        return self._orig_surface
-    def set_image(self, new_image): 
-        self._orig_surface = new_image 
-        if self._angle != 0: 
-            self._rotate() 
-        else: 
-            self._replace(new_image) 
-    image = property(get_image, set_image)
-
-    ## height
-    def get_height(self):
-        return self._surface.get_height()
-    height = property(get_height)
-
-    ## width
-    def get_width(self):
-        return self._surface.get_width()
-    width = property(get_width)
-
-    ## is_collideable
-    def get_is_collideable(self):
-        return self._is_collideable
-    def set_is_collideable(self, new_status):
-        self._is_collideable = new_status
-    is_collideable = property(get_is_collideable, set_is_collideable)
-
-
-    ## overlapping_sprites
-    def get_overlapping_sprites(self): 
-        overlapping = screen.overlapping_objects(self._rect)
-        if self in overlapping:
-            overlapping.remove(self)
-        return overlapping
-    overlapping_sprites = property(get_overlapping_sprites)
-
-    ## interval
-    def get_interval(self):
-        return self._interval
-    def set_interval(self, new_interval):
-        self._interval = new_interval
-    interval = property(get_interval, set_interval)
-
-
-class Text(Sprite): 
-    """ 
-    Alphanumeric values displayed on the screen.
-    """      
-    def __init__(self, value, size, color, angle=0,
-                 x=0, y=0,
-                 top=None, bottom=None, left=None, right=None,
-                 dx=0, dy=0,
-                 interval=1, is_collideable=True):
-        self._size = size 
-        self._color = color 
-        self._value = value
-        self._font = pygame.font.Font(None, self._size)
-        Sprite.__init__(self, self._create_surface(), angle,
-                        x, y,
-                        top, bottom, left, right,
-                        dx, dy,
-                        interval, is_collideable)
-
-    def _create_surface(self):
-        return self._font.render(str(self._value), 1, self._color) 
-
-    #------Properties--------#
-
-    ## value
-    def get_value(self): 
-        return self._value
-    
-    def set_value(self, new_value):
-        if new_value != self._value: 
-            self._value = new_value
-            self.image = self._create_surface() 
-            
-    value = property(get_value, set_value)
- 
-    ## color
-    def get_color(self): 
-        return self._color
-    
-    def set_color(self, new_color): 
-        if new_color != self._color: 
-            self._color = new_color 
-            surface = self._create_surface() 
-            self.image = surface
-            
-    color = property(get_color, set_color)
-
-    ## size
-    def get_size(self): 
-        return self._size
-    
-    def set_size(self, new_size): 
-        if new_size != self._size: 
-            self._size = new_size
-            self._font = pygame.font.Font(None, self._size)
-            surface = self._create_surface() 
-            self.image = surface
-
-    size = property(get_size, set_size) 
-
-
-class Question(Text):
-    def __init__(self, value, size, color, angle=0,
-                 x=0, y=0,
-                 top=None, bottom=None, left=None, right=None,
-                 dx=0, dy=0,
-                 interval=1, is_collideable=True, responses=()):
-        Text.__init__(self, value, size, color, angle,
-                      x, y,
-                      top, bottom, left, right,
-                      dx, dy,
-                      interval, is_collideable)    
-        self.responses = responses
-
-    def tick(self):
-        for key, action in self.responses:
-            if keyboard.is_pressed(key):
-                action()
-
-
-class Message(Text):
-    def __init__(self, value, size, color, angle=0,
-                 x=0, y=0,
-                 top=None, bottom=None, left=None, right=None,
-                 dx=0, dy=0,
-                 lifetime=0, is_collideable=True, after_death=None):
-        Text.__init__(self, value, size, color, angle,
-                      x, y,
-                      top, bottom, left, right,
-                      dx, dy,
-                      lifetime, is_collideable) 
-        self._after_death = after_death
-
-    def tick(self):
-        if self._after_death:
-            self._after_death()
-        self.stop()
-        self.destroy()
-
-
-class Animation(Sprite):
-    """
-    An image that changes every repeat_interval ticks.
-    The n_repeats parameter is the number of complete animation cycles to show.
-    If n_repeats <= 0, the animation will repeat forever.
-    You can give list of filenames or list of images.
-    """
-    def __init__(self, images, angle=0,
-                 x=0, y=0,
-                 top=None, bottom=None, left=None, right=None,
-                 dx=0, dy=0,
-                 repeat_interval=1, n_repeats=0, is_collideable=True):
-                 
-        if images and type(images[0]) is type(""):
-            images = load_animation(images)
-	    
-        self.images = images
-        if self.images == []:
-            raise GamesError("An animation with no images is illegal.")
-
-        self.n_repeats = n_repeats or -1
-        if self.n_repeats > 0:
-            self.n_repeats = (self.n_repeats * len(self.images))
-            
-        first_image = self.next_image()
-        
-        Sprite.__init__(self, self.next_image(), angle,
-                        x, y,
-                        top, bottom, left, right,
-                        dx, dy,
-                        repeat_interval, is_collideable)
-
-    def next_image(self):
-        if self.n_repeats==0: return None
-        if self.n_repeats>0: self.n_repeats -= 1
-        new_image = self.images[0]
-        self.images = self.images[1:] + [self.images[0]]
-        return new_image
-
-    def tick(self):
-        new_image = self.next_image()
-        if new_image is None:
-            self.destroy()
-        else:
-            self.image = new_image
-
-
-############################################################################### 
-## Utility Functions 
-############################################################################### 
-def load_image(filename, transparent=True): 
-    """Loads an image, prepares it for play. Returns a pygame.Surface object 
-    which you can give as the "image" parameter to Sprite. 
- 
-    filename -- the filename of the image to load 
-    transparent -- whether the background of the image should be transparent. 
-                   Defaults to true. 
-                   The background color is taken as the color of the pixel 
-                   at (0,0) in the image. 
-    """ 
-    try: 
-        surface = pygame.image.load(filename) 
-    except pygame.error: 
-        raise GamesError( 'Could not load image "%s" %s'%(filename, pygame.get_error()) )
-    if transparent: 
-        corner = surface.get_at((0, 0)) 
-        surface.set_colorkey(corner, RLEACCEL) 
-    return surface.convert()
-
-def scale_image(image, x_scale, y_scale=None):
-    if y_scale is None: y_scale = x_scale
-    (x_size, y_size) = image.get_size()
-    x_size = x_size * x_scale
-    y_size = y_size * y_scale
-    return pygame.transform.scale(image, (x_size, y_size))
-
-def load_animation(filenames, transparent=1):
-    """
-    Loads a number of files.  Receives file names.  Returns corresponding file objects
-    needed by the Animation constructor.
-    """
-    def _(name, transparent=transparent):
-        try: surface = pygame.image.load(name)
-        except pygame.error:
-            raise GamesError( 'Could not load animation frame "%s": %s' % (name, pygame.get_error()) )
-        if transparent:
-            surface.set_colorkey(surface.get_at((0,0)), RLEACCEL)
-        return surface.convert()
-    files = list(map(_, filenames))
-    return files
- 
-def load_sound(filename): 
-    """ 
-    Load a sound file, returning a Sound object. 
-    """ 
-    return pygame.mixer.Sound(filename)
-
-
-############################################################################### 
-## Initialization Function
-############################################################################### 
-def init(screen_width = 640, screen_height = 480, fps = 50):
-    global screen
-    screen = Screen(screen_width, screen_height, fps)
-
-mouse = Mouse()
-keyboard = Keyboard()
-music = Music()
-
-
-
-
-
-
+###############################################################################
+### Games support module for LiveWires using pygame. 
+### 
+### $Revision: 1.7 $ -- $Date: 2001/10/27 17:43:51 $ 
+############################################################################### 
+# Copyright Richard Crook, Gareth McCaughan, Rhodri James, Neil Turton
+# and Paul Wright.  All rights reserved. 
+#  
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: 
+#  
+# Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer. 
+#  
+# Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution. 
+#  
+# Neither name of Scripture Union nor LiveWires nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission. 
+#  
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# ``AS IS'' AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SCRIPTURE UNION
+# OR THE CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE. 
+############################################################################### 
+###############################################################################
+# Modified by Michael Dawson
+# 5/24/05
+#
+#  Restructured Classes
+#       - created a single Sprite class (no multiple inheritance)
+#       - added properties to classes (getter and setter methods still available)
+#       - added Question class to get user keyboard input
+#       - added Mouse class for mouse input
+#       - added Keyboard class for keyboard input
+#       - added Music class to access music channel
+#
+#  Revised Animation Class
+#       - now receives only one list of images to animate
+#       - images now displayed in order, from first frame to last (not the reverse)
+#       - n_repeats represents number of cycles to display (not number of frames)
+#
+#  "Americanized" Spelling
+#	- 'colour' is now 'color'
+###############################################################################
+
+import pygame, pygame.image, pygame.mixer, pygame.font, pygame.transform 
+import pygame.draw, pygame.mask
+from pygame.locals import * 
+from collections import OrderedDict, deque
+import os, time, json, atexit, struct, zlib
+
+# numpy is optional; only the vectorized EntityStore needs it.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# pygame's subsystems are started when they are first needed (the display
+# by the Screen, fonts by the FontCache, the mixer by the first sound),
+# not when this module is imported. See _init_mixer and _init_font.
+ 
+ 
+# pygame 1.9 has no TEXTINPUT events; typed text then comes with KEYDOWN.
+_TEXTINPUT = getattr(pygame, "TEXTINPUT", None)
+
+
+############################################################################### 
+## Error classes ############################################################## 
+############################################################################### 
+ 
+class GamesError(Exception): pass
+
+
+############################################################################### 
+## Mouse class ################################################################ 
+###############################################################################
+
+class Mouse(object):
+    #------Properties--------#
+
+    ## position
+    def get_position(self):
+        return pygame.mouse.get_pos()
+    
+    def set_position(self, new_position):
+        pygame.mouse.set_pos(new_position)
+    
+    position = property(get_position, set_position)
+
+    ## x
+    def get_x(self):
+        return pygame.mouse.get_pos()[0]
+    
+    def set_x(self, new_x):
+        current_y = pygame.mouse.get_pos()[1]
+        pygame.mouse.set_pos( (new_x, current_y) )
+        
+    x = property(get_x, set_x)
+
+    ## y
+    def get_y(self):
+        return pygame.mouse.get_pos()[1]
+    
+    def set_y(self, new_y):
+        current_mouse_x = pygame.mouse.get_pos()[0]
+        pygame.mouse.set_pos( (current_x, new_y) )
+
+    y = property(get_y, set_y)
+
+    ## is visible
+    def set_is_visible(self, new_visibility):
+        pygame.mouse.set_visible(new_visibility)
+    is_visible = property(fset = set_is_visible)
+
+    def is_pressed(self, button_number):
+        return pygame.mouse.get_pressed()[button_number] == 1
+
+
+############################################################################### 
+## Keyboard class ############################################################# 
+###############################################################################
+
+class Keyboard(object):
+    """
+    While the Screen's main loop runs, the keyboard state is read once per
+    tick into an immutable snapshot that every sprite queries, together
+    with the keys that went down or up and the text typed since the last
+    tick (fed in by Screen.handle_events).
+    """
+    def __init__(self):
+        self._state = None
+        self._pressed = frozenset()
+        self._released = frozenset()
+        self._text = ""
+        # Collected from events for the next tick
+        self._next_pressed = set()
+        self._next_released = set()
+        self._next_text = []
+
+    def _poll(self):
+        """
+        Return the current key state, indexable by key code.
+        """
+        return pygame.key.get_pressed()
+
+    def _begin_tick(self):
+        self._state = self._poll()
+        self._pressed = frozenset(self._next_pressed)
+        self._released = frozenset(self._next_released)
+        self._text = "".join(self._next_text)
+        self._next_pressed.clear()
+        self._next_released.clear()
+        del self._next_text[:]
+
+    def _key_down(self, key, text=""):
+        self._next_pressed.add(key)
+        if text:
+            self._next_text.append(text)
+
+    def _key_up(self, key):
+        self._next_released.add(key)
+
+    def _event(self, event):
+        if event.type == KEYDOWN:
+            # With TEXTINPUT events the text arrives separately.
+            self._key_down(event.key,
+                           "" if _TEXTINPUT else getattr(event, "unicode", ""))
+        elif event.type == KEYUP:
+            self._key_up(event.key)
+        elif event.type == _TEXTINPUT:
+            self._next_text.append(event.text)
+
+    def is_pressed(self, key):
+        state = self._state
+        if state is None:
+            state = pygame.key.get_pressed()
+        return state[key] == 1
+
+    def was_pressed(self, key):
+        """
+        True if the key went down since the previous tick.
+        """
+        return key in self._pressed
+
+    def was_released(self, key):
+        """
+        True if the key went up since the previous tick.
+        """
+        return key in self._released
+
+    #------Properties--------#
+
+    ## keys that went down since the previous tick
+    def get_pressed(self):
+        return self._pressed
+    pressed = property(get_pressed)
+
+    ## keys that went up since the previous tick
+    def get_released(self):
+        return self._released
+    released = property(get_released)
+
+    ## text typed since the previous tick
+    def get_text(self):
+        return self._text
+    text = property(get_text)
+
+
+###############################################################################
+## Input recording ############################################################
+###############################################################################
+##
+## A game whose randomness comes from a seeded random module plays out the
+## same every time it gets the same input on the same ticks. InputRecorder
+## is a Keyboard that writes what each tick saw to a file: the seed, then
+## a record for every tick on which the held keys changed, keys went down
+## or up, or text was typed. InputReplay is a Keyboard that reads such a
+## file and feeds it back tick by tick, ignoring the real keyboard, and
+## stops the main loop after the last recorded tick. Both put a checksum
+## of all the sprites' positions, velocities and angles in the log every
+## checksum_interval ticks, so a replay that has gone its own way says on
+## which tick it did.
+##
+## Held keys are recorded for the keys the game has asked about (or seen
+## events for), which is all a replay of the same game asks about.
+##
+## File layout, little-endian: the header "LWINPUT1", seed (Q) and
+## checksum interval (I), then records, each a type byte followed by
+##     K  tick (I), number of keys that went down, came up, were pressed
+##        and were released (4 B), text length (H), the keys (I each)
+##        in that order, the text in UTF-8
+##     C  tick (I), CRC-32 of the sprites (I)
+##     E  tick (I): the recording ends before this tick
+##
+###############################################################################
+
+_INPUT_MAGIC = b"LWINPUT1"
+_INPUT_HEADER = struct.Struct("<8sQI")
+_INPUT_KEYS = struct.Struct("<IBBBBH")
+_INPUT_TICK = struct.Struct("<I")
+_INPUT_CHECKSUM = struct.Struct("<II")
+
+
+def state_checksum(objects):
+    """
+    CRC-32 of the class, position, velocity and angle of each sprite, in
+    order.
+    """
+    crc = 0
+    pack = struct.Struct("<ddddd").pack
+    for sprite in objects:
+        crc = zlib.crc32(type(sprite).__name__.encode("ascii"), crc)
+        crc = zlib.crc32(pack(sprite._x, sprite._y, sprite._dx, sprite._dy,
+                              sprite._angle), crc)
+    return crc & 0xffffffff
+
+
+class InputRecorder(Keyboard):
+    """
+    A Keyboard that records the input of every tick to a file (see above).
+    Seed the random module with its seed before the game starts.
+    """
+    def __init__(self, filename, seed=None, checksum_interval=50):
+        Keyboard.__init__(self)
+        if seed is None:
+            seed = struct.unpack("<Q", os.urandom(8))[0]
+        self.seed = seed
+        self.checksum_interval = checksum_interval
+        self._file = open(filename, "wb")
+        self._file.write(_INPUT_HEADER.pack(_INPUT_MAGIC, seed,
+                                            checksum_interval))
+        self._tick = -1
+        self._tracked = set()
+        self._held = frozenset()
+
+    def _begin_tick(self):
+        if self._tick >= 0:
+            self._write_tick()
+        self._tick += 1
+        if self.checksum_interval and \
+           self._tick % self.checksum_interval == 0 and screen:
+            self._file.write(b"C" + _INPUT_CHECKSUM.pack(
+                self._tick, state_checksum(screen._objects)))
+        Keyboard._begin_tick(self)
+
+    def _write_tick(self):
+        """
+        Write the record of the tick that just ended, if anything happened.
+        """
+        state = self._state
+        held = frozenset([key for key in self._tracked if state[key]])
+        down = sorted(held - self._held)
+        up = sorted(self._held - held)
+        self._held = held
+        pressed = sorted(self._pressed)
+        released = sorted(self._released)
+        if not (down or up or pressed or released or self._text):
+            return
+        text = self._text.encode("utf-8")
+        keys = down + up + pressed + released
+        self._file.write(b"K" + _INPUT_KEYS.pack(
+            self._tick, len(down), len(up), len(pressed), len(released),
+            len(text)))
+        self._file.write(struct.pack("<%dI" % len(keys), *keys))
+        self._file.write(text)
+
+    def _key_down(self, key, text=""):
+        self._tracked.add(key)
+        Keyboard._key_down(self, key, text)
+
+    def is_pressed(self, key):
+        self._tracked.add(key)
+        return Keyboard.is_pressed(self, key)
+
+    def close(self):
+        """
+        Finish the recording. Do this when the main loop has returned.
+        """
+        if self._file.closed:
+            return
+        end = self._tick + 1
+        if self._tick >= 0:
+            self._write_tick()
+        if self.checksum_interval and screen:
+            self._file.write(b"C" + _INPUT_CHECKSUM.pack(
+                end, state_checksum(screen._objects)))
+        self._file.write(b"E" + _INPUT_TICK.pack(end))
+        self._file.close()
+
+
+class InputReplay(Keyboard):
+    """
+    A Keyboard that plays back a file made by InputRecorder. Seed the
+    random module with its seed before the game starts; divergences lists
+    the (tick, recorded, replayed) checksums that differed.
+    """
+    def __init__(self, filename):
+        Keyboard.__init__(self)
+        with open(filename, "rb") as f:
+            data = f.read()
+        magic, self.seed, self.checksum_interval = \
+            _INPUT_HEADER.unpack_from(data)
+        if magic != _INPUT_MAGIC:
+            raise GamesError("%s is not an input recording" % filename)
+        self._records = {}
+        self._checksums = {}
+        self.end_tick = None
+        offset = _INPUT_HEADER.size
+        while offset < len(data):
+            kind = data[offset:offset + 1]
+            offset += 1
+            if kind == b"K":
+                tick, n_down, n_up, n_pressed, n_released, n_text = \
+                    _INPUT_KEYS.unpack_from(data, offset)
+                offset += _INPUT_KEYS.size
+                counts = (n_down, n_up, n_pressed, n_released)
+                keys = struct.unpack_from("<%dI" % sum(counts), data, offset)
+                offset += 4 * len(keys)
+                text = data[offset:offset + n_text].decode("utf-8")
+                offset += n_text
+                groups = []
+                for count in counts:
+                    groups.append(frozenset(keys[:count]))
+                    keys = keys[count:]
+                self._records[tick] = (groups, text)
+            elif kind == b"C":
+                tick, crc = _INPUT_CHECKSUM.unpack_from(data, offset)
+                offset += _INPUT_CHECKSUM.size
+                self._checksums[tick] = crc
+            elif kind == b"E":
+                self.end_tick = _INPUT_TICK.unpack_from(data, offset)[0]
+                offset += _INPUT_TICK.size
+            else:
+                raise GamesError("Corrupt input recording %s" % filename)
+        self.divergences = []
+        self.checked = 0
+        self._tick = -1
+        self._held = KeySet()
+
+    def _begin_tick(self):
+        self._tick += 1
+        tick = self._tick
+        if tick in self._checksums and screen:
+            self.checked += 1
+            crc = state_checksum(screen._objects)
+            if crc != self._checksums[tick]:
+                self.divergences.append((tick, self._checksums[tick], crc))
+        if self.end_tick is not None and tick >= self.end_tick:
+            screen.quit()
+
+        record = self._records.get(tick)
+        if record is None:
+            self._pressed = self._released = frozenset()
+            self._text = ""
+        else:
+            (down, up, pressed, released), self._text = record
+            self._held = KeySet((self._held - up) | down)
+            self._pressed = pressed
+            self._released = released
+        self._state = self._held
+
+    def _event(self, event):
+        # the recording is the only input
+        pass
+
+
+class KeySet(frozenset):
+    """
+    Held keys, indexable like pygame.key.get_pressed(). A Keyboard that
+    makes up its own input (a replay, a scripted player) returns one
+    from _poll.
+    """
+
+    def __getitem__(self, key):
+        return key in self
+
+
+############################################################################### 
+## Music class ################################################################ 
+###############################################################################
+
+class Music(object):
+    # Music has no effect on the game, so a headless Screen skips it (the
+    # dummy audio driver usually cannot play MIDI anyway).
+
+    def load(self, filename):
+        if screen and screen.headless: return
+        if not _init_mixer(): return
+        pygame.mixer.music.load(filename)
+
+    def play(self, loop=0):
+        if screen and screen.headless: return
+        if not _init_mixer(): return
+        pygame.mixer.music.play(loop)
+
+    def fadeout(self, millisec):
+        if screen and screen.headless: return
+        if not _init_mixer(): return
+        pygame.mixer.music.fadeout(millisec)
+
+    def stop(self):
+        if screen and screen.headless: return
+        if not _init_mixer(): return
+        pygame.mixer.music.stop()
+
+
+###############################################################################
+## AudioManager class #########################################################
+###############################################################################
+##
+## Sound.play grabs any free mixer channel (or steals one), so a burst of
+## explosions can drown everything else and a sound played every tick
+## restarts every tick. The AudioManager gives each category of sounds its
+## own reserved channels, and each configured sound a maximum number of
+## voices and a minimum interval, in ticks, between two starts. A sound
+## that is over its limits, or finds all its category's channels busy, is
+## dropped. Sounds held down by the player (an engine) are sustained: they
+## loop for as long as sustain() is called every tick.
+##
+## Sounds that were never configured are played the old way.
+##
+###############################################################################
+
+class AudioManager(object):
+
+    def __init__(self):
+        self._categories = OrderedDict()    # name -> number of channels
+        self._channels = None               # name -> [Channel], once set up
+        self._policies = {}                 # Sound -> _SoundPolicy
+        self._sustained = {}                # Sound -> [Channel, tick]
+        self.played = {}
+        self.dropped = {}
+
+    def reserve(self, category, channels):
+        """
+        Reserve a number of mixer channels for a category of sounds.
+        """
+        self._categories[category] = channels
+        self._channels = None
+
+    def configure(self, sound, category, max_voices=None, min_interval=0):
+        """
+        Play a sound on its category's channels, at most max_voices at a
+        time and not twice within min_interval ticks.
+        """
+        if category not in self._categories:
+            raise GamesError("No channels reserved for %r" % (category,))
+        self._policies[sound] = _SoundPolicy(category, max_voices,
+                                             min_interval)
+
+    def play(self, sound, loops=0):
+        """
+        Play a sound, returning the Channel it plays on or None if it was
+        dropped.
+        """
+        policy = self._policies.get(sound)
+        if policy is None:
+            channel = sound.play(loops)
+            self._count("default", channel)
+            return channel
+        if not self._setup():
+            return None
+
+        now = screen.ticks if screen else 0
+        if policy.last is not None and now - policy.last < policy.min_interval:
+            return self._count(policy.category, None)
+        channel = self._free_channel(sound, policy)
+        if channel is not None:
+            channel.play(sound, loops)
+            policy.last = now
+        return self._count(policy.category, channel)
+
+    def sustain(self, sound):
+        """
+        Keep a sound looping; call it every tick the sound should go on.
+        It stops at the end of the first tick it isn't called in.
+        """
+        now = screen.ticks if screen else 0
+        voice = self._sustained.get(sound)
+        if voice is not None and voice[0].get_sound() is sound:
+            voice[1] = now
+            return voice[0]
+        channel = self.play(sound, -1)
+        if channel is not None:
+            self._sustained[sound] = [channel, now]
+        return channel
+
+    def stop(self, sound):
+        """
+        Stop every voice of a sound started through the manager.
+        """
+        self._sustained.pop(sound, None)
+        policy = self._policies.get(sound)
+        if policy is None:
+            sound.stop()
+        elif self._setup():
+            for channel in self._channels[policy.category]:
+                if channel.get_sound() is sound:
+                    channel.stop()
+
+    def _end_tick(self, now):
+        """
+        Stop the sustained sounds that sustain() wasn't called for this
+        tick. Screen._step does this.
+        """
+        if self._sustained:
+            for sound, (channel, tick) in list(self._sustained.items()):
+                if tick != now:
+                    if channel.get_sound() is sound:
+                        channel.stop()
+                    del self._sustained[sound]
+
+    def _setup(self):
+        """
+        Reserve the categories' channels, once the mixer is up. Returns
+        whether it is.
+        """
+        if self._channels is not None:
+            return True
+        if not _init_mixer():
+            return False
+        total = sum(self._categories.values())
+        if pygame.mixer.get_num_channels() < total + 8:
+            pygame.mixer.set_num_channels(total + 8)
+        pygame.mixer.set_reserved(total)
+        self._channels = {}
+        first = 0
+        for category, count in self._categories.items():
+            self._channels[category] = [pygame.mixer.Channel(i)
+                                        for i in range(first, first + count)]
+            first += count
+        return True
+
+    def _free_channel(self, sound, policy):
+        free = None
+        voices = 0
+        for channel in self._channels[policy.category]:
+            if channel.get_busy():
+                if channel.get_sound() is sound:
+                    voices += 1
+            elif free is None:
+                free = channel
+        if policy.max_voices is not None and voices >= policy.max_voices:
+            return None
+        return free
+
+    def _count(self, category, channel):
+        counter = self.dropped if channel is None else self.played
+        counter[category] = counter.get(category, 0) + 1
+        return channel
+
+    def stats(self):
+        return {"categories": dict(self._categories),
+                "played": dict(self.played),
+                "dropped": dict(self.dropped),
+                "sustained": len(self._sustained)}
+
+
+class _SoundPolicy(object):
+    __slots__ = ("category", "max_voices", "min_interval", "last")
+
+    def __init__(self, category, max_voices, min_interval):
+        self.category = category
+        self.max_voices = max_voices
+        self.min_interval = min_interval
+        self.last = None
+
+
+###############################################################################
+## FrameProfiler class ########################################################
+###############################################################################
+##
+## Records how long each phase of Screen.mainloop takes, frame by frame, in
+## a ring buffer holding the most recent frames, and how much of the tick
+## phase each class of sprite accounts for. Give one to the Screen with
+## Screen.enable_profiling(); while the Screen has none, the main loop
+## does no timing at all.
+##
+###############################################################################
+
+class FrameProfiler(object):
+
+    PHASES = ("wait", "erase", "tick", "screen_tick", "draw", "present",
+              "events")
+    WAIT, ERASE, TICK, SCREEN_TICK, DRAW, PRESENT, EVENTS = range(7)
+
+    def __init__(self, capacity=600):
+        self._frames = deque(maxlen=capacity)
+        self._classes = {}
+        self._n_frames = 0
+        self._current = None
+        self._last = 0.0
+
+    def begin_frame(self):
+        self._current = [0.0] * len(FrameProfiler.PHASES)
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Charge the time since the previous mark to a phase (one of the
+        indices WAIT ... EVENTS). A phase may be marked several times in
+        a frame, e.g. once per simulation step.
+        """
+        now = time.perf_counter()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        durations = self._current
+        if durations is None:
+            return
+        durations.append(sum(durations))
+        self._frames.append((self._n_frames,) + tuple(durations))
+        self._n_frames += 1
+        self._current = None
+
+    def add_tick(self, cls, duration):
+        """
+        Charge duration seconds of tick time to a sprite class.
+        """
+        totals = self._classes.get(cls.__name__)
+        if totals is None:
+            self._classes[cls.__name__] = totals = [0.0, 0]
+        totals[0] += duration
+        totals[1] += 1
+
+    def clear(self):
+        self._frames.clear()
+        self._classes.clear()
+        self._n_frames = 0
+
+    def frames(self):
+        """
+        Return the buffered frames, oldest first, as dictionaries of
+        durations in seconds keyed by phase name (plus "frame" and
+        "total").
+        """
+        names = ("frame",) + FrameProfiler.PHASES + ("total",)
+        return [dict(zip(names, frame)) for frame in self._frames]
+
+    def classes(self):
+        """
+        Return {class name: (total tick seconds, number of ticks)}.
+        """
+        return dict((name, tuple(totals))
+                    for name, totals in self._classes.items())
+
+    def summary(self):
+        """
+        Return mean and 95th percentile milliseconds per phase over the
+        buffered frames, and mean microseconds per tick for each class.
+        """
+        phases = {}
+        for index, name in enumerate(FrameProfiler.PHASES + ("total",)):
+            values = sorted(frame[index + 1] for frame in self._frames)
+            if not values:
+                continue
+            phases[name] = {
+                "mean_ms": 1000 * sum(values) / len(values),
+                "p95_ms": 1000 * values[int(.95 * (len(values) - 1))]}
+        classes = {}
+        for name, (total, count) in self._classes.items():
+            classes[name] = {"total_ms": 1000 * total, "ticks": count,
+                             "mean_us": 1e6 * total / count}
+        return {"frames": len(self._frames), "phases": phases,
+                "classes": classes}
+
+    def export_csv(self, filename):
+        """
+        Write the buffered frames as CSV, one row per frame, durations in
+        milliseconds.
+        """
+        with open(filename, "w") as f:
+            f.write(",".join(("frame",) + FrameProfiler.PHASES +
+                             ("total",)) + "\n")
+            for frame in self._frames:
+                f.write("%d," % frame[0] +
+                        ",".join(["%.4f" % (1000 * value)
+                                  for value in frame[1:]]) + "\n")
+
+    def export_json(self, filename):
+        with open(filename, "w") as f:
+            json.dump({"summary": self.summary(),
+                       "frames": self.frames()}, f, indent=1)
+
+    def export(self, filename):
+        """
+        Write CSV or JSON depending on the file name's extension.
+        """
+        if filename.lower().endswith(".csv"):
+            self.export_csv(filename)
+        else:
+            self.export_json(filename)
+
+    def export_at_exit(self, filename):
+        atexit.register(self.export, filename)
+
+    #------Properties--------#
+
+    ## capacity
+    def get_capacity(self):
+        return self._frames.maxlen
+
+    capacity = property(get_capacity)
+
+    ## frames recorded since creation (or the last clear)
+    def get_n_frames(self):
+        return self._n_frames
+
+    n_frames = property(get_n_frames)
+
+
+###############################################################################
+## RotationCache class ########################################################
+###############################################################################
+##
+## Rotating a surface is expensive and sprites keep asking for the same few
+## angles (a ship turning in 5 degree steps only ever needs 72 images).
+## The cache keeps rotated copies keyed by (source surface, quantized
+## angle), shared by every sprite using the same image, and throws away
+## the least recently used ones once the memory budget is exceeded.
+##
+## It also keeps the collision mask of every surface it is asked for (see
+## mask), within the same budget, so a mask is built once per image and
+## angle rather than for every collision test.
+##
+###############################################################################
+
+class RotationCache(object):
+
+    def __init__(self, resolution=1, max_bytes=16*1024*1024):
+        self._resolution = resolution
+        self._n_steps = int(round(360. / resolution))
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        # Map surface -> its pygame.mask.Mask
+        self._masks = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _quantize(self, angle):
+        """
+        Snap an angle to the cache resolution, as a step count in the
+        range [0, 360/resolution).
+        """
+        return int(round(angle / self._resolution)) % self._n_steps
+
+    def rotate(self, surface, angle):
+        """
+        Return the surface rotated clockwise by angle degrees.
+        """
+        step = self._quantize(angle)
+        if step == 0:
+            return surface
+        key = (surface, step)
+        entries = self._entries
+        rotated = entries.get(key)
+        if rotated is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return rotated
+        self.misses += 1
+        return self._store(key, surface, step)
+
+    def prebake(self, surface, step=None):
+        """
+        Rotate the surface to every angle up front (every step degrees,
+        default every cache resolution step) so that turning never has to
+        call pygame.transform.rotate during play.
+        """
+        step = step or self._resolution
+        angle = step
+        while angle < 360:
+            key = (surface, self._quantize(angle))
+            if key[1] and key not in self._entries:
+                self._store(key, surface, key[1])
+            angle += step
+
+    def mask(self, surface):
+        """
+        Return the collision mask of the surface (as drawn, so rotated
+        surfaces from this cache get their own). Transparent pixels, by
+        colorkey or alpha, are left out.
+        """
+        masks = self._masks
+        mask = masks.get(surface)
+        if mask is not None:
+            masks.move_to_end(surface)
+            return mask
+        mask = pygame.mask.from_surface(surface)
+        masks[surface] = mask
+        self._bytes += _mask_bytes(mask)
+        self._trim()
+        return mask
+
+    def _drop_mask(self, surface):
+        mask = self._masks.pop(surface, None)
+        if mask is not None:
+            self._bytes -= _mask_bytes(mask)
+
+    def _store(self, key, surface, step):
+        rotated = pygame.transform.rotate(surface, -step * self._resolution)
+        self._entries[key] = rotated
+        self._bytes += _surface_bytes(rotated)
+        self._trim()
+        return rotated
+
+    def _trim(self):
+        entries = self._entries
+        while self._bytes > self._max_bytes and len(entries) > 1:
+            key, rotated = entries.popitem(last=False)
+            self._bytes -= _surface_bytes(rotated)
+            self._drop_mask(rotated)
+            self.evictions += 1
+        masks = self._masks
+        while self._bytes > self._max_bytes and len(masks) > 1:
+            self._drop_mask(next(iter(masks)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._masks.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {"entries": len(self._entries),
+                "masks": len(self._masks),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
+
+    #------Properties--------#
+
+    ## resolution
+    def get_resolution(self):
+        return self._resolution
+
+    resolution = property(get_resolution)
+
+    ## max bytes
+    def get_max_bytes(self):
+        return self._max_bytes
+
+    def set_max_bytes(self, new_max_bytes):
+        self._max_bytes = new_max_bytes
+        self._trim()
+
+    max_bytes = property(get_max_bytes, set_max_bytes)
+
+    ## bytes held
+    def get_bytes(self):
+        return self._bytes
+
+    bytes = property(get_bytes)
+
+
+###############################################################################
+## AssetRegistry class ########################################################
+###############################################################################
+##
+## Every image, animation and sound goes through the registry, which loads
+## and converts each file once and hands the same object to everybody who
+## asks for it again. Sprites never draw onto their images, so sharing
+## them is safe.
+##
+## Images packed into a texture atlas (see tools/pack_atlas.py and
+## use_atlas) are handed out as subsurfaces of the one atlas surface, all
+## with the atlas's colorkey. Each subsurface is RLE encoded on its own,
+## like a separately loaded image; without that, blitting from the atlas
+## is about three times slower.
+##
+###############################################################################
+
+class AssetHandle(object):
+    """
+    A cheap reference to an asset in the registry. The asset is only
+    loaded the first time the handle is resolved with get().
+    """
+    def __init__(self, registry, kind, args):
+        self._registry = registry
+        self._kind = kind
+        self._args = args
+
+    def get(self):
+        return getattr(self._registry, self._kind)(*self._args)
+
+    def __repr__(self):
+        return "AssetHandle(%r, %r)" % (self._kind, self._args)
+
+    #------Properties--------#
+
+    ## kind
+    def get_kind(self):
+        return self._kind
+
+    kind = property(get_kind)
+
+
+class LazyAsset(object):
+    """
+    A class attribute that is loaded the first time it is read, so that
+    importing a module full of sprite classes loads nothing:
+
+        class Ship(Sprite):
+            image = LazyAsset(load_image, "ship.bmp")
+
+    Ship.image calls load_image("ship.bmp") once and then returns what it
+    returned. The loader can be any function.
+    """
+    def __init__(self, loader, *args, **kwargs):
+        self._loader = loader
+        self._args = args
+        self._kwargs = kwargs
+        self._asset = None
+
+    def __get__(self, obj, cls=None):
+        if self._asset is None:
+            self._asset = self._loader(*self._args, **self._kwargs)
+        return self._asset
+
+    def __repr__(self):
+        return "LazyAsset(%s, %r)" % (getattr(self._loader, "__name__", "?"),
+                                      self._args)
+
+
+class AssetRegistry(object):
+
+    KINDS = ("image", "animation", "sound")
+
+    def __init__(self):
+        self._assets = {}
+        self._sizes = {}
+        self.loads = dict.fromkeys(AssetRegistry.KINDS, 0)
+        self.requests = 0
+        self.hits = 0
+        # (file name, seconds) of every file loaded, in order
+        self.load_times = []
+        # file name -> (atlas file, colorkey, rectangle), see use_atlas
+        self._frames = {}
+
+    def _lookup(self, key):
+        self.requests += 1
+        asset = self._assets.get(key)
+        if asset is not None:
+            self.hits += 1
+        return asset
+
+    def _keep(self, key, asset, size, seconds=0.0):
+        self._assets[key] = asset
+        self._sizes[key] = size
+        self.loads[key[0]] += 1
+        if seconds:
+            self.load_times.append((key[1], seconds))
+        return asset
+
+    def image(self, filename, transparent=True):
+        """
+        Return the converted surface for an image file.
+        """
+        key = ("image", filename, bool(transparent))
+        surface = self._lookup(key)
+        if surface is None:
+            frame = transparent and self._frames.get(filename)
+            if frame:
+                atlas_file, colorkey, rect = frame
+                surface = self._atlas(atlas_file, colorkey).subsurface(rect)
+                surface.set_colorkey(colorkey, RLEACCEL)
+                # its pixels are counted against the atlas
+                self._keep(key, surface, 0)
+            else:
+                start = time.perf_counter()
+                surface = _decode_image(filename, transparent)
+                self._keep(key, surface, _surface_bytes(surface),
+                           time.perf_counter() - start)
+        return surface
+
+    def use_atlas(self, index):
+        """
+        Serve the images listed in an atlas index (a JSON file written by
+        tools/pack_atlas.py) from the atlas, when they are asked for as
+        transparent images. Images changed since the atlas was packed are
+        still loaded from their own files. Returns how many images the
+        atlas serves.
+        """
+        with open(index) as f:
+            data = json.load(f)
+        atlas_file = data["image"]
+        built = os.path.getmtime(atlas_file)
+        colorkey = tuple(data["colorkey"])
+        count = 0
+        for filename, rect in data["frames"].items():
+            try:
+                if os.path.getmtime(filename) > built:
+                    continue
+            except OSError:
+                pass
+            self._frames[filename] = (atlas_file, colorkey, tuple(rect))
+            count += 1
+        return count
+
+    def _atlas(self, filename, colorkey):
+        key = ("image", filename, "atlas")
+        surface = self._lookup(key)
+        if surface is None:
+            start = time.perf_counter()
+            surface = _decode_image(filename, False)
+            surface.set_colorkey(colorkey)
+            self._keep(key, surface, _surface_bytes(surface),
+                       time.perf_counter() - start)
+        return surface
+
+    def animation(self, filenames, transparent=True):
+        """
+        Return a FrameSequence (looping, one tick per frame) with the
+        converted frames of an animation. Frames are shared with image()
+        requests for the same files.
+        """
+        key = ("animation", tuple(filenames), bool(transparent))
+        frames = self._lookup(key)
+        if frames is None:
+            frames = FrameSequence([self.image(name, transparent)
+                                    for name in filenames])
+            # The bytes are already counted against the frame images.
+            frames = self._keep(key, frames, 0)
+        return frames
+
+    def sound(self, filename):
+        """
+        Return the Sound object for a sound file.
+        """
+        key = ("sound", filename)
+        sound = self._lookup(key)
+        if sound is None:
+            _init_mixer()
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(filename)
+            try:
+                size = len(sound.get_raw())
+            except (AttributeError, pygame.error):
+                size = 0
+            self._keep(key, sound, size, time.perf_counter() - start)
+        return sound
+
+    def handle(self, kind, *args):
+        """
+        Return an AssetHandle for the asset that getattr(self, kind)(*args)
+        would return, without loading anything yet.
+        """
+        if kind not in AssetRegistry.KINDS:
+            raise GamesError("Unknown asset kind %r" % (kind,))
+        return AssetHandle(self, kind, args)
+
+    def clear(self):
+        self._assets.clear()
+        self._sizes.clear()
+        self._frames.clear()
+
+    def stats(self):
+        bytes = dict.fromkeys(AssetRegistry.KINDS, 0)
+        for key, size in self._sizes.items():
+            bytes[key[0]] += size
+        return {"entries": len(self._assets),
+                "loads": dict(self.loads),
+                "requests": self.requests,
+                "hits": self.hits,
+                "bytes": bytes,
+                "total_bytes": sum(bytes.values())}
+
+    #------Properties--------#
+
+    ## bytes held
+    def get_bytes(self):
+        return sum(self._sizes.values())
+
+    bytes = property(get_bytes)
+
+
+###############################################################################
+## FontCache class ############################################################
+###############################################################################
+##
+## Text sprites share their Font objects, one per face and size: loading
+## the font file costs far more than rendering a short string with it.
+## Rendered strings are kept in a bounded LRU, so labels that come back
+## (level banners, the high score table, a score that was shown before)
+## are not rendered again.
+##
+###############################################################################
+
+class FontCache(object):
+
+    def __init__(self, max_surfaces=256):
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self._max_surfaces = max_surfaces
+        self.font_loads = 0
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, face, size):
+        """
+        Return the shared Font for a face (a file name, or None for the
+        default font) and size.
+        """
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            _init_font()
+            font = self._fonts[key] = pygame.font.Font(face, size)
+            self.font_loads += 1
+        return font
+
+    def render(self, face, size, color, text):
+        """
+        Return an antialiased surface with the text. The surface is shared:
+        don't draw on it.
+        """
+        key = (face, size, tuple(color), text)
+        surfaces = self._surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = surfaces[key] = self.font(face, size).render(text, 1,
+                                                               color)
+        if len(surfaces) > self._max_surfaces:
+            surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._fonts.clear()
+        self._surfaces.clear()
+
+    def stats(self):
+        return {"fonts": len(self._fonts),
+                "surfaces": len(self._surfaces),
+                "max_surfaces": self._max_surfaces,
+                "font_loads": self.font_loads,
+                "hits": self.hits,
+                "misses": self.misses}
+
+    #------Properties--------#
+
+    ## max surfaces
+    def get_max_surfaces(self):
+        return self._max_surfaces
+
+    def set_max_surfaces(self, new_max_surfaces):
+        self._max_surfaces = new_max_surfaces
+        while len(self._surfaces) > new_max_surfaces:
+            self._surfaces.popitem(last=False)
+
+    max_surfaces = property(get_max_surfaces, set_max_surfaces)
+
+
+###############################################################################
+## Pool class #################################################################
+###############################################################################
+##
+## Sprites that come and go all the time (missiles, explosions) can be
+## recycled instead of built from scratch and left to the garbage
+## collector. Pool.acquire hands out a released sprite when it has one,
+## calling its on_acquire hook with the constructor's arguments, and only
+## builds a new one when it hasn't. Destroying a pooled sprite calls its
+## on_release hook and keeps it for the next acquire, up to max_size kept
+## sprites.
+##
+## A destroyed pooled sprite may come back as a different object, so
+## don't keep references to it once it is gone.
+##
+###############################################################################
+
+class Pool(object):
+
+    def __init__(self, cls, max_size=64):
+        self._cls = cls
+        self._free = []
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.live = 0
+        self.discarded = 0
+
+    def acquire(self, *args, **kwargs):
+        """
+        Return a sprite of the pool's class made with these arguments, like
+        calling the class. It still has to be added to the Screen.
+        """
+        if self._free:
+            sprite = self._free.pop()
+            self.hits += 1
+            sprite.on_acquire(*args, **kwargs)
+        else:
+            sprite = self._cls(*args, **kwargs)
+            self.misses += 1
+        sprite._pool = self
+        self.live += 1
+        return sprite
+
+    def release(self, sprite):
+        """
+        Take back a sprite that has been destroyed. Sprite.destroy does this.
+        """
+        self.live -= 1
+        if len(self._free) < self._max_size:
+            sprite.on_release()
+            self._free.append(sprite)
+        else:
+            sprite._pool = None
+            self.discarded += 1
+
+    def clear(self):
+        for sprite in self._free:
+            sprite._pool = None
+        del self._free[:]
+
+    def stats(self):
+        return {"class": self._cls.__name__,
+                "free": len(self._free),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "live": self.live,
+                "discarded": self.discarded}
+
+    #------Properties--------#
+
+    ## max size
+    def get_max_size(self):
+        return self._max_size
+
+    def set_max_size(self, new_max_size):
+        self._max_size = new_max_size
+        while len(self._free) > new_max_size:
+            self._free.pop()._pool = None
+            self.discarded += 1
+
+    max_size = property(get_max_size, set_max_size)
+
+
+###############################################################################
+## EntityStore class ##########################################################
+###############################################################################
+##
+## Struct-of-arrays storage for sprites that wrap around the screen (those
+## whose class sets wraps = True). Positions, velocities and sizes live in
+## contiguous numpy arrays so that moving and wrapping all of them is one
+## vectorized step per tick; the sprites keep working as before, their
+## coordinates are copied back after every step and anything the game
+## writes to x, y, dx or dy goes straight through to the arrays.
+##
+###############################################################################
+
+class EntityStore(object):
+
+    # Position, velocity, size, half size and the grid cells the sprite
+    # is filed under (see SpatialHash)
+    FIELDS = ("x", "y", "dx", "dy", "w", "h", "hw", "hh",
+              "c0", "c1", "c2", "c3")
+
+    def __init__(self, capacity=256):
+        if numpy is None:
+            raise GamesError("The entity store needs numpy")
+        self._n = 0
+        self._sprites = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        for field in EntityStore.FIELDS:
+            array = numpy.zeros(capacity)
+            old = getattr(self, field, None)
+            if old is not None:
+                array[:self._n] = old[:self._n]
+            setattr(self, field, array)
+        self._capacity = capacity
+
+    def add(self, sprite):
+        if self._n == self._capacity:
+            self._allocate(self._capacity * 2)
+        slot = self._n
+        self._n += 1
+        self._sprites.append(sprite)
+        sprite._slot = slot
+        self.put(sprite)
+        self.put_velocity(sprite)
+        self.put_size(sprite)
+
+    def remove(self, sprite):
+        slot = sprite._slot
+        if slot is None:
+            return
+        last = self._n - 1
+        if slot != last:
+            # Move the last entity into the hole.
+            moved = self._sprites[last]
+            self._sprites[slot] = moved
+            moved._slot = slot
+            for field in EntityStore.FIELDS:
+                array = getattr(self, field)
+                array[slot] = array[last]
+        self._sprites.pop()
+        self._n = last
+        sprite._slot = None
+
+    def put(self, sprite):
+        slot = sprite._slot
+        self.x[slot] = sprite._x
+        self.y[slot] = sprite._y
+        span = sprite._grid_span
+        if span is not None:
+            self.c0[slot], self.c1[slot], self.c2[slot], self.c3[slot] = span
+
+    def put_velocity(self, sprite):
+        self.dx[sprite._slot] = sprite._dx
+        self.dy[sprite._slot] = sprite._dy
+
+    def put_size(self, sprite):
+        slot = sprite._slot
+        width, height = sprite._rect.size
+        self.w[slot] = width
+        self.h[slot] = height
+        self.hw[slot] = width // 2
+        self.hh[slot] = height // 2
+
+    def step(self, width, height, grid=None):
+        """
+        Move every entity by its velocity and wrap it around a screen of
+        the given size, exactly as the per-sprite code would: a sprite
+        whose top edge goes below the screen comes back with its bottom
+        edge at 0, and so on. Then copy the results back to the sprites
+        and refile the ones that changed cells in the grid.
+        """
+        n = self._n
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        w, h = self.w[:n], self.h[:n]
+        hw, hh = self.hw[:n], self.hh[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+
+        # Edges as pygame would compute them from the integer centre.
+        numpy.copyto(y, hh - h, where=numpy.trunc(y) - hh > height)
+        numpy.copyto(y, height + hh, where=numpy.trunc(y) - hh + h < 0)
+        numpy.copyto(x, hw - w, where=numpy.trunc(x) - hw > width)
+        numpy.copyto(x, width + hw, where=numpy.trunc(x) - hw + w < 0)
+
+        sprites = self._sprites
+        for sprite, new_x, new_y in zip(sprites, x.tolist(), y.tolist()):
+            sprite._sync(new_x, new_y)
+
+        if grid is None:
+            return
+        size = grid.cell_size
+        left = numpy.trunc(x) - hw
+        top = numpy.trunc(y) - hh
+        c0 = left // size
+        c1 = top // size
+        c2 = numpy.maximum(left + w - 1, left) // size
+        c3 = numpy.maximum(top + h - 1, top) // size
+        changed = ((c0 != self.c0[:n]) | (c1 != self.c1[:n]) |
+                   (c2 != self.c2[:n]) | (c3 != self.c3[:n]))
+        self.c0[:n], self.c1[:n], self.c2[:n], self.c3[:n] = c0, c1, c2, c3
+        for index in numpy.flatnonzero(changed).tolist():
+            grid.update(sprites[index])
+
+    def clear(self):
+        for sprite in self._sprites:
+            sprite._slot = None
+        self._sprites = []
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+
+###############################################################################
+## SpatialHash class ##########################################################
+###############################################################################
+##
+## A uniform grid used as the broadphase for overlap tests. Every sprite
+## on the Screen is filed under each cell its rectangle touches, so a
+## query only looks at the sprites sharing a cell with the rectangle
+## instead of at every object on the Screen.
+##
+###############################################################################
+
+class SpatialHash(object):
+
+    def __init__(self, cell_size=64):
+        if cell_size <= 0:
+            raise GamesError("Cell size must be positive")
+        self._cell_size = cell_size
+        # Map (column, row) -> set of sprites in that cell
+        self._cells = {}
+
+    def _span(self, rect):
+        """
+        Return the (first column, first row, last column, last row) range
+        of cells covered by the rectangle.
+        """
+        size = self._cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.right - 1, rect.left) // size,
+                max(rect.bottom - 1, rect.top) // size)
+
+    def insert(self, sprite):
+        span = self._span(sprite._rect)
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells.get((column, row))
+                if cell is None:
+                    cells[(column, row)] = cell = set()
+                cell.add(sprite)
+        sprite._grid_span = span
+
+    def remove(self, sprite):
+        span = sprite._grid_span
+        if span is None:
+            return
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells.get((column, row))
+                if cell is not None:
+                    cell.discard(sprite)
+                    if not cell:
+                        del cells[(column, row)]
+        sprite._grid_span = None
+
+    def update(self, sprite):
+        """
+        Refile a sprite after its rectangle has changed. Cheap when the
+        sprite is still inside the same cells, which is the common case.
+        """
+        rect = sprite._rect
+        size = self._cell_size
+        span = sprite._grid_span
+        if (rect.left // size != span[0] or rect.top // size != span[1] or
+            max(rect.right - 1, rect.left) // size != span[2] or
+            max(rect.bottom - 1, rect.top) // size != span[3]):
+            self.remove(sprite)
+            self.insert(sprite)
+
+    def query(self, rectangle):
+        """
+        Return the set of sprites sharing at least one cell with the
+        rectangle. Callers still have to test the rectangles themselves.
+        """
+        span = self._span(rectangle)
+        cells = self._cells
+        found = set()
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells.get((column, row))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def clear(self):
+        for cell in self._cells.values():
+            for sprite in cell:
+                sprite._grid_span = None
+        self._cells = {}
+
+    #------Properties--------#
+
+    ## cell size
+    def get_cell_size(self):
+        return self._cell_size
+
+    cell_size = property(get_cell_size)
+
+    ## number of occupied cells
+    def get_n_cells(self):
+        return len(self._cells)
+
+    n_cells = property(get_n_cells)
+
+
+###############################################################################
+## DisplayList class ##########################################################
+###############################################################################
+##
+## The Screen's sprites in drawing order. The order is split into named
+## layers, drawn bottom first; inside a layer sprites keep the order they
+## were added in. Each layer is an OrderedDict, so adding, removing and
+## moving a sprite to the top or bottom of its layer take constant time.
+##
+## The whole order is kept as a tuple that is only rebuilt after it has
+## changed, so the main loop can walk it every frame without copying, and
+## sprites may come and go while it does.
+##
+###############################################################################
+
+DEFAULT_LAYERS = ("default", "hud")
+
+class DisplayList(object):
+
+    def __init__(self, layers=DEFAULT_LAYERS):
+        if not layers:
+            raise GamesError("A display list needs at least one layer")
+        # Map layer name -> OrderedDict of its sprites (values unused)
+        self._layers = OrderedDict((name, OrderedDict()) for name in layers)
+        # Map sprite -> name of the layer it is in
+        self._layer_of = {}
+        # Every sprite in drawing order (None until rebuilt)
+        self._order = None
+
+    def _layer(self, name):
+        try:
+            return self._layers[name]
+        except KeyError:
+            raise GamesError("No layer called %r" % (name,))
+
+    def add(self, sprite, layer=None):
+        """
+        Put the sprite on top of a layer (the bottom layer if none is
+        given). A sprite already in the list moves there.
+        """
+        if layer is None:
+            layer = next(iter(self._layers))
+        objects = self._layer(layer)
+        self.remove(sprite)
+        objects[sprite] = None
+        self._layer_of[sprite] = layer
+        self._order = None
+
+    def remove(self, sprite):
+        """
+        Take the sprite out of the list. Returns False if it was not in.
+        """
+        layer = self._layer_of.pop(sprite, None)
+        if layer is None:
+            return False
+        del self._layers[layer][sprite]
+        self._order = None
+        return True
+
+    def elevate(self, sprite, above=None):
+        """
+        Move the sprite to the top of its layer, or just above another
+        sprite in the same layer.
+        """
+        objects = self._layers[self._layer_of[sprite]]
+        if above is None:
+            objects.move_to_end(sprite)
+        else:
+            self._move_next_to(objects, sprite, above, 1)
+        self._order = None
+
+    def lower(self, sprite, below=None):
+        """
+        Move the sprite to the bottom of its layer, or just below another
+        sprite in the same layer.
+        """
+        objects = self._layers[self._layer_of[sprite]]
+        if below is None:
+            objects.move_to_end(sprite, last=False)
+        else:
+            self._move_next_to(objects, sprite, below, 0)
+        self._order = None
+
+    def _move_next_to(self, objects, sprite, other, after):
+        if self._layer_of.get(other) != self._layer_of[sprite]:
+            raise GamesError("Sprites can only be stacked within a layer")
+        # Rotate everything from the insertion point to the top, after
+        # the sprite itself has gone to the top: linear in the layer.
+        del objects[sprite]
+        keys = list(objects)
+        objects[sprite] = None
+        for key in keys[keys.index(other) + after:]:
+            objects.move_to_end(key)
+
+    def layer_of(self, sprite):
+        """ Name of the sprite's layer, or None if it is not in the list """
+        return self._layer_of.get(sprite)
+
+    def sprites(self, layer):
+        """ The sprites of one layer, bottom first """
+        return tuple(self._layer(layer))
+
+    def order(self):
+        """ Every sprite, bottom layer first. Do not change the tuple. """
+        if self._order is None:
+            order = []
+            for objects in self._layers.values():
+                order.extend(objects)
+            self._order = tuple(order)
+        return self._order
+
+    def clear(self):
+        for objects in self._layers.values():
+            objects.clear()
+        self._layer_of = {}
+        self._order = None
+
+    def __iter__(self):
+        return iter(self.order())
+
+    def __len__(self):
+        return len(self._layer_of)
+
+    def __contains__(self, sprite):
+        return sprite in self._layer_of
+
+    #------Properties--------#
+
+    ## layer names, bottom first
+    def get_layers(self):
+        return tuple(self._layers)
+
+    layers = property(get_layers)
+
+
+############################################################################### 
+## Screen class ############################################################### 
+############################################################################### 
+##                                           
+## The Screen object represents the playing area. Since we can have  
+## only one screen under pygame, it's just a handy container for stuff 
+## 
+############################################################################### 
+ 
+class Screen(object): 
+ 
+    initialized = 0 
+ 
+    def __init__ (self, width=640, height=480, fps=50, cell_size=64,
+                  headless=False, render=True, sim_rate=None,
+                  max_frame_skip=5, vectorize=False, layers=DEFAULT_LAYERS,
+                  mask_collisions=False): 
+        # Bomb if you try this more than once
+        if Screen.initialized: 
+            raise GamesError("Cannot have more than on Screen object")
+         
+        Screen.initialized = 1
+
+        # A headless Screen uses SDL's dummy video and audio drivers and
+        # never waits between frames, so the game runs as fast as it can.
+        # Without rendering nothing is blitted at all.
+        self._headless = headless
+        self._render = render
+        if headless:
+            _use_dummy_drivers()
+
+        # Create the pygame display
+        pygame.display.init()
+        #self._display = pygame.display.set_mode ((width, height), HWSURFACE)
+        self._display = pygame.display.set_mode ((width, height))
+        self._width = width  
+        self._height = height
+        self._background = self._display.convert()
+        # The background with any baked decorations on it (see bake),
+        # which sprites are erased from. The background itself until
+        # something is baked.
+        self._static = self._background
+        # (surface, position) of everything baked, to redo it on a new
+        # background
+        self._baked = []
+ 
+        # Initialize the objects in play, in drawing order by layer
+        self._objects = DisplayList(layers)
+        # Map handle -> sprite on the Screen. Every sprite added gets the
+        # next handle (0 means not on the Screen); handles are never
+        # reused, and also keep query results in a stable order.
+        self._entities = {}
+        self._next_handle = 1
+        # Sprites removed during a tick leave the display list in one
+        # sweep at the end of it (see _sweep)
+        self._ticking = False
+        self._doomed = []
+        # Functions called every tick, see add_tick_handler()
+        self._tick_handlers = []
+        # Broadphase grid for overlap tests (None means linear scan)
+        self._grid = None
+        if cell_size:
+            self._grid = SpatialHash(cell_size)
+        # Array storage moving and wrapping sprites in bulk (None: every
+        # sprite moves itself)
+        self._store = None
+        if vectorize:
+            self._store = EntityStore()
+        # Initialize list dirty rectangles to be repainted 
+        self._dirtyrects = [] 
+        # Above this fraction of the screen a dirty frame is flipped whole
+        self._flip_threshold = 0.5
+        # Whether sprites whose rectangles overlap must also overlap in
+        # their opaque pixels to collide, and how many rectangle hits
+        # were tested and confirmed (see get_collision_stats())
+        self._mask_collisions = mask_collisions
+        self._collision_stats = {"candidates": 0, "confirmed": 0}
+        # What the last present did, see get_present_stats()
+        self._present_stats = {"rects": 0, "merged": 0, "pixels": 0,
+                               "full": False}
+ 
+        # Time when we should draw the next frame 
+        self._next_tick = 0
+
+        # Frames per second screen will be updated
+        self._fps = fps
+
+        # With a simulation rate the game ticks at that fixed rate whatever
+        # the frame rate, catching up after slow frames (running at most
+        # max_frame_skip extra ticks before drawing) and drawing sprites
+        # between their last two positions. Without one, every frame runs
+        # exactly one tick.
+        self._sim_rate = sim_rate
+        self._max_frame_skip = max_frame_skip
+        self._loop_frames = 0
+        self._dropped_ticks = 0
+
+        # Phase timing, see enable_profiling()
+        self._profiler = None
+
+        # Ticks run in total and during the current (or last) mainloop
+        self._ticks = 0
+        self._loop_ticks = 0
+        self._loop_start = None
+        self._loop_end = None
+        # When the first frame was presented (time.perf_counter)
+        self._first_frame_time = None
+ 
+    #------Properties--------#
+
+    ## width
+    def get_width(self):
+        return self._width
+    
+    width = property(get_width)
+
+    ## height
+    def get_height(self):
+        return self._height
+    
+    height = property(get_height)
+
+    ## fps
+    def get_fps(self):
+        return self._fps
+    
+    fps = property(get_fps)
+
+    ## simulation rate
+    def get_sim_rate(self):
+        return self._sim_rate
+
+    sim_rate = property(get_sim_rate)
+
+    ## frames per second actually drawn
+    def get_frames_per_second(self):
+        """
+        Frames per second of wall time over the current mainloop, or the
+        last one once it has finished. With a fixed simulation rate this
+        differs from ticks_per_second.
+        """
+        if self._loop_start is None:
+            return 0.0
+        end = self._loop_end or time.perf_counter()
+        if end <= self._loop_start:
+            return 0.0
+        return self._loop_frames / (end - self._loop_start)
+
+    frames_per_second = property(get_frames_per_second)
+
+    ## dropped ticks
+    def get_dropped_ticks(self):
+        """
+        Ticks given up because the game fell further behind than
+        max_frame_skip ticks in a single frame.
+        """
+        return self._dropped_ticks
+
+    dropped_ticks = property(get_dropped_ticks)
+
+    ## headless
+    def get_headless(self):
+        return self._headless
+
+    headless = property(get_headless)
+
+    ## render
+    def get_render(self):
+        return self._render
+
+    render = property(get_render)
+
+    ## ticks
+    def get_ticks(self):
+        return self._ticks
+
+    ticks = property(get_ticks)
+
+    ## first frame time
+    def get_first_frame_time(self):
+        """
+        The time.perf_counter() value when the first frame was presented,
+        or None before that.
+        """
+        return self._first_frame_time
+
+    first_frame_time = property(get_first_frame_time)
+
+    ## ticks per second
+    def get_ticks_per_second(self):
+        """
+        Ticks per second of wall time over the current mainloop, or the
+        last one once it has finished.
+        """
+        if self._loop_start is None:
+            return 0.0
+        end = self._loop_end or time.perf_counter()
+        if end <= self._loop_start:
+            return 0.0
+        return self._loop_ticks / (end - self._loop_start)
+
+    ticks_per_second = property(get_ticks_per_second)
+
+    ## flip threshold
+    def get_flip_threshold(self):
+        return self._flip_threshold
+
+    def set_flip_threshold(self, new_threshold):
+        """
+        Once the merged dirty rectangles cover at least this fraction of
+        the screen, the frame is presented with one full flip instead of
+        a partial update. 0 always flips, anything above 1 never does.
+        """
+        self._flip_threshold = new_threshold
+
+    flip_threshold = property(get_flip_threshold, set_flip_threshold)
+
+    ## present stats
+    def get_present_stats(self):
+        """
+        Return what presenting the last frame did: the number of dirty
+        rectangles recorded, how many were left after merging, the
+        pixels they cover and whether the whole screen was flipped.
+        """
+        return dict(self._present_stats)
+
+    present_stats = property(get_present_stats)
+
+    ## mask_collisions
+    def get_mask_collisions(self):
+        return self._mask_collisions
+
+    def set_mask_collisions(self, new_status):
+        """
+        Turn the narrowphase on or off. While it is on, Sprite.overlaps
+        and overlapping_sprites only report sprites whose collision masks
+        (see RotationCache.mask) overlap, not just their rectangles.
+        """
+        self._mask_collisions = new_status
+
+    mask_collisions = property(get_mask_collisions, set_mask_collisions)
+
+    def get_collision_stats(self):
+        """
+        Return how many sprite pairs whose rectangles overlapped were
+        checked (candidates) and how many of them collided (confirmed),
+        counted since the Screen was made. Without mask_collisions the
+        two are the same.
+        """
+        return dict(self._collision_stats)
+
+    collision_stats = property(get_collision_stats)
+
+    ## profiler
+    def get_profiler(self):
+        return self._profiler
+
+    profiler = property(get_profiler)
+
+    def enable_profiling(self, capacity=600, export=None):
+        """
+        Start timing every phase of the main loop, keeping the last
+        capacity frames. If export is a file name, the frames are written
+        to it (CSV for a .csv name, JSON otherwise) when the program
+        exits. Returns the FrameProfiler.
+        """
+        self._profiler = FrameProfiler(capacity)
+        if export:
+            self._profiler.export_at_exit(export)
+        return self._profiler
+
+    def disable_profiling(self):
+        self._profiler = None
+
+    ## cell size
+    def get_cell_size(self):
+        if self._grid is None:
+            return 0
+        return self._grid.cell_size
+
+    def set_cell_size(self, new_cell_size):
+        """
+        Rebuild the broadphase grid with a new cell size. A cell size of
+        0 (or None) turns the grid off and overlap tests fall back to a
+        linear scan of every object on the Screen.
+        """
+        if self._grid is not None:
+            self._grid.clear()
+        self._grid = None
+        if new_cell_size:
+            self._grid = SpatialHash(new_cell_size)
+            for object in self._objects:
+                # sprites removed earlier in this tick stay out
+                if not object._handle:
+                    continue
+                self._grid.insert(object)
+                if object._slot is not None:
+                    self._store.put(object)
+
+    cell_size = property(get_cell_size, set_cell_size)
+
+    ## vectorize
+    def get_vectorize(self):
+        return self._store is not None
+
+    def set_vectorize(self, new_status):
+        """
+        Turn the numpy entity store on or off. While it is on, sprites
+        whose class sets wraps = True are moved and wrapped around the
+        screen in one vectorized step per tick.
+        """
+        if self._store is not None:
+            self._store.clear()
+        self._store = None
+        if new_status:
+            self._store = EntityStore()
+            for object in self._objects:
+                if object.wraps and object._handle:
+                    self._store.add(object)
+
+    vectorize = property(get_vectorize, set_vectorize)
+
+    ## background
+    def get_background(self):
+        return self._background
+    
+    def set_background(self, new_background): 
+        """ 
+        Set the background to the surface provided. Note that the  
+        surface should not have transparency set, or weird things 
+        will happen. 
+
+        The surface is tiled over the screen in the display's pixel
+        format, so that erasing sprites is a plain copy with no format
+        conversion. Anything baked stays on top of the new background.
+        """
+        self._background = pygame.Surface((self._width, self._height),
+                                          0, self._display)
+        for x in range(0, self._width, new_background.get_width()): 
+            for y in range(0, self._height, new_background.get_height()): 
+                self._background.blit(new_background, (x, y)) 
+        self._static = self._background
+        baked, self._baked = self._baked, []
+        for source_surf, dest_pos in baked:
+            self.bake(source_surf, dest_pos)
+                 
+        if self._render:
+            self._display.blit(self._static, (0,0)) 
+            pygame.display.update()
+
+    background = property(get_background, set_background)
+
+    def bake(self, source_surf, dest_pos):
+        """
+        Draw a surface that never moves (a decoration, a frame around the
+        score) into the static layer: a copy of the background that
+        sprites are erased from. It then costs nothing per frame and is
+        never drawn over sprites. It stays until clear_baked() is called,
+        even if the background changes.
+        """
+        if self._static is self._background:
+            self._static = self._background.copy()
+        rect = self._static.blit(source_surf, dest_pos)
+        self._baked.append((source_surf, dest_pos))
+        if self._render:
+            self._display.blit(self._static, rect, rect)
+            self._dirtyrects.append(rect)
+
+    def clear_baked(self):
+        """
+        Remove everything baked into the static layer.
+        """
+        self._static = self._background
+        self._baked = []
+        if self._render:
+            rect = self._display.blit(self._static, (0, 0))
+            self._dirtyrects.append(rect)
+
+    ## all objects
+    def get_all_objects(self): 
+        """ 
+        Returns a list of all the Sprites on the Screen, bottom layer
+        first. The list is a new one, so it can be changed freely.
+        """ 
+        objects = self._objects.order()
+        if self._doomed:
+            return [object for object in objects if object._handle]
+        return list(objects)
+    all_objects = property(get_all_objects)
+
+    def get(self, handle):
+        """
+        Return the sprite with the given handle (see Sprite.handle), or
+        None if it is no longer on the Screen.
+        """
+        return self._entities.get(handle)
+
+    ## layers
+    def get_layers(self):
+        """
+        Names of the drawing layers, bottom first.
+        """
+        return self._objects.layers
+    layers = property(get_layers)
+
+    ## event_grab
+    def get_event_grab(self):
+        return pygame.event.get_grab()
+    
+    def set_event_grab(self, new_status):
+        pygame.event.set_grab(new_status)
+        
+    event_grab = property(get_event_grab, set_event_grab)
+        
+    def tick(self): 
+        """ 
+        If you override the tick method in a subclass of the Screen 
+        class, you can specify actions which are carried out every 
+        tick. 
+        """ 
+        pass
+
+    def add_tick_handler(self, handler):
+        """
+        Call handler() every tick, after the objects have ticked and
+        before the Screen's own tick(), until it is removed. This is for
+        game logic that is not a sprite; handlers may add or remove
+        handlers, themselves included.
+        """
+        if handler not in self._tick_handlers:
+            self._tick_handlers.append(handler)
+
+    def remove_tick_handler(self, handler):
+        if handler in self._tick_handlers:
+            self._tick_handlers.remove(handler)
+
+    def keypress(self, key):
+        """
+        If you override the keypress method, you will be able to
+        handle individual keypresses instead of dealing with the
+        keys held down as in the standard library
+        """
+        pass
+
+    def handle_events(self):
+        """
+        If you override this method in a subclass of the Screen
+        class, you can specify how to handle different kinds of
+        events.  However you must handle the quit condition!
+        """
+        events = pygame.event.get()
+        for event in events:
+            if event.type == QUIT:
+                self.quit()
+            elif event.type == KEYDOWN:
+                if event.key == K_ESCAPE:
+                    self.quit()
+                else:
+                    keyboard._event(event)
+                    self.keypress(event.key)
+            elif event.type in (KEYUP, _TEXTINPUT):
+                keyboard._event(event)
+ 
+    def quit(self): 
+        """ 
+        Calling this method will stop the main loop from running and 
+        make the graphics window disappear. 
+        """ 
+        self._exit = 1 
+ 
+    def clear(self):
+        """
+        Destroy all objects on this Screen.
+        """
+        for object in self._objects.order():
+            object.destroy()
+        self._objects.clear()
+        self._entities.clear()
+        self._doomed = []
+        if self._grid is not None:
+            self._grid.clear()
+        if self._store is not None:
+            self._store.clear()
+ 
+    def _update_display(self):
+        """
+        Get the actual display in sync with reality. Overlapping and
+        touching dirty rectangles are merged first, then the frame is
+        pushed either as a partial update or, if most of the screen is
+        dirty anyway, as a single flip.
+        """
+        rects = _coalesce_rects(self._dirtyrects)
+        pixels = 0
+        for rect in rects:
+            pixels += rect.width * rect.height
+        full = pixels >= self._flip_threshold * self._width * self._height
+        if full:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        stats = self._present_stats
+        stats["rects"] = len(self._dirtyrects)
+        stats["merged"] = len(rects)
+        stats["pixels"] = pixels
+        stats["full"] = full
+        self._dirtyrects = []
+
+    def mainloop(self, max_ticks=None): 
+        """ 
+        Run the pygame main loop. This will animate the objects on the 
+        screen and call their tick methods every tick. 
+
+        If max_ticks is given the loop also stops after that many ticks.
+        """ 
+        self._exit = 0 
+        self._loop_ticks = 0
+        self._loop_frames = 0
+        self._loop_start = time.perf_counter()
+        self._loop_end = None
+        render = self._render
+        # A headless Screen never waits, so it has no use for a fixed
+        # timestep: it runs one tick per frame as fast as it can.
+        fixed = self._sim_rate and not self._headless
+        if fixed:
+            step = 1. / self._sim_rate
+            lag = step
+            last = self._loop_start
+ 
+        while not self._exit: 
+            profiler = self._profiler
+            if profiler is not None:
+                profiler.begin_frame()
+
+            self._wait_frame()
+            if profiler is not None: profiler.mark(FrameProfiler.WAIT)
+
+            if render:
+                for object in self._objects: 
+                    object._erase()
+            if profiler is not None: profiler.mark(FrameProfiler.ERASE)
+
+            if fixed:
+                now = time.perf_counter()
+                lag += now - last
+                last = now
+                steps = 0
+                while lag >= step and not self._exit:
+                    if steps > self._max_frame_skip:
+                        # Too far behind: let the game slow down rather
+                        # than spend every frame catching up.
+                        self._dropped_ticks += int(lag / step)
+                        lag = 0.0
+                        break
+                    self._step(profiler)
+                    lag -= step
+                    steps += 1
+                    if max_ticks is not None and \
+                       self._loop_ticks >= max_ticks:
+                        break
+            else:
+                self._step(profiler)
+ 
+            if render:
+                if fixed:
+                    alpha = lag / step
+                    for object in self._objects: 
+                        object._draw_interpolated(alpha)
+                else:
+                    for object in self._objects: 
+                        object._draw()
+            if profiler is not None: profiler.mark(FrameProfiler.DRAW)
+
+            if render:
+                self._update_display()
+            if self._first_frame_time is None:
+                self._first_frame_time = time.perf_counter()
+            if profiler is not None: profiler.mark(FrameProfiler.PRESENT)
+
+            self.handle_events() 
+            if profiler is not None:
+                profiler.mark(FrameProfiler.EVENTS)
+                profiler.end_frame()
+
+            self._loop_frames += 1
+            if max_ticks is not None and self._loop_ticks >= max_ticks:
+                self._exit = 1
+ 
+        self._loop_end = time.perf_counter()
+
+        # Throw away any pending events.
+        pygame.event.get()
+
+    def _step(self, profiler):
+        """
+        Advance the game by one tick: tick every object, then the Screen.
+        """
+        keyboard._begin_tick()
+        if self._exit:
+            # An InputReplay quits at the end of its recording: that tick
+            # was never recorded, so it is not run either.
+            return
+        if self._store is not None:
+            self._store.step(self._width, self._height, self._grid)
+
+        # Objects added by a tick change the display list, not the order
+        # tuple being walked here; removed ones stay in it, skipped, until
+        # the sweep.
+        self._ticking = True
+        try:
+            if profiler is None:
+                for object in self._objects.order(): 
+                    if object._tickable and object._handle:
+                        object._tick() 
+            else:
+                self._profiled_tick(profiler)
+                profiler.mark(FrameProfiler.TICK)
+
+            if self._tick_handlers:
+                for handler in tuple(self._tick_handlers):
+                    handler()
+            self.tick() 
+        finally:
+            self._ticking = False
+        self._sweep()
+        audio._end_tick(self._ticks)
+        if profiler is not None: profiler.mark(FrameProfiler.SCREEN_TICK)
+
+        self._ticks += 1
+        self._loop_ticks += 1
+ 
+    def _profiled_tick(self, profiler):
+        """
+        The tick pass of mainloop, timing each object.
+        """
+        clock = time.perf_counter
+        for object in self._objects.order(): 
+            if object._tickable and object._handle:
+                start = clock()
+                object._tick() 
+                profiler.add_tick(type(object), clock() - start)
+
+    def _sweep(self):
+        """
+        Take the sprites removed during the tick out of the display list.
+        """
+        doomed = self._doomed
+        if doomed:
+            remove = self._objects.remove
+            for sprite in doomed:
+                # unless it has been added again since
+                if not sprite._handle:
+                    remove(sprite)
+            self._doomed = []
+
+    def _wait_frame (self): 
+        "Wait for the correct fps time to expire" 
+        if self._headless:
+            return
+        this_tick = pygame.time.get_ticks() 
+        if this_tick < self._next_tick: 
+            pygame.time.delay(int(self._next_tick+0.5) - this_tick) 
+            # Count the next frame from the deadline just waited for, not
+            # from before the delay, or every other frame skips its wait.
+            this_tick = self._next_tick
+        self._next_tick = this_tick + (1000./self._fps) 
+
+    def overlapping_objects(self, rectangle): 
+        """ 
+        Return list of all sprites which overlap given rectangle, in the
+        order they were added, with or without the grid.
+        """ 
+        rect = pygame.Rect (rectangle)
+
+        if self._grid is not None:
+            candidates = list(self._grid.query(rect))
+            indices = rect.collidelistall([obj._rect for obj in candidates])
+            over_objects = [candidates[index] for index in indices
+                            if candidates[index].is_collideable]
+            over_objects.sort(key=_handle_of)
+            return over_objects
+
+        objects = self._objects.order()
+        rect_list = []
+        for obj in objects:
+            rect_list.append (obj._rect)
+
+        indices = rect.collidelistall (rect_list)
+
+        over_objects = [] 
+        for index in indices:
+            if objects[index].is_collideable and objects[index]._handle:
+                over_objects.append (objects [index]) 
+        over_objects.sort(key=_handle_of)
+
+        return over_objects
+
+    def _narrowphase(self, sprite, candidates):
+        """
+        Return the candidates, sprites whose rectangles overlap sprite's,
+        that really collide with it.
+        """
+        stats = self._collision_stats
+        stats["candidates"] += len(candidates)
+        if self._mask_collisions and candidates:
+            mask = rotation_cache.mask(sprite._surface)
+            x, y = sprite._rect.topleft
+            candidates = [other for other in candidates
+                          if mask.overlap(rotation_cache.mask(other._surface),
+                                          (other._rect.x - x,
+                                           other._rect.y - y))]
+        stats["confirmed"] += len(candidates)
+        return candidates
+
+    def _elevate(self, it, above=None):
+        """
+        Elevates an object to the top of its layer, or above the specified
+        object.
+        """
+        self._objects.elevate(it, above)
+
+    def _lower(self, it, below=None):
+        """
+        Lower an object to the bottom of its layer, or below the specified
+        object.
+        """
+        self._objects.lower(it, below)
+
+    def add(self, sprite, layer=None):
+        """
+        Put a sprite on the Screen, on top of its layer: the layer given,
+        else the one its class names, else the bottom one.
+        """
+        if layer is None:
+            layer = sprite.layer
+        if self._entities.get(sprite._handle) is sprite:
+            # Added twice: it just moves to its new place
+            del self._entities[sprite._handle]
+            if self._grid is not None:
+                self._grid.remove(sprite)
+            if self._store is not None:
+                self._store.remove(sprite)
+        self._objects.add(sprite, layer)
+        sprite._handle = self._next_handle
+        self._next_handle += 1
+        self._entities[sprite._handle] = sprite
+        if self._grid is not None:
+            self._grid.insert(sprite)
+        if self._store is not None and sprite.wraps:
+            self._store.add(sprite)
+      
+    def remove(self, sprite):
+        """
+        Take a sprite off the Screen. During a tick it is skipped from
+        then on and leaves the display list at the end of the tick.
+        """
+        # Removing a sprite twice happens in some games, not an error.
+        if self._entities.get(sprite._handle) is not sprite:
+            return
+        del self._entities[sprite._handle]
+        sprite._handle = 0
+        if self._grid is not None:
+            self._grid.remove(sprite)
+        if self._store is not None:
+            self._store.remove(sprite)
+        if self._ticking:
+            self._doomed.append(sprite)
+        else:
+            self._objects.remove(sprite)
+
+    def blit_and_dirty (self, source_surf, dest_pos):
+        """
+        You probably won't need to use this method in your own programs,
+        as |Sprite| and its sub-classes know how to draw themselves on
+        the screen. You'd need to use method if you wanted to draw an
+        image on the screen which wasn't an |Sprite|.
+
+        This method blits (draws, taking account of transparency) the
+        given source surface |source_surf| to the screen at the position
+        given by |dest_pos|. 
+
+        It then remembers the place where the surface was drawn as
+        ``dirty''.  This means that when the display is updated on the
+        next tick, this part of it will be redrawn. 
+        """
+        if not self._render:
+            return
+        rect = self._display.blit(source_surf, dest_pos) 
+        self._dirtyrects.append(rect)
+
+
+    def blit_background(self, rect):
+        """
+        This method draws the background (with anything baked into it,
+        see |bake|) over the given rectangle, and
+        marks that rectangle as ``dirty'' (see the |blit_and_dirty|
+        method for what that means). It's used to erase an object before
+        moving it. You shouldn't need to call it yourself.
+        """
+        if not self._render:
+            return
+        rect = self._display.blit(self._static, rect, rect)
+        self._dirtyrects.append(rect)
+         
+
+############################################################################### 
+## Sprite class ###############################################################
+############################################################################### 
+##                                                                           ## 
+## Sprite represents a graphical object on the screen. Sprites               ## 
+## can be moved, rotated, deleted, and maybe have other things done to them. ## 
+##                                                                           ## 
+############################################################################### 
+
+class Sprite(object): 
+    # Sprites are made and thrown away all the time, so they keep their
+    # state in slots rather than a per-instance __dict__. Subclasses need
+    # to declare __slots__ too (an empty tuple if they add no attributes),
+    # or they get a __dict__ back.
+    __slots__ = ("_grid_span", "_handle", "_slot",
+                 "_surface", "_orig_surface", "_rect",
+                 "_x", "_y", "_dx", "_dy", "_prev_x", "_prev_y",
+                 "_drawn_rect", "_angle", "_is_collideable",
+                 "_interval", "_tickable", "_next", "_gone", "_pool")
+
+    # Sprites that wrap around the screen edges. With Screen.vectorize on
+    # they are moved and wrapped by the EntityStore and must not do it
+    # themselves (see is_vectorized).
+    wraps = False
+
+    # Name of the Screen layer the sprite is drawn in (None: the bottom
+    # one), see DisplayList.
+    layer = None
+
+    def __init__(self, image, angle=0,
+                 x=0, y=0,
+                 top=None, bottom=None, left=None, right=None,
+                 dx=0, dy=0,
+                 interval=1, is_collideable=True):
+        
+        if not Screen.initialized: 
+            raise GamesError("Screen object must be intialized before any Sprite object") 
+ 
+        # Cells of the Screen's grid this sprite is filed under (None
+        # while the sprite is not on the Screen)
+        self._grid_span = None
+        # Handle given by the Screen when added (0 while not on it)
+        self._handle = 0
+        # Slot in the Screen's EntityStore, if it is in one
+        self._slot = None
+
+        self._surface = image 
+        self._orig_surface = image    # Surface before any rotation 
+        self._rect = self._surface.get_rect() 
+
+        self.position = (x, y)
+
+        if top != None:
+            self.top = top
+        if bottom != None:
+            self.bottom = bottom
+        if left != None:
+            self.left = left
+        if right != None:
+            self.right = right
+
+        self.velocity = (dx, dy) 
+
+        self._angle = angle % 360
+        if self._angle != 0:
+            self._rotate() 
+
+        self.is_collideable = is_collideable
+
+        self._interval = interval 
+        self._tickable = 1 
+        self._next = 0
+
+        self._gone = 0
+        # The Pool that recycles this sprite, if it came from one
+        self._pool = None
+
+        # Position before the last tick and where the sprite was last
+        # drawn, for interpolated drawing (see Screen's sim_rate)
+        self._prev_x = self._x
+        self._prev_y = self._y
+        self._drawn_rect = None
+
+    def __del__(self):
+        if screen and not self._gone:
+            self.destroy()
+
+    def _draw(self): 
+        """ 
+        Draw object on screen by blitting the image onto the screen. 
+        """ 
+        screen.blit_and_dirty(self._surface, self._rect)
+
+    def _draw_interpolated(self, alpha):
+        """
+        Draw object where it would be alpha of the way from its position
+        before the last tick to its current position. Big jumps, such as
+        wrapping around the screen, are not interpolated.
+        """
+        back = 1. - alpha
+        offset_x = int(round((self._prev_x - self._x) * back))
+        offset_y = int(round((self._prev_y - self._y) * back))
+        if abs(offset_x) * 2 > screen.width or \
+           abs(offset_y) * 2 > screen.height:
+            offset_x = offset_y = 0
+        self._drawn_rect = self._rect.move(offset_x, offset_y)
+        screen.blit_and_dirty(self._surface, self._drawn_rect)
+
+    def _erase(self): 
+        """ 
+        Erase object from screen by blitting the background over where  
+        it was. 
+        """
+        if self._drawn_rect is None:
+            screen.blit_background(self._rect)
+        else:
+            screen.blit_background(self._drawn_rect)
+ 
+    def _replace(self, new_surface): 
+        x, y = self.position 
+        self._surface = new_surface 
+        self._rect = self._surface.get_rect() 
+        self.position = (x, y)
+        if self._slot is not None:
+            screen._store.put_size(self)
+
+    def _rotate(self): 
+        self._replace(rotation_cache.rotate(self._orig_surface, self._angle))
+
+    def _tick(self):
+        # Sprites in the EntityStore have been moved already, see _sync.
+        moves = self._slot is None
+        if moves:
+            self._prev_x = self._x
+            self._prev_y = self._y
+        self._next = self._next + 1 
+        if self._next >= self._interval: 
+            self._next = 0  
+            self.tick()
+        if moves and (self._dx or self._dy):
+            # The position setter, inlined: this runs for every moving
+            # sprite on every tick.
+            x = self._x = self._x + self._dx
+            y = self._y = self._y + self._dy
+            self._rect.center = (int(x), int(y))
+            if self._grid_span is not None:
+                screen._grid.update(self)
+        self.update()
+
+    def start (self): 
+        self._tickable = 1 
+        self._next = 0 
+
+    def stop (self): 
+        self._tickable = 0 
+
+    def update(self):
+        pass
+
+    def tick(self):
+        pass
+ 
+    def overlaps(self, other):
+        if not self.is_collideable or not other.is_collideable:
+            return False
+        elif not self._rect.colliderect(other._rect):
+            return False
+        else:
+            return bool(screen._narrowphase(self, [other]))
+     
+    def elevate(self, above=None):
+        """
+        Elevate an object to the top of its layer, or above the specified
+        object in the same layer.
+        """
+        screen._elevate(self, above)
+     
+    def lower(self, below=None):
+        """
+        Lower an object to the bottom of its layer, or below the specified
+        object in the same layer.
+        """
+        screen._lower(self, below)
+
+    def destroy(self): 
+        """ 
+        Erase object from screen and remove it from the list of objects 
+        maintained by games module. 
+        """
+        self._erase()
+        screen.remove(self) 
+        if self._pool is not None and not self._gone:
+            self._gone = 1
+            self._pool.release(self)
+        self._gone = 1
+
+    def on_acquire(self, *args, **kwargs):
+        """
+        Called by a Pool to reuse this destroyed sprite, with the arguments
+        the class would be called with. Runs __init__ again unless a
+        subclass does something cheaper (see _revive).
+        """
+        self.__init__(*args, **kwargs)
+
+    def on_release(self):
+        """
+        Called by a Pool when it keeps this destroyed sprite for reuse.
+        Drop references to other objects here.
+        """
+        pass
+
+    def _revive(self, x, y, dx=0, dy=0):
+        """
+        Make a destroyed sprite new again at (x, y), keeping its image, for
+        on_acquire hooks. No get_rect and no rotation, unlike __init__.
+        """
+        self._grid_span = None
+        self._handle = 0
+        self._slot = None
+        if self._angle != 0:
+            self._angle = 0
+            self._replace(self._orig_surface)
+        self.position = (x, y)
+        self.velocity = (dx, dy)
+        self._tickable = 1
+        self._next = 0
+        self._gone = 0
+        self._prev_x = self._x
+        self._prev_y = self._y
+        self._drawn_rect = None
+
+    #------Properties--------#
+
+    def _moved(self):
+        """
+        Keep the Screen's broadphase grid and entity store in step with
+        the rectangle.
+        """
+        if self._grid_span is not None:
+            screen._grid.update(self)
+        if self._slot is not None:
+            screen._store.put(self)
+
+    def _sync(self, new_x, new_y):
+        """
+        Take a new position from the EntityStore, which also takes care
+        of the grid.
+        """
+        self._prev_x = self._x
+        self._prev_y = self._y
+        self._x = new_x
+        self._y = new_y
+        self._rect.center = (int(new_x), int(new_y))
+
+    ## x
+    def get_x(self):
+        return self._x
+    def set_x(self, new_x):
+        self._x = new_x
+        self._rect.centerx = int(self._x)
+        self._moved()
+    x = property(get_x, set_x)
+
+    ## y
+    def get_y(self):
+        return self._y
+    def set_y(self, new_y):
+        self._y = new_y
+        self._rect.centery = int(self._y)
+        self._moved()
+    y = property(get_y, set_y)
+
+    ## position
+    def get_position(self):
+        return ( (self.x, self.y) )
+    def set_position(self, new_position):
+        self._x, self._y = new_position
+        self._rect.center = (int(self._x), int(self._y))
+        self._moved()
+    position = property(get_position, set_position)
+
+    ## dx
+    def get_dx(self):
+        return self._dx
+    def set_dx(self, new_dx):
+        self._dx = new_dx
+        if self._slot is not None:
+            screen._store.dx[self._slot] = new_dx
+    dx = property(get_dx, set_dx)
+
+    ## dy
+    def get_dy(self):
+        return self._dy
+    def set_dy(self, new_dy):
+        self._dy = new_dy
+        if self._slot is not None:
+            screen._store.dy[self._slot] = new_dy
+    dy = property(get_dy, set_dy)
+
+    ## velocity
+    def get_velocity(self):
+        return ( (self.dx, self.dy) )
+    def set_velocity (self, new_velocity): 
+        self.dx, self.dy = new_velocity
+    velocity = property(get_velocity, set_velocity)
+
+    ## left
+    def get_left(self):
+        return self._rect.left
+    def set_left(self, new_left):
+        self._rect.left = new_left
+        self._x = self._rect.centerx
+        self._moved()
+    left = property(get_left, set_left)
+
+    ## right
+    def get_right(self):
+        return self._rect.right
+    def set_right(self, new_right):
+        self._rect.right = new_right
+        self._x = self._rect.centerx
+        self._moved()
+    right = property(get_right, set_right)
+
+    ## top
+    def get_top(self):
+        return self._rect.top
+    def set_top(self, new_top):
+        self._rect.top = new_top
+        self._y = self._rect.centery
+        self._moved()
+    top = property(get_top, set_top)
+
+    ## bottom
+    def get_bottom(self):
+        return self._rect.bottom
+    def set_bottom(self, new_bottom):
+        self._rect.bottom = new_bottom
+        self._y = self._rect.centery
+        self._moved()
+    bottom = property(get_bottom, set_bottom)
+
+    ## angle
+    def get_angle(self):
+        return self._angle
+    def set_angle(self, new_angle):
+        self._angle = new_angle % 360 
+        self._rotate() 
+    angle = property(get_angle, set_angle)
+
+    ## image
+    def get_image(self):
+        return self._orig_surface
+    def set_image(self, new_image): 
+        self._orig_surface = new_image 
+        if self._angle != 0: 
+            self._rotate() 
+        else: 
+            self._replace(new_image) 
+    image = property(get_image, set_image)
+
+    ## height
+    def get_height(self):
+        return self._surface.get_height()
+    height = property(get_height)
+
+    ## width
+    def get_width(self):
+        return self._surface.get_width()
+    width = property(get_width)
+
+    ## is vectorized
+    def get_is_vectorized(self):
+        """
+        True while the sprite is moved by the Screen's EntityStore.
+        """
+        return self._slot is not None
+    is_vectorized = property(get_is_vectorized)
+
+    ## is_collideable
+    def get_is_collideable(self):
+        return self._is_collideable
+    def set_is_collideable(self, new_status):
+        self._is_collideable = new_status
+    is_collideable = property(get_is_collideable, set_is_collideable)
+
+
+    ## handle
+    def get_handle(self):
+        """
+        The integer the Screen knows this sprite by while it is on it
+        (see Screen.get), or 0 if it is not on the Screen.
+        """
+        return self._handle
+    handle = property(get_handle)
+
+    ## overlapping_sprites
+    def get_overlapping_sprites(self): 
+        overlapping = screen.overlapping_objects(self._rect)
+        if self in overlapping:
+            overlapping.remove(self)
+        return screen._narrowphase(self, overlapping)
+    overlapping_sprites = property(get_overlapping_sprites)
+
+    ## interval
+    def get_interval(self):
+        return self._interval
+    def set_interval(self, new_interval):
+        self._interval = new_interval
+    interval = property(get_interval, set_interval)
+
+
+class Text(Sprite): 
+    """ 
+    Alphanumeric values displayed on the screen.
+    """      
+    __slots__ = ("_size", "_color", "_value")
+
+    # Text goes over the game's sprites
+    layer = "hud"
+
+    def __init__(self, value, size, color, angle=0,
+                 x=0, y=0,
+                 top=None, bottom=None, left=None, right=None,
+                 dx=0, dy=0,
+                 interval=1, is_collideable=True):
+        self._size = size 
+        self._color = color 
+        self._value = value
+        Sprite.__init__(self, self._create_surface(), angle,
+                        x, y,
+                        top, bottom, left, right,
+                        dx, dy,
+                        interval, is_collideable)
+
+    def _create_surface(self):
+        return fonts.render(None, self._size, self._color, str(self._value))
+
+    #------Properties--------#
+
+    ## value
+    def get_value(self): 
+        return self._value
+    
+    def set_value(self, new_value):
+        if new_value != self._value: 
+            self._value = new_value
+            self.image = self._create_surface() 
+            
+    value = property(get_value, set_value)
+ 
+    ## color
+    def get_color(self): 
+        return self._color
+    
+    def set_color(self, new_color): 
+        if new_color != self._color: 
+            self._color = new_color 
+            surface = self._create_surface() 
+            self.image = surface
+            
+    color = property(get_color, set_color)
+
+    ## size
+    def get_size(self): 
+        return self._size
+    
+    def set_size(self, new_size): 
+        if new_size != self._size: 
+            self._size = new_size
+            surface = self._create_surface() 
+            self.image = surface
+
+    size = property(get_size, set_size) 
+
+
+class Question(Text):
+    __slots__ = ("responses",)
+
+    def __init__(self, value, size, color, angle=0,
+                 x=0, y=0,
+                 top=None, bottom=None, left=None, right=None,
+                 dx=0, dy=0,
+                 interval=1, is_collideable=True, responses=()):
+        Text.__init__(self, value, size, color, angle,
+                      x, y,
+                      top, bottom, left, right,
+                      dx, dy,
+                      interval, is_collideable)    
+        self.responses = responses
+
+    def tick(self):
+        for key, action in self.responses:
+            if keyboard.is_pressed(key):
+                action()
+
+
+class Message(Text):
+    __slots__ = ("_after_death",)
+
+    def __init__(self, value, size, color, angle=0,
+                 x=0, y=0,
+                 top=None, bottom=None, left=None, right=None,
+                 dx=0, dy=0,
+                 lifetime=0, is_collideable=True, after_death=None):
+        Text.__init__(self, value, size, color, angle,
+                      x, y,
+                      top, bottom, left, right,
+                      dx, dy,
+                      lifetime, is_collideable) 
+        self._after_death = after_death
+
+    def tick(self):
+        if self._after_death:
+            self._after_death()
+        self.stop()
+        self.destroy()
+
+
+class FrameSequence(object):
+    """
+    The frames of an animation, how many ticks each one is shown for and
+    whether they play in a loop (first to last, first to last, ...) or
+    back and forth (mode "pingpong": first to last to first, ...).
+
+    A sequence never changes, so every Animation playing it shares the
+    one object and just keeps its place in it. It behaves like the tuple
+    of its frames. assets.animation() hands out shared looping sequences
+    with one tick per frame.
+    """
+    MODES = ("loop", "pingpong")
+
+    def __init__(self, frames, durations=None, mode="loop"):
+        if isinstance(frames, FrameSequence):
+            frames = frames.frames
+        frames = tuple(frames)
+        if not frames:
+            raise GamesError("An animation with no images is illegal.")
+        if durations is None:
+            durations = (1,) * len(frames)
+        durations = tuple(int(duration) for duration in durations)
+        if len(durations) != len(frames) or min(durations) < 1:
+            raise GamesError("Every frame needs a duration of at least 1")
+        if mode not in FrameSequence.MODES:
+            raise GamesError("Unknown animation mode %r" % (mode,))
+        self._frames = frames
+        self._durations = durations
+        self._mode = mode
+
+        order = list(range(len(frames)))
+        if mode == "pingpong":
+            order += order[-2:0:-1]
+        # The image for each tick of one cycle, so playing is indexing
+        timeline = []
+        for index in order:
+            timeline.extend([frames[index]] * durations[index])
+        self._timeline = tuple(timeline)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __getitem__(self, index):
+        return self._frames[index]
+
+    def __iter__(self):
+        return iter(self._frames)
+
+    #------Properties--------#
+
+    ## frames
+    def get_frames(self):
+        return self._frames
+    frames = property(get_frames)
+
+    ## durations, in ticks
+    def get_durations(self):
+        return self._durations
+    durations = property(get_durations)
+
+    ## mode
+    def get_mode(self):
+        return self._mode
+    mode = property(get_mode)
+
+    ## ticks in one cycle
+    def get_n_ticks(self):
+        return len(self._timeline)
+    n_ticks = property(get_n_ticks)
+
+
+def _frame_sequence(images):
+    """
+    Return a FrameSequence for whatever Animation was given: a sequence,
+    an AssetHandle, file names or images.
+    """
+    if isinstance(images, AssetHandle):
+        images = images.get()
+    elif images and type(images[0]) is type(""):
+        images = assets.animation(images)
+    if isinstance(images, FrameSequence):
+        return images
+    return FrameSequence(images)
+
+
+class Animation(Sprite):
+    """
+    An image that changes every repeat_interval ticks.
+    The n_repeats parameter is the number of complete animation cycles to show.
+    If n_repeats <= 0, the animation will repeat forever.
+    You can give a FrameSequence, list of filenames, list of images or an
+    AssetHandle. Animations share the sequence they play and only keep
+    their place in it, so playing allocates nothing.
+    """
+    __slots__ = ("_sequence", "_cursor", "n_repeats")
+
+    def __init__(self, images, angle=0,
+                 x=0, y=0,
+                 top=None, bottom=None, left=None, right=None,
+                 dx=0, dy=0,
+                 repeat_interval=1, n_repeats=0, is_collideable=True):
+                 
+        Sprite.__init__(self, self._restart(images, n_repeats), angle,
+                        x, y,
+                        top, bottom, left, right,
+                        dx, dy,
+                        repeat_interval, is_collideable)
+
+    def _restart(self, images, n_repeats):
+        """
+        Start the animation over with these images; return the image to
+        show first.
+        """
+        self._sequence = _frame_sequence(images)
+        self._cursor = 0
+        # Cycles left to show, counting the current one (-1: forever)
+        self.n_repeats = n_repeats if n_repeats > 0 else -1
+        return self._sequence._timeline[0]
+
+    def next_image(self):
+        """
+        Move on one tick; return the image to show, or None once the
+        last cycle is over.
+        """
+        if self.n_repeats == 0: return None
+        timeline = self._sequence._timeline
+        cursor = self._cursor + 1
+        if cursor == len(timeline):
+            cursor = 0
+            if self.n_repeats > 0:
+                self.n_repeats -= 1
+                if self.n_repeats == 0: return None
+        self._cursor = cursor
+        return timeline[cursor]
+
+    def tick(self):
+        new_image = self.next_image()
+        if new_image is None:
+            self.destroy()
+        elif new_image is not self._orig_surface:
+            self.image = new_image
+
+    #------Properties--------#
+
+    ## images
+    def get_images(self):
+        return self._sequence
+    def set_images(self, new_images):
+        self._sequence = _frame_sequence(new_images)
+        self._cursor = 0
+    images = property(get_images, set_images)
+
+
+############################################################################### 
+## Utility Functions 
+############################################################################### 
+def _handle_of(sprite):
+    return sprite._handle
+
+def _coalesce_rects(rects):
+    """
+    Merge overlapping or touching rectangles, as long as their union is
+    no bigger than the two rectangles pushed separately. Returns a new
+    list of Rects.
+    """
+    merged = []
+    for rect in sorted(rects, key=_rect_left):
+        if not rect.width or not rect.height:
+            continue
+        rect = pygame.Rect(rect)
+        area = rect.width * rect.height
+        while merged:
+            hits = rect.inflate(2, 2).collidelistall(merged)
+            for index in reversed(hits):
+                other = merged[index]
+                union = rect.union(other)
+                other_area = other.width * other.height
+                if union.width * union.height <= area + other_area:
+                    del merged[index]
+                    rect = union
+                    area = union.width * union.height
+                    break
+            else:
+                break
+        merged.append(rect)
+    return merged
+
+def _rect_left(rect):
+    return rect[0]
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def _mask_bytes(mask):
+    # pygame packs each row of a mask into 64 bit words
+    width, height = mask.get_size()
+    return (width + 63) // 64 * 8 * height
+
+def load_image(filename, transparent=True, prebake=0): 
+    """Loads an image, prepares it for play. Returns a pygame.Surface object 
+    which you can give as the "image" parameter to Sprite. 
+ 
+    filename -- the filename of the image to load 
+    transparent -- whether the background of the image should be transparent. 
+                   Defaults to true. 
+                   The background color is taken as the color of the pixel 
+                   at (0,0) in the image. 
+    prebake -- if non-zero, store rotated copies of the image every prebake
+               degrees in the rotation cache straight away.
+    """ 
+    surface = assets.image(filename, transparent)
+    if prebake:
+        rotation_cache.prebake(surface, prebake)
+    return surface
+
+def scale_image(image, x_scale, y_scale=None):
+    if y_scale is None: y_scale = x_scale
+    (x_size, y_size) = image.get_size()
+    x_size = x_size * x_scale
+    y_size = y_size * y_scale
+    return pygame.transform.scale(image, (x_size, y_size))
+
+def load_animation(filenames, transparent=1):
+    """
+    Loads a number of files.  Receives file names.  Returns corresponding file objects
+    needed by the Animation constructor.
+    """
+    return list(assets.animation(filenames, transparent))
+ 
+def load_sound(filename): 
+    """ 
+    Load a sound file, returning a Sound object. 
+    """ 
+    return assets.sound(filename)
+
+def _decode_image(filename, transparent):
+    """
+    Read an image from disk and convert it to the display format. Only
+    the asset registry calls this; everybody else goes through it.
+    """
+    try: 
+        surface = pygame.image.load(filename) 
+    except pygame.error: 
+        raise GamesError( 'Could not load image "%s" %s'%(filename, pygame.get_error()) )
+    if transparent: 
+        corner = surface.get_at((0, 0)) 
+        surface.set_colorkey(corner, RLEACCEL) 
+    return surface.convert()
+
+
+############################################################################### 
+## Initialization Function
+############################################################################### 
+screen = None
+
+def _use_dummy_drivers():
+    """
+    Move the display and mixer onto SDL's dummy drivers, which need
+    neither a window system nor a sound card.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.display.quit()
+    # restarted on the dummy driver by _init_mixer when it is needed
+    pygame.mixer.quit()
+
+def _init_mixer():
+    """
+    Start the mixer if it isn't running. Returns whether it is, as there
+    may be no sound card.
+    """
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            return False
+    return True
+
+def _init_font():
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.lower() not in ("0", "no", "false", "off")
+
+def init(screen_width = 640, screen_height = 480, fps = 50, cell_size = 64,
+         headless = None, render = None, sim_rate = None, max_frame_skip = 5,
+         vectorize = None, layers = DEFAULT_LAYERS,
+         mask_collisions = False):
+    """
+    Create the Screen. headless, render and vectorize default to the
+    LIVEWIRES_HEADLESS, LIVEWIRES_RENDER and LIVEWIRES_VECTORIZE
+    environment variables, so a game can be run headless without
+    changing its code. layers names the drawing layers, bottom first;
+    Text is drawn in the "hud" layer, so keep one of that name.
+    mask_collisions turns on pixel-accurate collisions. If
+    LIVEWIRES_PROFILE names a file, the main loop is profiled and the
+    frame timings are written to that file at exit.
+    """
+    global screen
+    if headless is None:
+        headless = _env_flag("LIVEWIRES_HEADLESS", False)
+    if render is None:
+        render = _env_flag("LIVEWIRES_RENDER", True)
+    if vectorize is None:
+        vectorize = _env_flag("LIVEWIRES_VECTORIZE", False)
+    screen = Screen(screen_width, screen_height, fps, cell_size,
+                    headless, render, sim_rate, max_frame_skip, vectorize,
+                    layers, mask_collisions)
+    if os.environ.get("LIVEWIRES_PROFILE"):
+        screen.enable_profiling(export=os.environ["LIVEWIRES_PROFILE"])
+
+mouse = Mouse()
+keyboard = Keyboard()
+music = Music()
+audio = AudioManager()
+rotation_cache = RotationCache()
+assets = AssetRegistry()
+fonts = FontCache()
@@ -1,14 +1,47 @@
 from livewires import games
 
 
-games.init(screen_width=640, screen_height=480, fps=50)
+# drawing layers, bottom first
+LAYERS = ("effects", "asteroids", "projectiles", "ship", "hud")
+
+
+def init(**options):
+    """ Open the game's screen (options go to games.init, over these) """
+    settings = dict(screen_width=640, screen_height=480, fps=50,
+                    # speeds are per tick and were tuned at about 100
+                    # ticks a second; frames are drawn at fps in between
+                    sim_rate=100,
+                    layers=LAYERS,
+                    # rotated ship and missile rectangles are much bigger
+                    # than the art
+                    mask_collisions=True)
+    settings.update(options)
+    games.init(**settings)
+
+
+# mixer channels for each kind of sound, so explosions can't take them all
+games.audio.reserve("ship", 3)
+games.audio.reserve("explosions", 4)
+games.audio.reserve("interface", 1)
 
 
 class Wrapper(games.Sprite):
     """ Sprite, which wraps around the screen """
+    __slots__ = ("lifes",)
+    # let the screen's entity store move and wrap it, if it has one
+    wraps = True
+
+    def __init__(self, lifes=1, **kwargs):
+        """ Initialize sprite with the number of hits it can take """
+        self.lifes = lifes
+        super(Wrapper, self).__init__(**kwargs)
 
     def update(self):
         """ Wrap sprite around screen """
+        if self.is_vectorized:
+            # already wrapped by the entity store
+            return
+
         if self.top > games.screen.height:
             self.bottom = 0
 
@@ -28,12 +61,20 @@ class Wrapper(games.Sprite):
 
 class Collider(Wrapper):
     """ A wraper that can collide with another object """
+    __slots__ = ()
 
     def update(self):
         """ Check for overlapping sprites """
         super(Collider, self).update()
-        if self.overlapping_sprites:
-            for sprite in self.overlapping_sprites:
+        overlapping = self.overlapping_sprites
+        if overlapping:
+            # a sprite that dies can take others with it (the ship ends the
+            # game, which clears the asteroids), and pooled sprites come
+            # back with new handles: only hit those still as they were
+            hits = [(sprite, sprite.handle) for sprite in overlapping]
+            for sprite, handle in hits:
+                if sprite.handle != handle:
+                    continue
                 sprite.lifes -= 1
                 if sprite.lifes == 0:
                     sprite.die()
@@ -41,27 +82,41 @@ class Collider(Wrapper):
 
     def die(self):
         """ Destroys object with an explosion """
-        new_explosion = Explosion(x=self.x, y=self.y)
+        new_explosion = Explosion.pool.acquire(x=self.x, y=self.y)
         games.screen.add(new_explosion)
         self.destroy()
 
 
 class Explosion(games.Animation):
     """ Animationed explosion """
-    sound = games.load_sound("sounds/explosion.wav")
-    images = ["images/explosion1.bmp",
-              "images/explosion2.bmp",
-              "images/explosion3.bmp",
-              "images/explosion4.bmp",
-              "images/explosion5.bmp",
-              "images/explosion6.bmp",
-              "images/explosion7.bmp",
-              "images/explosion8.bmp",
-              "images/explosion9.bmp"]
+    __slots__ = ()
+    layer = "effects"
+    sound = games.LazyAsset(games.load_sound, "sounds/explosion.wav")
+    # explosion1.bmp was never shown (old livewires animations skipped
+    # their first frame); explosions look as they always have
+    images = games.assets.handle("animation",
+                                 ["images/explosion2.bmp",
+                                  "images/explosion3.bmp",
+                                  "images/explosion4.bmp",
+                                  "images/explosion5.bmp",
+                                  "images/explosion6.bmp",
+                                  "images/explosion7.bmp",
+                                  "images/explosion8.bmp",
+                                  "images/explosion9.bmp"])
 
     def __init__(self, x, y):
         super(Explosion, self).__init__(images=Explosion.images,
                                         x=x, y=y,
                                         repeat_interval=2, n_repeats=1,
                                         is_collideable=False)
-        Explosion.sound.play()
+        games.audio.play(Explosion.sound)
+
+    def on_acquire(self, x, y):
+        """ Reuse a finished explosion taken from the pool """
+        self.image = self._restart(Explosion.images, 1)
+        self._revive(x=x, y=y)
+        games.audio.play(Explosion.sound)
+
+
+# explosions come in bursts; keep enough around for a chain of them
+Explosion.pool = games.Pool(Explosion, max_size=64)
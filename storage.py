@@ -0,0 +1,220 @@
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _locked(path):
+    """ Hold an exclusive lock on the lock file while the block runs """
+    with open(path, "a+") as lock:
+        if fcntl:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            # msvcrt locks a byte range; lock the first byte of the file
+            lock.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds, keep waiting
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _parse(line):
+    """ Return (name, score) of a "NAME SCORE" line, or None """
+    parts = line.split()
+    if len(parts) != 2:
+        return None
+    try:
+        return parts[0], int(parts[1])
+    except ValueError:
+        return None
+
+
+class ScoreStore(object):
+    """ High scores kept in an append-only log with a top-K index.
+
+    The log (<path>.log) holds one "NAME SCORE" line per game, the same
+    format as the old scores.txt. The index (<path>.idx) holds the best
+    top_k scores and the log offset it covers, so reading the table and
+    adding a score never scan the log. The log keeps every score ever
+    added unless it is compacted: compact() rewrites it to its best
+    retain rows and moves the others to <path>.archive, and with
+    compact_rows set that happens by itself once the log is longer.
+    Compacting reads the whole log, so leave compact_rows off where
+    add() has to be fast.
+
+    All reads and writes hold a lock on <path>.lock, so several game
+    instances can share one database. An index that is missing or behind
+    the log (another writer crashed, the log was edited by hand) is
+    brought up to date from the log.
+    """
+    def __init__(self, path, top_k=10, compact_rows=None, retain=1000,
+                 legacy=None):
+        """ Open the store; import legacy scores if the store is new """
+        self.log_path = path + ".log"
+        self.index_path = path + ".idx"
+        self.lock_path = path + ".lock"
+        self.archive_path = path + ".archive"
+        self.top_k = top_k
+        self.compact_rows = compact_rows
+        self.retain = max(retain, top_k)
+        if legacy and os.path.exists(legacy):
+            with _locked(self.lock_path):
+                # another instance may have imported it while we waited
+                if not os.path.exists(self.log_path) and \
+                   not os.path.exists(self.index_path):
+                    self._import_text(legacy)
+
+    def add(self, name, score):
+        """ Append a score and update the index """
+        name = "".join(name.split()) or "PLAYER"
+        line = "%s %d\n" % (name, int(score))
+        with _locked(self.lock_path):
+            index = self._current_index()
+            with open(self.log_path, "ab") as log:
+                log.write(line.encode("ascii", "replace"))
+                index["offset"] = log.tell()
+            index["rows"] += 1
+            index["top"] = self._merge(index["top"], [(name, int(score))])
+            index = self._maybe_compact(index)
+            self._write_index(index)
+
+    def top(self, n=3):
+        """ Return the best n scores as [name, score] pairs, best first """
+        with _locked(self.lock_path):
+            index = self._current_index()
+            if index["stale"]:
+                self._write_index(index)
+        return [list(entry) for entry in index["top"][:n]]
+
+    def import_text(self, filename):
+        """ Append the rows of an old scores.txt file to the log """
+        with _locked(self.lock_path):
+            self._import_text(filename)
+
+    def compact(self):
+        """
+        Rewrite the log to its best retain rows, moving the others to
+        the archive
+        """
+        with _locked(self.lock_path):
+            self._write_index(self._compact(self._current_index()))
+
+    def _import_text(self, filename):
+        """ Append the rows of an old scores.txt file (lock held) """
+        index = self._current_index()
+        entries = []
+        with open(filename) as source:
+            for line in source:
+                entry = _parse(line)
+                if entry is not None:
+                    entries.append(entry)
+        with open(self.log_path, "ab") as log:
+            log.write("".join("%s %d\n" % entry for entry in entries)
+                      .encode("ascii", "replace"))
+            index["offset"] = log.tell()
+        index["rows"] += len(entries)
+        index["top"] = self._merge(index["top"], entries)
+        index = self._maybe_compact(index)
+        self._write_index(index)
+
+    def _maybe_compact(self, index):
+        """ Compact if compact_rows is set and exceeded (lock held) """
+        if self.compact_rows is not None and index["rows"] > self.compact_rows:
+            return self._compact(index)
+        return index
+
+    def _merge(self, top, entries):
+        """ Return top with entries merged in, cut to top_k """
+        merged = list(top)
+        merged.extend(entries)
+        # sorted() is stable, so earlier entries win ties as before
+        merged = sorted(merged, key=lambda entry: entry[1], reverse=True)
+        return [tuple(entry) for entry in merged[:self.top_k]]
+
+    def _current_index(self):
+        """ Read the index and catch it up with the log (lock held) """
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            index["top"] = [tuple(entry) for entry in index["top"]]
+            index["offset"], index["rows"]
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            index = {"offset": 0, "rows": 0, "top": []}
+        index["stale"] = False
+
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+        if index["offset"] > size:
+            # the log was replaced behind our back, start over
+            index = {"offset": 0, "rows": 0, "top": [], "stale": True}
+        if index["offset"] < size:
+            index["stale"] = True
+            with open(self.log_path, "rb") as log:
+                log.seek(index["offset"])
+                for line in log:
+                    if not line.endswith(b"\n"):
+                        break   # half-written row, read it next time
+                    index["offset"] += len(line)
+                    entry = _parse(line.decode("ascii", "replace"))
+                    if entry is not None:
+                        index["rows"] += 1
+                        index["top"] = self._merge(index["top"], [entry])
+        return index
+
+    def _compact(self, index):
+        """
+        Rewrite the log to its best retain rows, appending the rest to
+        the archive (lock held)
+        """
+        rows = []
+        if os.path.exists(self.log_path):
+            with open(self.log_path) as log:
+                for line in log:
+                    entry = _parse(line)
+                    if entry is not None:
+                        rows.append(entry)
+        rows = sorted(rows, key=lambda entry: entry[1], reverse=True)
+        best = rows[:self.retain]
+        if len(rows) > self.retain:
+            # archived first: if we stop half way, rows are kept twice,
+            # never lost
+            with open(self.archive_path, "a") as archive:
+                for entry in rows[self.retain:]:
+                    archive.write("%s %d\n" % entry)
+        temp = self.log_path + ".tmp"
+        with open(temp, "w") as log:
+            for entry in best:
+                log.write("%s %d\n" % entry)
+        os.replace(temp, self.log_path)
+        return {"offset": os.path.getsize(self.log_path),
+                "rows": len(best),
+                "top": [tuple(entry) for entry in best[:self.top_k]],
+                "stale": True}
+
+    def _write_index(self, index):
+        """ Replace the index file in one step (lock held) """
+        temp = self.index_path + ".tmp"
+        with open(temp, "w") as f:
+            json.dump({"offset": index["offset"],
+                       "rows": index["rows"],
+                       "top": index["top"]}, f)
+        os.replace(temp, self.index_path)
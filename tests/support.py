@@ -0,0 +1,33 @@
+"""
+Shared set-up for the tests: the game's modules on sys.path and one
+headless Screen for the whole run (livewires allows one per process).
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "requirements", "livewires")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+# the game loads its images and sounds relative to its own directory
+os.chdir(ROOT)
+
+from livewires import games
+
+
+def init_screen():
+    """ The game's Screen, headless, opened on first use """
+    import screen
+    if not games.Screen.initialized:
+        screen.init(headless=True)
+    return games.screen
+
+
+def reset_screen():
+    """ An empty Screen, as the game's own init leaves it """
+    init_screen()
+    games.screen.clear()
+    games.screen.cell_size = 64
+    games.screen.vectorize = False
+    games.screen.mask_collisions = True
+    return games.screen
@@ -0,0 +1,109 @@
+"""
+Tests for playing animations (games.FrameSequence and games.Animation).
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+def frames(n):
+    return [pygame.Surface((10 + i, 10)) for i in range(n)]
+
+
+class FrameSequenceTest(unittest.TestCase):
+
+    def test_loop_timeline_follows_the_durations(self):
+        a, b, c = frames(3)
+        sequence = games.FrameSequence([a, b, c], durations=(1, 3, 2))
+        self.assertEqual(sequence._timeline, (a, b, b, b, c, c))
+        self.assertEqual(sequence.n_ticks, 6)
+        self.assertEqual(sequence.frames, (a, b, c))
+        self.assertEqual((len(sequence), sequence[1]), (3, b))
+        self.assertEqual(sequence.mode, "loop")
+
+    def test_frames_are_taken_from_another_sequence(self):
+        sequence = games.FrameSequence(frames(2))
+        again = games.FrameSequence(sequence, mode="pingpong")
+        self.assertIs(again.frames, sequence.frames)
+
+    def test_pingpong_turns_at_the_ends(self):
+        a, b, c, d = frames(4)
+        sequence = games.FrameSequence([a, b, c, d], mode="pingpong")
+        self.assertEqual(sequence._timeline, (a, b, c, d, c, b))
+        single = games.FrameSequence([a], mode="pingpong")
+        self.assertEqual(single._timeline, (a,))
+
+    def test_bad_sequences_are_refused(self):
+        self.assertRaises(games.GamesError, games.FrameSequence, [])
+        self.assertRaises(games.GamesError, games.FrameSequence,
+                          frames(2), durations=(1, 0))
+        self.assertRaises(games.GamesError, games.FrameSequence,
+                          frames(2), durations=(1,))
+        self.assertRaises(games.GamesError, games.FrameSequence,
+                          frames(2), mode="backwards")
+
+
+class AnimationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def play(self, animation, ticks):
+        """ The frame shown after adding it and after each tick """
+        frames = animation._sequence.frames
+        self.screen.add(animation)
+        shown = [frames.index(animation.image)]
+        for tick in range(ticks):
+            self.screen.mainloop(max_ticks=1)
+            if animation.handle:
+                shown.append(frames.index(animation.image))
+            else:
+                shown.append(None)
+        return shown
+
+    def test_animations_share_their_sequence(self):
+        sequence = games.FrameSequence(frames(2))
+        first = games.Animation(images=sequence)
+        second = games.Animation(images=sequence)
+        self.assertIs(first.images, second.images)
+
+    def test_forever_wraps_around(self):
+        animation = games.Animation(images=frames(3), n_repeats=0)
+        self.assertEqual(self.play(animation, 7), [0, 1, 2, 0, 1, 2, 0, 1])
+        self.assertEqual(animation.n_repeats, -1)
+
+    def test_stops_after_n_cycles(self):
+        sequence = games.FrameSequence(frames(2), durations=(2, 1))
+        animation = games.Animation(images=sequence, n_repeats=2)
+        self.assertEqual(self.play(animation, 7),
+                         [0, 0, 1, 0, 0, 1, None, None])
+        self.assertEqual(animation.handle, 0)
+        self.assertIsNone(animation.next_image())
+
+    def test_pingpong_plays_back_and_forth(self):
+        sequence = games.FrameSequence(frames(3), mode="pingpong")
+        animation = games.Animation(images=sequence, n_repeats=1)
+        self.assertEqual(self.play(animation, 5), [0, 1, 2, 1, None, None])
+
+    def test_explosions_show_frames_two_to_nine(self):
+        from screen import Explosion
+        sequence = Explosion.images.get()
+        self.assertEqual(len(sequence), 8)
+        self.assertIs(sequence[0],
+                      games.load_image("images/explosion2.bmp"))
+        self.assertIs(sequence[-1],
+                      games.load_image("images/explosion9.bmp"))
+        # two ticks a frame, then gone
+        expected = [index for index in range(8) for tick in (0, 1)]
+        self.assertEqual(self.play(Explosion(x=10, y=10), 18),
+                         expected + [None] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
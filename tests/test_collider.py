@@ -0,0 +1,54 @@
+"""
+Tests for collisions between the game's sprites (screen.Collider).
+"""
+import unittest
+
+import support
+from livewires import games
+
+
+class ColliderTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+        from game import Game
+        self.game = Game(scores=None, spawn_budget=None)
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_hit_sprites_taken_out_earlier_in_the_loop_are_skipped(self):
+        from interface import Asteroid, Missile
+        ship = self.game.ship
+        asteroid = Asteroid.pool.acquire(game=self.game, x=ship.x, y=ship.y,
+                                         size=Asteroid.LARGE, lifes=1)
+        games.screen.add(asteroid)
+        missile = Missile.pool.acquire(ship.x, ship.y, 0)
+        missile.position = ship.position
+        games.screen.add(missile)
+        # hits come in handle order: the ship ends the game, which takes
+        # the asteroid off the screen and back to its pool first
+        self.assertEqual(missile.overlapping_sprites, [ship, asteroid])
+        missile.update()
+        self.assertEqual(ship.handle, 0)
+        self.assertEqual(asteroid.handle, 0)
+        self.assertEqual(missile.handle, 0)
+        self.assertEqual(self.game.score.value, 0)
+
+    def test_hit_sprites_lose_a_life(self):
+        from interface import Asteroid, Missile
+        ship = self.game.ship
+        asteroid = Asteroid.pool.acquire(game=self.game, x=100, y=100,
+                                         size=Asteroid.LARGE, lifes=3)
+        games.screen.add(asteroid)
+        missile = Missile.pool.acquire(ship.x, ship.y, 0)
+        missile.position = asteroid.position
+        games.screen.add(missile)
+        missile.update()
+        self.assertEqual(asteroid.lifes, 2)
+        self.assertNotEqual(asteroid.handle, 0)
+        self.assertEqual(missile.handle, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
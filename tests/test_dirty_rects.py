@@ -0,0 +1,70 @@
+"""
+Tests for merging the dirty rectangles of a frame (games._coalesce_rects).
+"""
+import random
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+def area(rects):
+    return sum(rect.width * rect.height for rect in rects)
+
+
+class CoalesceRectsTest(unittest.TestCase):
+
+    def test_every_rect_is_covered(self):
+        rng = random.Random(1)
+        for trial in range(300):
+            rects = [pygame.Rect(rng.randint(-20, 620), rng.randint(-20, 460),
+                                 rng.randint(0, 80), rng.randint(0, 80))
+                     for i in range(rng.randint(1, 40))]
+            merged = games._coalesce_rects(rects)
+            for rect in rects:
+                if rect.width and rect.height:
+                    self.assertTrue(any(other.contains(rect)
+                                        for other in merged), rect)
+            # merging never pushes more pixels than the rects themselves
+            self.assertLessEqual(area(merged), area(rects))
+
+    def test_touching_rects_merge(self):
+        merged = games._coalesce_rects([pygame.Rect(0, 0, 10, 10),
+                                        pygame.Rect(10, 0, 10, 10)])
+        self.assertEqual(merged, [pygame.Rect(0, 0, 20, 10)])
+
+    def test_overlapping_copies_merge(self):
+        rect = pygame.Rect(5, 5, 30, 30)
+        self.assertEqual(games._coalesce_rects([rect, rect, rect]), [rect])
+
+    def test_merges_cascade(self):
+        rects = [pygame.Rect(x, 0, 10, 10) for x in (40, 0, 20, 30, 10)]
+        self.assertEqual(games._coalesce_rects(rects),
+                         [pygame.Rect(0, 0, 50, 10)])
+
+    def test_distant_rects_stay_apart(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(100, 100, 10, 10)]
+        self.assertEqual(sorted(games._coalesce_rects(rects)), sorted(rects))
+
+    def test_diagonal_neighbours_that_would_grow_stay_apart(self):
+        # their union is 40x40, far more than the two 20x20 rects
+        rects = [pygame.Rect(0, 0, 20, 20), pygame.Rect(20, 20, 20, 20)]
+        self.assertEqual(sorted(games._coalesce_rects(rects)), sorted(rects))
+
+    def test_empty_rects_are_dropped(self):
+        self.assertEqual(games._coalesce_rects([pygame.Rect(5, 5, 0, 10),
+                                                pygame.Rect(5, 5, 10, 0)]),
+                         [])
+        self.assertEqual(games._coalesce_rects([]), [])
+
+    def test_input_is_left_alone(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 0, 10, 10)]
+        games._coalesce_rects(rects)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 10, 10),
+                                 pygame.Rect(5, 0, 10, 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
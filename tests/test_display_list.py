@@ -0,0 +1,117 @@
+"""
+Tests for the layered drawing order (games.DisplayList).
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+class DisplayListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = games.DisplayList(("back", "middle", "front"))
+
+    def add(self, *names, **options):
+        for name in names:
+            self.objects.add(name, **options)
+
+    def test_layers_are_drawn_bottom_first(self):
+        self.add("a", "b", layer="front")
+        self.add("c", "d", layer="back")
+        self.add("e", layer="middle")
+        self.add("f")
+        self.assertEqual(self.objects.order(),
+                         ("c", "d", "f", "e", "a", "b"))
+        self.assertEqual(self.objects.sprites("back"), ("c", "d", "f"))
+        self.assertEqual(self.objects.layer_of("f"), "back")
+        self.assertEqual(self.objects.layers, ("back", "middle", "front"))
+
+    def test_adding_again_moves_to_the_top_of_the_new_layer(self):
+        self.add("a", "b", "c", layer="middle")
+        self.add("x", layer="front")
+        self.objects.add("a", layer="front")
+        self.objects.add("b", layer="middle")
+        self.assertEqual(self.objects.order(), ("c", "b", "x", "a"))
+        self.assertEqual(len(self.objects), 4)
+
+    def test_elevate_and_lower_stay_in_the_layer(self):
+        self.add("a", "b", "c", "d", layer="middle")
+        self.add("x", layer="front")
+        self.add("y", layer="back")
+        self.objects.elevate("a")
+        self.assertEqual(self.objects.sprites("middle"), ("b", "c", "d", "a"))
+        self.objects.lower("d")
+        self.assertEqual(self.objects.sprites("middle"), ("d", "b", "c", "a"))
+        self.objects.elevate("d", above="b")
+        self.assertEqual(self.objects.sprites("middle"), ("b", "d", "c", "a"))
+        self.objects.lower("a", below="d")
+        self.assertEqual(self.objects.sprites("middle"), ("b", "a", "d", "c"))
+        self.assertEqual(self.objects.order(),
+                         ("y", "b", "a", "d", "c", "x"))
+
+    def test_no_stacking_across_layers(self):
+        self.add("a", layer="middle")
+        self.add("x", layer="front")
+        self.assertRaises(games.GamesError, self.objects.elevate, "a", "x")
+        self.assertRaises(games.GamesError, self.objects.lower, "a", "x")
+
+    def test_remove(self):
+        self.add("a", "b", "c")
+        self.assertTrue(self.objects.remove("b"))
+        self.assertFalse(self.objects.remove("b"))
+        self.assertNotIn("b", self.objects)
+        self.assertEqual(self.objects.order(), ("a", "c"))
+        self.objects.clear()
+        self.assertEqual((self.objects.order(), len(self.objects)), ((), 0))
+
+    def test_order_is_kept_until_it_changes(self):
+        self.add("a", "b")
+        order = self.objects.order()
+        self.assertIs(self.objects.order(), order)
+        self.add("c")
+        self.assertEqual(order, ("a", "b"))
+        self.assertEqual(self.objects.order(), ("a", "b", "c"))
+
+    def test_layers_must_exist(self):
+        self.assertRaises(games.GamesError, self.objects.add, "a", "nowhere")
+        self.assertRaises(games.GamesError, games.DisplayList, ())
+
+
+class ScreenLayersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_sprites_go_in_their_class_layer(self):
+        import screen
+        from interface import Asteroid, Missile
+        from game import Game
+        game = Game(scores=None, spawn_budget=None)
+        asteroid = Asteroid.pool.acquire(game=game, x=10, y=10,
+                                         size=Asteroid.SMALL, lifes=1)
+        missile = Missile.pool.acquire(10, 10, 0)
+        explosion = screen.Explosion.pool.acquire(x=10, y=10)
+        plain = games.Sprite(image=pygame.Surface((5, 5)))
+        for sprite in (missile, explosion, asteroid, plain):
+            self.screen.add(sprite)
+        hud = games.Text(value="top", size=20, color=(0, 0, 0))
+        self.screen.add(hud, layer="effects")
+        self.assertEqual(self.screen.layers, screen.LAYERS)
+        # effects, asteroids, projectiles, ship, hud
+        self.assertEqual(self.screen.all_objects,
+                         [explosion, plain, hud, asteroid, missile,
+                          game.ship, game.score])
+        hud.lower()
+        plain.elevate()
+        self.assertEqual(self.screen.all_objects[:3],
+                         [hud, explosion, plain])
+
+
+if __name__ == "__main__":
+    unittest.main()
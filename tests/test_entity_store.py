@@ -0,0 +1,107 @@
+"""
+Tests for the numpy entity store (games.EntityStore), which moves and
+wraps sprites in one step per tick.
+"""
+import random
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+TICKS = 120
+
+
+def make_sprites(seed):
+    from screen import Wrapper
+    rng = random.Random(seed)
+    sprites = []
+    for i in range(150):
+        image = pygame.Surface((rng.randint(1, 80), rng.randint(1, 80)))
+        # some faster than they are wide, some standing still
+        speed = rng.choice((0, 0.5, 3, 25, 90))
+        cls = Wrapper if i % 5 else games.Sprite
+        sprites.append(cls(image=image,
+                           x=rng.uniform(-40, 680), y=rng.uniform(-40, 520),
+                           dx=rng.uniform(-speed, speed),
+                           dy=rng.uniform(-speed, speed)))
+    return sprites
+
+
+@unittest.skipIf(games.numpy is None, "the entity store needs numpy")
+class EntityStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+        games.screen.vectorize = False
+
+    def play(self, vectorize):
+        """ Every sprite's position and rectangle after every tick """
+        self.screen.clear()
+        self.screen.vectorize = vectorize
+        sprites = make_sprites(1)
+        for sprite in sprites:
+            self.screen.add(sprite)
+        states = []
+        for tick in range(TICKS):
+            if tick == 40:
+                # velocities set by the game go through to the store
+                for sprite in sprites[::7]:
+                    sprite.velocity = (-sprite.dx, sprite.dy * 2)
+            if tick == 60:
+                # removing moves other sprites into the freed slots
+                for sprite in sprites[3::11]:
+                    sprite.destroy()
+            if tick == 80:
+                for sprite in sprites[1::13]:
+                    sprite.position = (320, 240)
+            self.screen.mainloop(max_ticks=1)
+            states.append([(sprite.x, sprite.y, tuple(sprite._rect))
+                           for sprite in sprites if sprite.handle])
+        return sprites, states
+
+    def test_same_moves_as_the_sprites_make_themselves(self):
+        sprites, expected = self.play(vectorize=False)
+        self.assertFalse(any(sprite.is_vectorized for sprite in sprites))
+        sprites, states = self.play(vectorize=True)
+        self.assertTrue(all(sprite.is_vectorized == sprite.wraps
+                            for sprite in sprites if sprite.handle))
+        for tick, (state, expected_state) in enumerate(zip(states,
+                                                           expected)):
+            self.assertEqual(state, expected_state, "tick %d" % tick)
+
+    def test_grid_follows_vectorized_sprites(self):
+        sprites, states = self.play(vectorize=True)
+        live = sorted([sprite for sprite in sprites if sprite.handle],
+                      key=lambda sprite: sprite.handle)
+        for sprite in live:
+            self.assertEqual(self.screen.overlapping_objects(sprite._rect),
+                             [other for other in live
+                              if other._rect.colliderect(sprite._rect)])
+
+    def test_store_follows_added_and_removed_sprites(self):
+        self.screen.vectorize = True
+        store = self.screen._store
+        sprites = make_sprites(2)
+        for sprite in sprites:
+            self.screen.add(sprite)
+        wrapping = [sprite for sprite in sprites if sprite.wraps]
+        self.assertEqual(len(store), len(wrapping))
+        for sprite in wrapping[::2]:
+            sprite.destroy()
+        self.assertEqual(len(store), len(wrapping[1::2]))
+        for sprite in wrapping[1::2]:
+            slot = sprite._slot
+            self.assertIs(store._sprites[slot], sprite)
+            self.assertEqual((store.x[slot], store.y[slot]),
+                             (sprite.x, sprite.y))
+        self.screen.vectorize = False
+        self.assertFalse(any(sprite.is_vectorized for sprite in sprites))
+
+
+if __name__ == "__main__":
+    unittest.main()
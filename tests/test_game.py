@@ -0,0 +1,36 @@
+"""
+Tests for the game itself (game.Game).
+"""
+import unittest
+
+import support
+from livewires import games
+
+
+class GameTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def texts(self):
+        return [sprite.value for sprite in games.screen.all_objects
+                if isinstance(sprite, games.Text)]
+
+    def test_game_over_without_top_scores_shows_the_final_score(self):
+        from game import Game
+        from interface import Scores
+        game = Game(scores=None, spawn_budget=None)
+        game.score.value = 120
+        game.end()
+        # "Game over" stays up for a second, then the records screen
+        games.screen.mainloop(max_ticks=games.screen.fps + 2)
+        self.assertIn("Your score: 120", self.texts())
+        self.assertFalse([sprite for sprite in games.screen.all_objects
+                          if isinstance(sprite, Scores)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for recycling destroyed sprites (games.Pool) and the game's pools.
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+class Counter(games.Sprite):
+    """ A sprite that counts its ticks and its trips through a pool """
+    __slots__ = ("ticks", "released")
+
+    def __init__(self, x, y):
+        super(Counter, self).__init__(image=pygame.Surface((10, 10)),
+                                      x=x, y=y)
+        self.ticks = 0
+        self.released = 0
+
+    def on_acquire(self, x, y):
+        self._revive(x=x, y=y)
+        self.ticks = 0
+
+    def on_release(self):
+        self.released += 1
+
+    def tick(self):
+        self.ticks += 1
+
+
+class PoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+        self.pool = games.Pool(Counter, max_size=2)
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_destroyed_sprites_are_reused(self):
+        sprite = self.pool.acquire(x=10, y=20)
+        self.assertEqual((self.pool.misses, self.pool.live), (1, 1))
+        self.screen.add(sprite)
+        sprite.destroy()
+        self.assertEqual(sprite.released, 1)
+        self.assertEqual(self.pool.stats()["free"], 1)
+        again = self.pool.acquire(x=30, y=40)
+        self.assertIs(again, sprite)
+        self.assertEqual((self.pool.hits, self.pool.live), (1, 1))
+        self.assertEqual(again.position, (30, 40))
+        self.assertEqual(again.handle, 0)
+        self.screen.add(again)
+        self.assertIs(self.screen.get(again.handle), again)
+
+    def test_destroying_twice_releases_once(self):
+        sprite = self.pool.acquire(x=10, y=20)
+        self.screen.add(sprite)
+        sprite.destroy()
+        sprite.destroy()
+        self.assertEqual(sprite.released, 1)
+        self.assertEqual(self.pool.stats()["free"], 1)
+        self.assertIsNot(self.pool.acquire(x=0, y=0),
+                         self.pool.acquire(x=0, y=0))
+
+    def test_only_max_size_are_kept(self):
+        sprites = [self.pool.acquire(x=i, y=i) for i in range(4)]
+        for sprite in sprites:
+            sprite.destroy()
+        self.assertEqual(self.pool.stats()["free"], 2)
+        self.assertEqual(self.pool.discarded, 2)
+        self.pool.max_size = 1
+        self.assertEqual(self.pool.stats()["free"], 1)
+        self.pool.clear()
+        self.assertEqual(self.pool.stats()["free"], 0)
+
+    def test_destroyed_and_reused_in_the_same_tick(self):
+        sprite = self.pool.acquire(x=10, y=20)
+        self.screen.add(sprite)
+        other = Counter(x=50, y=50)
+        self.screen.add(other)
+        old_handle = sprite.handle
+        reused = []
+
+        def recycle():
+            sprite.destroy()
+            again = self.pool.acquire(x=100, y=100)
+            self.screen.add(again)
+            reused.append(again)
+
+        self.screen.add_tick_handler(recycle)
+        try:
+            self.screen.mainloop(max_ticks=1)
+        finally:
+            self.screen.remove_tick_handler(recycle)
+        self.assertEqual(reused, [sprite])
+        # back on the Screen under a new handle, once, and still ticking
+        self.assertIsNone(self.screen.get(old_handle))
+        self.assertIs(self.screen.get(sprite.handle), sprite)
+        self.assertEqual(self.screen.all_objects.count(sprite), 1)
+        self.assertEqual(self.screen.overlapping_objects(sprite._rect),
+                         [sprite])
+        self.screen.mainloop(max_ticks=2)
+        self.assertEqual(sprite.ticks, 2)
+        self.assertEqual(other.ticks, 3)
+
+
+class GamePoolsTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+        from game import Game
+        self.game = Game(scores=None, spawn_budget=None)
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_reused_asteroids_are_like_new_ones(self):
+        from interface import Asteroid
+        asteroid = Asteroid.pool.acquire(game=self.game, x=100, y=100,
+                                         size=Asteroid.LARGE, lifes=3)
+        games.screen.add(asteroid)
+        asteroid.totally_die()
+        self.assertIsNone(asteroid.game)
+        again = Asteroid.pool.acquire(game=self.game, x=200, y=200,
+                                      size=Asteroid.SMALL, lifes=1)
+        self.assertIs(again, asteroid)
+        self.assertIs(again.game, self.game)
+        self.assertEqual((again.size, again.lifes), (Asteroid.SMALL, 1))
+        self.assertIs(again.image, Asteroid.images[Asteroid.SMALL])
+        self.assertEqual(again.position, (200, 200))
+
+    def test_reused_missiles_are_like_new_ones(self):
+        from interface import Missile
+        missile = Missile.pool.acquire(100, 100, 0)
+        games.screen.add(missile)
+        missile.lifetime = 1
+        games.screen.mainloop(max_ticks=1)
+        self.assertEqual(missile.handle, 0)
+        again = Missile.pool.acquire(100, 100, 90)
+        self.assertIs(again, missile)
+        self.assertEqual((again.lifes, again.lifetime),
+                         (1, Missile.LIFETIME))
+        self.assertEqual(again.angle, 0)
+        self.assertAlmostEqual(again.dx, Missile.VELOCITY_FACTOR)
+        self.assertAlmostEqual(again.dy, 0)
+
+    def test_finished_explosions_go_back_to_the_pool(self):
+        from screen import Explosion
+        explosion = Explosion.pool.acquire(x=100, y=100)
+        games.screen.add(explosion)
+        games.screen.mainloop(max_ticks=20)
+        self.assertEqual(explosion.handle, 0)
+        again = Explosion.pool.acquire(x=50, y=60)
+        self.assertIs(again, explosion)
+        self.assertIs(again.image, Explosion.images.get()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for recording input and replaying it (games.InputRecorder and
+games.InputReplay).
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import support
+from livewires import games
+
+TICKS = 300
+
+
+def fly_and_fire(tick):
+    keys = {games.K_SPACE}
+    if tick % 120 < 40:
+        keys.add(games.K_LEFT)
+    if tick % 200 < 30:
+        keys.add(games.K_UP)
+    return keys
+
+
+class ScriptedRecorder(games.InputRecorder):
+    """ Records the keys a script holds down """
+
+    def __init__(self, filename, script, **options):
+        games.InputRecorder.__init__(self, filename, **options)
+        self.script = script
+        self.tick = 0
+
+    def _poll(self):
+        keys = games.KeySet(self.script(self.tick))
+        self.tick += 1
+        return keys
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.rec")
+        self.keyboard = games.keyboard
+
+    def tearDown(self):
+        games.keyboard = self.keyboard
+        games.screen.clear()
+        shutil.rmtree(self.directory)
+
+    def play(self, keyboard, max_ticks=None):
+        """ A fresh game played with this keyboard; returns the ticks run """
+        from game import Game
+        from interface import Asteroid
+        games.screen.clear()
+        Asteroid.total = 0
+        games.keyboard = keyboard
+        random.seed(keyboard.seed)
+        game = Game(scores=None, spawn_budget=None)
+        game.advance()
+        start = games.screen.ticks
+        try:
+            games.screen.mainloop(max_ticks)
+        finally:
+            game.spawner.cancel()
+        return games.screen.ticks - start
+
+    def record(self, ticks=TICKS, **options):
+        recorder = ScriptedRecorder(self.path, fly_and_fire, seed=7,
+                                    checksum_interval=10, **options)
+        played = self.play(recorder, max_ticks=ticks)
+        recorder.close()
+        return played, games.state_checksum(games.screen._objects)
+
+    def test_replay_matches_the_recording(self):
+        recorded, state = self.record()
+        replay = games.InputReplay(self.path)
+        self.assertEqual((replay.seed, replay.end_tick), (7, TICKS))
+        # the replay stops by itself at the end of the recording
+        replayed = self.play(replay, max_ticks=TICKS * 2)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(replay.divergences, [])
+        self.assertEqual(replay.checked, TICKS // 10 + 1)
+        self.assertEqual(games.state_checksum(games.screen._objects), state)
+
+    def test_a_different_game_diverges(self):
+        from interface import Ship
+        self.record()
+        replay = games.InputReplay(self.path)
+        step = Ship.VELOCITY_STEP
+        Ship.VELOCITY_STEP = step * 2
+        try:
+            self.play(replay, max_ticks=TICKS * 2)
+        finally:
+            Ship.VELOCITY_STEP = step
+        self.assertTrue(replay.divergences)
+        tick, recorded, replayed = replay.divergences[0]
+        self.assertNotEqual(recorded, replayed)
+
+    def test_typed_text_is_replayed(self):
+        recorder = ScriptedRecorder(self.path, lambda tick: (), seed=1)
+        typed = []
+        recorder._key_down(games.K_a, "a")
+        self.play(recorder, max_ticks=3)
+        recorder.close()
+        replay = games.InputReplay(self.path)
+        replay._begin_tick()
+        typed.append((replay.text, replay.was_pressed(games.K_a)))
+        replay._begin_tick()
+        typed.append((replay.text, replay.was_pressed(games.K_a)))
+        self.assertEqual(typed, [("a", True), ("", False)])
+
+    def test_other_files_are_refused(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a recording at all, just some bytes")
+        self.assertRaises(games.GamesError, games.InputReplay, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Tests for the shared cache of rotated surfaces and their collision masks
+(games.RotationCache).
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+def surface(width=10, height=20):
+    image = pygame.Surface((width, height))
+    image.fill((255, 255, 255))
+    return image
+
+
+def corner(size=20):
+    """ A black surface, transparent by colorkey, with a white corner """
+    image = pygame.Surface((size, size))
+    image.fill((0, 0, 0))
+    image.fill((255, 255, 255), (0, 0, size // 4, size // 4))
+    image.set_colorkey((0, 0, 0))
+    return image
+
+
+def rotated_bytes(image, angle):
+    return games._surface_bytes(pygame.transform.rotate(image, -angle))
+
+
+class RotationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        support.init_screen()
+
+    def test_rotates_clockwise(self):
+        cache = games.RotationCache()
+        image = surface(10, 20)
+        self.assertEqual(cache.rotate(image, 90).get_size(), (20, 10))
+        self.assertEqual(cache.rotate(image, 45).get_size(),
+                         pygame.transform.rotate(image, -45).get_size())
+
+    def test_no_rotation_is_the_surface_itself(self):
+        cache = games.RotationCache(resolution=5)
+        image = surface()
+        self.assertIs(cache.rotate(image, 0), image)
+        self.assertIs(cache.rotate(image, 360), image)
+        self.assertIs(cache.rotate(image, 2), image)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_angles_share_a_step(self):
+        cache = games.RotationCache(resolution=5)
+        image = surface()
+        self.assertIs(cache.rotate(image, 44), cache.rotate(image, 46))
+        self.assertIs(cache.rotate(image, -90), cache.rotate(image, 270))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_sprites_share_rotated_surfaces(self):
+        image = surface()
+        one = games.Sprite(image=image, angle=30)
+        other = games.Sprite(image=image, angle=30)
+        self.assertIs(one.image, other.image)
+        other.angle = 0
+        self.assertIs(other.image, image)
+
+    def test_least_recently_used_is_evicted_first(self):
+        image = surface()
+        size = rotated_bytes(image, 90)
+        cache = games.RotationCache(max_bytes=size * 2)
+        first = cache.rotate(image, 90)
+        cache.rotate(image, 180)
+        # using the first makes the second the oldest
+        self.assertIs(cache.rotate(image, 90), first)
+        cache.rotate(image, 270)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIs(cache.rotate(image, 90), first)
+        misses = cache.misses
+        cache.rotate(image, 180)
+        self.assertEqual(cache.misses, misses + 1)
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+
+    def test_bytes_add_up(self):
+        cache = games.RotationCache()
+        image = surface()
+        for angle in (10, 20, 90):
+            cache.rotate(image, angle)
+        self.assertEqual(cache.bytes,
+                         sum(rotated_bytes(image, angle)
+                             for angle in (10, 20, 90)))
+        cache.clear()
+        self.assertEqual(cache.bytes, 0)
+
+    def test_smaller_budget_trims_at_once(self):
+        cache = games.RotationCache()
+        image = surface()
+        for angle in range(1, 50):
+            cache.rotate(image, angle)
+        cache.max_bytes = rotated_bytes(image, 49)
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.bytes, rotated_bytes(image, 49))
+
+    def test_keeps_the_newest_surface_even_over_budget(self):
+        cache = games.RotationCache(max_bytes=1)
+        image = surface()
+        rotated = cache.rotate(image, 45)
+        self.assertIs(cache.rotate(image, 45), rotated)
+
+    def test_prebake_fills_every_step(self):
+        cache = games.RotationCache(resolution=1)
+        image = surface()
+        cache.prebake(image, 5)
+        self.assertEqual(cache.stats()["entries"], 360 // 5 - 1)
+        cache.rotate(image, 90)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+
+class MaskTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_masks_are_made_once(self):
+        cache = games.RotationCache()
+        image = corner()
+        mask = cache.mask(image)
+        self.assertIs(cache.mask(image), mask)
+        self.assertEqual(cache.stats()["masks"], 1)
+        self.assertEqual(cache.bytes, games._mask_bytes(mask))
+
+    def test_transparent_pixels_are_left_out(self):
+        cache = games.RotationCache()
+        self.assertEqual(cache.mask(corner(20)).count(), 25)
+        self.assertEqual(cache.mask(surface(10, 20)).count(), 200)
+
+    def test_rotated_surfaces_have_their_own_mask(self):
+        cache = games.RotationCache()
+        image = corner(20)
+        rotated = cache.rotate(image, 90)
+        self.assertIsNot(cache.mask(rotated), cache.mask(image))
+        # the white corner turned from top left to top right
+        self.assertTrue(cache.mask(rotated).get_at((19, 0)))
+        self.assertFalse(cache.mask(rotated).get_at((0, 0)))
+
+    def test_evicting_a_rotation_drops_its_mask(self):
+        image = corner(20)
+        cache = games.RotationCache()
+        first = cache.rotate(image, 90)
+        cache.mask(first)
+        cache.max_bytes = rotated_bytes(image, 90)
+        cache.rotate(image, 180)
+        self.assertEqual(cache.stats()["masks"], 0)
+        self.assertEqual(cache.bytes, rotated_bytes(image, 180))
+
+    def test_masks_are_trimmed_to_the_budget(self):
+        cache = games.RotationCache()
+        images = [corner() for i in range(10)]
+        for image in images:
+            cache.mask(image)
+        cache.max_bytes = games._mask_bytes(cache.mask(images[-1])) * 3
+        self.assertEqual(cache.stats()["masks"], 3)
+        self.assertIs(cache.mask(images[-1]), cache.mask(images[-1]))
+
+    def test_only_opaque_pixels_collide(self):
+        screen = games.screen
+        # the white corners are at opposite ends: rectangles overlap,
+        # pixels don't
+        one = games.Sprite(image=corner(20), x=100, y=100)
+        other = games.Sprite(image=corner(20), angle=180, x=110, y=110)
+        touching = games.Sprite(image=corner(20), x=102, y=102)
+        for sprite in (one, other, touching):
+            screen.add(sprite)
+        stats = screen.collision_stats
+        self.assertEqual(one.overlapping_sprites, [touching])
+        self.assertFalse(one.overlaps(other))
+        self.assertTrue(one.overlaps(touching))
+        after = screen.collision_stats
+        self.assertEqual(after["candidates"] - stats["candidates"], 4)
+        self.assertEqual(after["confirmed"] - stats["confirmed"], 2)
+
+        screen.mask_collisions = False
+        self.assertEqual(one.overlapping_sprites, [other, touching])
+        self.assertTrue(one.overlaps(other))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for sprite handles (Screen.get) and for taking sprites off the
+Screen while it ticks.
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+class Ticker(games.Sprite):
+    """ A sprite that counts its ticks and can run a callback in them """
+    __slots__ = ("ticks", "action")
+
+    def __init__(self, x=10, y=10, action=None):
+        super(Ticker, self).__init__(image=pygame.Surface((10, 10)),
+                                     x=x, y=y)
+        self.ticks = 0
+        self.action = action
+
+    def tick(self):
+        self.ticks += 1
+        if self.action is not None:
+            self.action()
+
+
+class HandleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_handles_find_sprites_until_they_leave(self):
+        first, second = Ticker(), Ticker()
+        self.assertEqual(first.handle, 0)
+        self.screen.add(first)
+        self.screen.add(second)
+        self.assertTrue(0 < first.handle < second.handle)
+        self.assertIs(self.screen.get(first.handle), first)
+        self.assertIs(self.screen.get(second.handle), second)
+        handle = first.handle
+        first.destroy()
+        self.assertEqual(first.handle, 0)
+        self.assertIsNone(self.screen.get(handle))
+        self.assertIsNone(self.screen.get(0))
+        # removing it again is harmless
+        self.screen.remove(first)
+        self.assertEqual(self.screen.all_objects, [second])
+
+    def test_adding_again_moves_the_sprite(self):
+        first, second = Ticker(), Ticker()
+        self.screen.add(first)
+        self.screen.add(second)
+        handle = first.handle
+        self.screen.add(first)
+        self.assertIsNone(self.screen.get(handle))
+        self.assertIs(self.screen.get(first.handle), first)
+        self.assertTrue(first.handle > second.handle)
+        self.assertEqual(self.screen.all_objects, [second, first])
+        self.assertEqual(self.screen.overlapping_objects(first._rect),
+                         [second, first])
+
+    def test_all_objects_is_a_new_list(self):
+        sprite = Ticker()
+        self.screen.add(sprite)
+        objects = self.screen.all_objects
+        objects.append("not a sprite")
+        self.assertEqual(self.screen.all_objects, [sprite])
+
+
+class RemoveWhileTickingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_removed_sprites_are_skipped_then_swept(self):
+        seen = []
+        victim = Ticker(x=100, y=100)
+
+        def kill():
+            if victim.handle:
+                victim.destroy()
+                # gone for the rest of the tick, though not yet swept
+                seen.append((self.screen.all_objects,
+                             self.screen.overlapping_objects(victim._rect),
+                             victim in self.screen._objects))
+
+        killer = Ticker(action=kill)
+        self.screen.add(killer)
+        self.screen.add(victim)
+        self.screen.mainloop(max_ticks=1)
+        self.assertEqual(seen, [([killer], [], True)])
+        self.assertEqual(victim.ticks, 0)
+        self.assertNotIn(victim, self.screen._objects)
+        self.assertEqual(self.screen._doomed, [])
+        self.screen.mainloop(max_ticks=2)
+        self.assertEqual((killer.ticks, victim.ticks), (3, 0))
+
+    def test_removed_and_added_again_in_one_tick_stays(self):
+        sprite = Ticker()
+
+        def bounce():
+            if sprite.ticks == 1:
+                self.screen.remove(sprite)
+                self.screen.add(sprite)
+
+        sprite.action = bounce
+        self.screen.add(sprite)
+        self.screen.mainloop(max_ticks=1)
+        self.assertIs(self.screen.get(sprite.handle), sprite)
+        self.assertEqual(self.screen.all_objects, [sprite])
+        self.screen.mainloop(max_ticks=1)
+        self.assertEqual(sprite.ticks, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
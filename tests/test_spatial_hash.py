@@ -0,0 +1,168 @@
+"""
+Tests for the broadphase grid (games.SpatialHash) and the overlap
+queries the Screen answers with it.
+"""
+import random
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+def make_sprites(rng, count, cls=games.Sprite, speed=0):
+    sprites = []
+    for i in range(count):
+        image = pygame.Surface((rng.randint(1, 90), rng.randint(1, 90)))
+        sprites.append(cls(image=image,
+                           x=rng.randint(-50, 690), y=rng.randint(-50, 530),
+                           dx=rng.uniform(-speed, speed),
+                           dy=rng.uniform(-speed, speed)))
+    return sprites
+
+
+def random_rect(rng):
+    return pygame.Rect(rng.randint(-80, 680), rng.randint(-80, 520),
+                       rng.randint(0, 200), rng.randint(0, 200))
+
+
+def linear_scan(rect, sprites):
+    """ The sprites overlapping rect, in handle order, checked one by one """
+    return sorted([sprite for sprite in sprites
+                   if sprite.handle and sprite.is_collideable and
+                   rect.colliderect(sprite._rect)],
+                  key=lambda sprite: sprite.handle)
+
+
+class SpatialHashTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+        self.rng = random.Random(1)
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def found(self, grid, rect):
+        return set(sprite for sprite in grid.query(rect)
+                   if rect.colliderect(sprite._rect))
+
+    def expected(self, rect, sprites):
+        return set(sprite for sprite in sprites
+                   if rect.colliderect(sprite._rect))
+
+    def test_cell_size_must_be_positive(self):
+        self.assertRaises(games.GamesError, games.SpatialHash, 0)
+
+    def test_query_finds_what_a_linear_scan_finds(self):
+        sprites = make_sprites(self.rng, 200)
+        for cell_size in (16, 64, 300):
+            grid = games.SpatialHash(cell_size)
+            for sprite in sprites:
+                grid.insert(sprite)
+            for i in range(200):
+                rect = random_rect(self.rng)
+                self.assertEqual(self.found(grid, rect),
+                                 self.expected(rect, sprites))
+            grid.clear()
+
+    def test_moved_sprites_are_refiled(self):
+        sprites = make_sprites(self.rng, 100)
+        grid = games.SpatialHash(32)
+        for sprite in sprites:
+            grid.insert(sprite)
+        for i in range(20):
+            for sprite in sprites:
+                sprite._rect.move_ip(self.rng.randint(-40, 40),
+                                     self.rng.randint(-40, 40))
+                grid.update(sprite)
+            rect = random_rect(self.rng)
+            self.assertEqual(self.found(grid, rect),
+                             self.expected(rect, sprites))
+
+    def test_removed_sprites_are_not_found(self):
+        sprites = make_sprites(self.rng, 100)
+        grid = games.SpatialHash(32)
+        for sprite in sprites:
+            grid.insert(sprite)
+        for sprite in sprites[::2]:
+            grid.remove(sprite)
+            self.assertIsNone(sprite._grid_span)
+        rect = pygame.Rect(-100, -100, 900, 700)
+        self.assertEqual(self.found(grid, rect), set(sprites[1::2]))
+        for sprite in sprites[1::2]:
+            grid.remove(sprite)
+        self.assertEqual(grid.n_cells, 0)
+
+
+class OverlappingObjectsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+        self.rng = random.Random(2)
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def add(self, sprites):
+        for i, sprite in enumerate(sprites):
+            # drawing order differs from the order they were added in
+            self.screen.add(sprite, layer="hud" if i % 3 == 0 else None)
+        return sprites
+
+    def check(self, sprites):
+        """ The same hits, in the same order, with and without the grid """
+        rects = [random_rect(self.rng) for i in range(30)]
+        with_grid = [self.screen.overlapping_objects(rect) for rect in rects]
+        cell_size = self.screen.cell_size
+        self.screen.cell_size = 0
+        try:
+            without_grid = [self.screen.overlapping_objects(rect)
+                            for rect in rects]
+        finally:
+            self.screen.cell_size = cell_size
+        for rect, hits, linear_hits in zip(rects, with_grid, without_grid):
+            self.assertEqual(hits, linear_scan(rect, sprites))
+            self.assertEqual(linear_hits, hits)
+
+    def test_same_hits_as_a_linear_scan(self):
+        sprites = self.add(make_sprites(self.rng, 150))
+        sprites[3].is_collideable = False
+        self.check(sprites)
+
+    def test_same_hits_while_sprites_wrap_around_the_screen(self):
+        from screen import Wrapper
+        sprites = self.add(make_sprites(self.rng, 100, Wrapper, speed=9))
+        for i in range(60):
+            self.screen.mainloop(max_ticks=1)
+            self.check(sprites)
+        # they did go over the edges
+        self.assertTrue(any(sprite.left < 0 or sprite.right > 640
+                            for sprite in sprites))
+
+    def test_sprites_removed_during_a_tick_are_not_hit(self):
+        sprites = self.add(make_sprites(self.rng, 100))
+        checked = []
+
+        def remove_and_query():
+            for sprite in sprites[:50]:
+                sprite.destroy()
+            self.check(sprites)
+            # a grid rebuilt in the middle of the tick leaves them out too
+            self.screen.cell_size = 48
+            self.check(sprites)
+            checked.append(True)
+
+        self.screen.add_tick_handler(remove_and_query)
+        try:
+            self.screen.mainloop(max_ticks=1)
+        finally:
+            self.screen.remove_tick_handler(remove_and_query)
+        self.assertEqual(checked, [True])
+        self.assertEqual(sorted(self.screen.all_objects, key=id),
+                         sorted(sprites[50:], key=id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the sprite layout (__slots__) and for moving sprites.
+"""
+import unittest
+
+import pygame
+
+import support
+from livewires import games
+
+
+def image(width=20, height=10):
+    return pygame.Surface((width, height))
+
+
+def sprite_classes():
+    import screen
+    import interface
+    return [games.Sprite, games.Text, games.Question, games.Message,
+            games.Animation, screen.Wrapper, screen.Collider,
+            screen.Explosion, interface.Asteroid, interface.Ship,
+            interface.Missile, interface.Scores]
+
+
+class SlotsTest(unittest.TestCase):
+
+    def setUp(self):
+        support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_every_sprite_class_declares_slots(self):
+        for cls in sprite_classes():
+            for base in cls.__mro__[:-1]:
+                self.assertIn("__slots__", vars(base),
+                              "%s has a __dict__" % base.__name__)
+
+    def test_sprites_have_no_dict(self):
+        from screen import Explosion
+        for sprite in (games.Sprite(image=image()),
+                       games.Text(value=1, size=20, color=(0, 0, 0)),
+                       Explosion(x=10, y=10)):
+            self.assertFalse(hasattr(sprite, "__dict__"))
+            self.assertRaises(AttributeError, setattr, sprite, "spare", 1)
+
+    def test_wrappers_take_one_hit_unless_told_otherwise(self):
+        from screen import Wrapper
+        self.assertEqual(Wrapper(image=image()).lifes, 1)
+        self.assertEqual(Wrapper(image=image(), lifes=3).lifes, 3)
+
+
+class MoveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = support.reset_screen()
+
+    def tearDown(self):
+        games.screen.clear()
+
+    def test_tick_moves_like_the_position_setter(self):
+        ticked = games.Sprite(image=image(), x=100.25, y=50.5,
+                              dx=2.5, dy=-3.75)
+        placed = games.Sprite(image=image(), x=100.25, y=50.5)
+        self.screen.add(ticked)
+        self.screen.add(placed)
+        for tick in range(30):
+            self.screen.mainloop(max_ticks=1)
+            placed.position = (placed.x + 2.5, placed.y - 3.75)
+            self.assertEqual(ticked.position, placed.position)
+            self.assertEqual(ticked._rect, placed._rect)
+        # and the grid knows where it went
+        self.assertEqual(self.screen.overlapping_objects(ticked._rect),
+                         [ticked, placed])
+        self.assertEqual(self.screen.overlapping_objects(
+            pygame.Rect(90, 40, 20, 20)), [])
+
+    def test_stopped_sprites_stay_put(self):
+        sprite = games.Sprite(image=image(), x=10, y=10)
+        self.screen.add(sprite)
+        self.screen.mainloop(max_ticks=5)
+        self.assertEqual(sprite.position, (10, 10))
+
+    def test_edges_follow_the_position(self):
+        sprite = games.Sprite(image=image(20, 10), x=100, y=100)
+        self.assertEqual((sprite.left, sprite.right, sprite.top,
+                          sprite.bottom), (90, 110, 95, 105))
+        sprite.left = 0
+        sprite.top = 0
+        self.assertEqual(sprite.position, (10, 5))
+        sprite.right = 640
+        sprite.bottom = 480
+        self.assertEqual(sprite.position, (630, 475))
+        sprite.velocity = (1, -2)
+        self.assertEqual((sprite.dx, sprite.dy), (1, -2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the score store (storage.ScoreStore).
+
+    python -m pytest tests
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from storage import ScoreStore
+
+
+def open_store(path, legacy, barrier):
+    """ Open a store the moment every other process is ready to """
+    barrier.wait()
+    ScoreStore(path, legacy=legacy)
+
+
+class ScoreStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "scores")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_legacy(self, rows):
+        legacy = os.path.join(self.directory, "scores.txt")
+        with open(legacy, "w") as f:
+            for name, score in rows:
+                f.write("%s %d\n" % (name, score))
+        return legacy
+
+    def log_rows(self, path=None):
+        with open(path or self.path + ".log") as f:
+            return [line.split() for line in f]
+
+    def test_empty_store(self):
+        self.assertEqual(ScoreStore(self.path).top(3), [])
+
+    def test_top_is_best_first(self):
+        store = ScoreStore(self.path)
+        for name, score in [("A", 10), ("B", 30), ("C", 20), ("D", 5)]:
+            store.add(name, score)
+        self.assertEqual(store.top(3), [["B", 30], ["C", 20], ["A", 10]])
+
+    def test_ties_keep_the_earlier_score_first(self):
+        store = ScoreStore(self.path)
+        store.add("FIRST", 10)
+        store.add("SECOND", 10)
+        self.assertEqual(store.top(2), [["FIRST", 10], ["SECOND", 10]])
+
+    def test_names_lose_their_whitespace(self):
+        store = ScoreStore(self.path)
+        store.add("A B", 1)
+        store.add("  ", 2)
+        self.assertEqual(store.top(2), [["PLAYER", 2], ["AB", 1]])
+
+    def test_scores_survive_reopening(self):
+        ScoreStore(self.path).add("A", 7)
+        self.assertEqual(ScoreStore(self.path).top(1), [["A", 7]])
+
+    def test_missing_index_is_rebuilt_from_the_log(self):
+        store = ScoreStore(self.path)
+        store.add("A", 7)
+        store.add("B", 9)
+        os.remove(self.path + ".idx")
+        self.assertEqual(store.top(2), [["B", 9], ["A", 7]])
+
+    def test_rows_appended_by_hand_are_picked_up(self):
+        store = ScoreStore(self.path)
+        store.add("A", 7)
+        with open(self.path + ".log", "a") as log:
+            log.write("B 9\nhalf")
+        self.assertEqual(store.top(2), [["B", 9], ["A", 7]])
+
+    def test_legacy_file_is_imported_once(self):
+        legacy = self.write_legacy([("OLD", 50), ("OLDER", 40)])
+        store = ScoreStore(self.path, legacy=legacy)
+        ScoreStore(self.path, legacy=legacy)
+        self.assertEqual(store.top(3), [["OLD", 50], ["OLDER", 40]])
+        self.assertEqual(len(self.log_rows()), 2)
+
+    def test_concurrent_first_opens_import_once(self):
+        rows = [("P%d" % i, i) for i in range(5000)]
+        legacy = self.write_legacy(rows)
+        barrier = multiprocessing.Barrier(4)
+        processes = [multiprocessing.Process(target=open_store,
+                                             args=(self.path, legacy,
+                                                   barrier))
+                     for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(len(self.log_rows()), len(rows))
+        self.assertEqual(ScoreStore(self.path).top(3),
+                         [["P4999", 4999], ["P4998", 4998], ["P4997", 4997]])
+
+    def test_add_never_compacts_by_default(self):
+        store = ScoreStore(self.path, top_k=2, retain=2)
+        for i in range(10):
+            store.add("P%d" % i, i)
+        self.assertEqual(len(self.log_rows()), 10)
+        self.assertFalse(os.path.exists(self.path + ".archive"))
+
+    def test_compact_archives_what_it_drops(self):
+        store = ScoreStore(self.path, top_k=2, retain=3)
+        for i in range(10):
+            store.add("P%d" % i, i)
+        store.compact()
+        self.assertEqual(sorted(int(score) for name, score
+                                in self.log_rows()), [7, 8, 9])
+        archived = self.log_rows(self.path + ".archive")
+        self.assertEqual(sorted(int(score) for name, score in archived),
+                         list(range(7)))
+        self.assertEqual(store.top(2), [["P9", 9], ["P8", 8]])
+        store.add("NEW", 100)
+        self.assertEqual(store.top(2), [["NEW", 100], ["P9", 9]])
+
+    def test_compact_rows_compacts_on_add(self):
+        store = ScoreStore(self.path, top_k=2, compact_rows=5, retain=3)
+        for i in range(6):
+            store.add("P%d" % i, i)
+        self.assertEqual(len(self.log_rows()), 3)
+        self.assertEqual(len(self.log_rows(self.path + ".archive")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
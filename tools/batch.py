@@ -0,0 +1,244 @@
+"""
+Play many complete games headless, in parallel, for balancing.
+
+    python tools/batch.py --runs 200 --pilot bot \\
+        --set Asteroid.SPEED=3 --sweep Missile.LIFETIME=20,30,40 \\
+        --output results.jsonl
+
+Every combination of the --sweep values is played --runs times, with
+seeds 0, 1, 2, ... so that two sweeps see the same asteroid fields. The
+games run on a process pool, one Screen per worker process, and the
+result of each game (level reached, score, ticks, wall time) is appended
+to the output file as one line of JSON as soon as it comes in. A summary
+per parameter set is printed at the end.
+
+Parameters are class attributes of Asteroid, Ship and Missile, for
+example Asteroid.SPEED, Asteroid.SPAWN, Asteroid.POINTS,
+Ship.VELOCITY_STEP and Missile.LIFETIME.
+"""
+import argparse
+import ast
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "requirements", "livewires")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+os.chdir(ROOT)
+
+PILOTS = ("bot", "script")
+
+
+def parse_setting(text):
+    """ "Class.ATTR=value" -> ("Class", "ATTR", value) """
+    name, value = text.split("=", 1)
+    cls, attr = name.split(".")
+    return cls, attr, ast.literal_eval(value)
+
+
+def parse_sweep(text):
+    """ "Class.ATTR=v1,v2" -> [("Class", "ATTR", v1), ...] """
+    name, values = text.split("=", 1)
+    cls, attr = name.split(".")
+    return [(cls, attr, ast.literal_eval(value))
+            for value in values.split(",")]
+
+
+###############################################################################
+## Worker side
+###############################################################################
+
+def start_worker():
+    """ Open a headless screen without rendering in this process """
+    import screen
+    screen.init(headless=True, render=False)
+
+
+def make_pilot(name, game):
+    from livewires import games
+    from interface import Asteroid, Ship
+
+    class Script(games.Keyboard):
+        """ Turns, thrusts and fires in a fixed rhythm """
+
+        def __init__(self):
+            games.Keyboard.__init__(self)
+            self.tick = 0
+
+        def _poll(self):
+            keys = {games.K_SPACE}
+            if self.tick % 120 < 40:
+                keys.add(games.K_LEFT)
+            if self.tick % 200 < 30:
+                keys.add(games.K_UP)
+            self.tick += 1
+            return games.KeySet(keys)
+
+    class Bot(games.Keyboard):
+        """ Turns toward the nearest asteroid, fires when facing it """
+
+        def _poll(self):
+            ship = game.ship
+            keys = set()
+            target = None
+            distance = None
+            for sprite in games.screen.all_objects:
+                if isinstance(sprite, Asteroid):
+                    d = math.hypot(sprite.x - ship.x, sprite.y - ship.y)
+                    if target is None or d < distance:
+                        target, distance = sprite, d
+            if target is not None:
+                # angle 0 points up, 90 to the right
+                wanted = math.degrees(math.atan2(target.x - ship.x,
+                                                 ship.y - target.y))
+                turn = (wanted - ship.angle + 180) % 360 - 180
+                if turn < -Ship.ROTATION_STEP / 2:
+                    keys.add(games.K_LEFT)
+                elif turn > Ship.ROTATION_STEP / 2:
+                    keys.add(games.K_RIGHT)
+                if abs(turn) < 15:
+                    keys.add(games.K_SPACE)
+            return games.KeySet(keys)
+
+    return Bot() if name == "bot" else Script()
+
+
+def play_one(job):
+    """ Play one game in this worker; returns its result """
+    from livewires import games
+    from game import Game
+    from interface import Asteroid, Ship, Missile
+
+    class BatchGame(Game):
+        """ A game without top scores that stops at game over """
+
+        def __init__(self):
+            # spawn_budget=None: the same on every worker
+            super(BatchGame, self).__init__(scores=None, spawn_budget=None)
+            self.over = False
+
+        def end(self):
+            self.over = True
+            games.screen.quit()
+
+    classes = {"Asteroid": Asteroid, "Ship": Ship, "Missile": Missile}
+    saved = []
+    try:
+        for cls, attr, value in job["params"]:
+            saved.append((classes[cls], attr, getattr(classes[cls], attr)))
+            setattr(classes[cls], attr, value)
+
+        random.seed(job["seed"])
+        games.screen.clear()
+        Asteroid.total = 0
+        game = BatchGame()
+        games.keyboard = make_pilot(job["pilot"], game)
+        ticks = games.screen.ticks
+        start = time.perf_counter()
+        game.play(max_ticks=job["max_ticks"])
+        wall = time.perf_counter() - start
+        game.spawner.cancel()
+    finally:
+        for cls, attr, value in reversed(saved):
+            setattr(cls, attr, value)
+
+    return {"params": dict(("%s.%s" % (cls, attr), value)
+                           for cls, attr, value in job["params"]),
+            "seed": job["seed"],
+            "pilot": job["pilot"],
+            "level": game.level,
+            "score": game.score.value,
+            "ticks": games.screen.ticks - ticks,
+            "game_over": game.over,
+            "wall_time": wall,
+            "worker": os.getpid()}
+
+
+###############################################################################
+## Driver side
+###############################################################################
+
+def make_jobs(args):
+    fixed = [parse_setting(text) for text in args.set]
+    sweeps = [parse_sweep(text) for text in args.sweep]
+    jobs = []
+    for combination in itertools.product(*sweeps):
+        for seed in range(args.runs):
+            jobs.append({"params": fixed + list(combination),
+                         "seed": seed,
+                         "pilot": args.pilot,
+                         "max_ticks": args.max_ticks})
+    return jobs
+
+
+def summarize(results):
+    groups = {}
+    for result in results:
+        key = json.dumps(result["params"], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+    for key in sorted(groups):
+        group = groups[key]
+        n = float(len(group))
+        print("%s: %d games, level %.2f, score %.1f, ticks %.0f, "
+              "%d not over" % (key, len(group),
+                               sum(r["level"] for r in group) / n,
+                               sum(r["score"] for r in group) / n,
+                               sum(r["ticks"] for r in group) / n,
+                               sum(not r["game_over"] for r in group)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=10,
+                        help="games per parameter set")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--pilot", default="bot",
+                        help="who flies the ship: %s" % ", ".join(PILOTS))
+    parser.add_argument("--set", action="append", default=[],
+                        metavar="CLASS.ATTR=VALUE",
+                        help="override a parameter for every game")
+    parser.add_argument("--sweep", action="append", default=[],
+                        metavar="CLASS.ATTR=V1,V2,...",
+                        help="play every value of a parameter")
+    parser.add_argument("--max-ticks", type=int, default=30000,
+                        help="stop a game that is not over by then")
+    parser.add_argument("--output", default="batch.jsonl",
+                        help="file the results are appended to")
+    args = parser.parse_args()
+    if args.pilot not in PILOTS:
+        parser.error("unknown pilot %r" % args.pilot)
+    return args
+
+
+def main():
+    args = parse_args()
+    jobs = make_jobs(args)
+    results = []
+    start = time.perf_counter()
+    with open(args.output, "a") as output, \
+         ProcessPoolExecutor(args.workers, initializer=start_worker) as pool:
+        for future in as_completed([pool.submit(play_one, job)
+                                    for job in jobs]):
+            result = future.result()
+            output.write(json.dumps(result, sort_keys=True) + "\n")
+            output.flush()
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    summarize(results)
+    ticks = sum(result["ticks"] for result in results)
+    print("%d games on %d workers in %.1f s: %.1f games/s, %.0f ticks/s"
+          % (len(results), args.workers, elapsed, len(results) / elapsed,
+             ticks / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Pack the game's sprite images into one texture atlas.
+
+    python tools/pack_atlas.py [ATLAS [INDEX]]
+
+Writes the atlas image (images/atlas.bmp by default; the format follows
+the extension) and its JSON index (images/atlas.json). The index maps every
+packed file name, as the game loads it, to its (x, y, width, height)
+rectangle in the atlas. Each image's transparent color (the color of its
+top left pixel, as games.load_image takes it) is replaced by one color
+shared by the whole atlas, named in the index as "colorkey".
+
+A game serves its images from the atlas after
+games.assets.use_atlas(INDEX). Run the packer again whenever one of the
+images changes; images newer than the atlas are loaded from their own
+files.
+"""
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMAGES = ["images/asteroid_small.bmp",
+          "images/asteroid_med.bmp",
+          "images/asteroid_big.bmp",
+          "images/asteroid_powerful.bmp",
+          "images/ship.bmp",
+          "images/missile.bmp"] + \
+         ["images/explosion%d.bmp" % i for i in range(1, 10)]
+ATLAS = "images/atlas.bmp"
+INDEX = "images/atlas.json"
+# a color none of the images uses, checked below
+COLORKEY = (255, 0, 255)
+WIDTH = 256
+# empty pixels around every image
+PADDING = 1
+
+
+def load(filename):
+    """ Load an image with its transparent color replaced by COLORKEY """
+    image = pygame.image.load(os.path.join(ROOT, filename))
+    image = image.convert(32, 0)
+    corner = image.get_at((0, 0))
+    pixels = pygame.PixelArray(image)
+    if COLORKEY in [tuple(image.unmap_rgb(pixel)[:3])
+                    for column in pixels for pixel in column]:
+        raise SystemExit("%s uses the atlas colorkey %s"
+                         % (filename, COLORKEY))
+    pixels.replace(corner, COLORKEY)
+    del pixels
+    return image
+
+
+def pack(sizes, width):
+    """
+    Shelf packing: place rectangles tallest first in rows across width.
+    Returns {name: (x, y)} and the height used.
+    """
+    positions = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(),
+                               key=lambda item: (-item[1][1], item[0])):
+        w += 2 * PADDING
+        h += 2 * PADDING
+        if x + w > width:
+            x = 0
+            y += shelf
+            shelf = 0
+        positions[name] = (x + PADDING, y + PADDING)
+        x += w
+        shelf = max(shelf, h)
+    return positions, y + shelf
+
+
+def main(atlas_file=ATLAS, index_file=INDEX):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    images = dict((name, load(name)) for name in IMAGES)
+    positions, height = pack(dict((name, image.get_size())
+                                  for name, image in images.items()), WIDTH)
+
+    atlas = pygame.Surface((WIDTH, height), 0, 32)
+    atlas.fill(COLORKEY)
+    frames = {}
+    for name, image in images.items():
+        atlas.blit(image, positions[name])
+        frames[name] = list(positions[name]) + list(image.get_size())
+    pygame.image.save(atlas, os.path.join(ROOT, atlas_file))
+    # one frame per line, so that the index diffs well
+    with open(os.path.join(ROOT, index_file), "w") as f:
+        f.write('{"image": %s,\n "colorkey": %s,\n "frames": {\n'
+                % (json.dumps(atlas_file), json.dumps(list(COLORKEY))))
+        f.write(",\n".join("  %s: %s" % (json.dumps(name),
+                                         json.dumps(frames[name]))
+                           for name in sorted(frames)))
+        f.write("\n }\n}\n")
+    print("%s: %d images in %dx%d" % (atlas_file, len(frames), WIDTH,
+                                        height))
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))